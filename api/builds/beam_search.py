@@ -0,0 +1,295 @@
+"""
+Joint build search.
+
+The staged generator fixes the gems before the skills are scored and the skills
+before the sets are, so a slightly worse gem loadout that suits much better
+skills is never found. This search builds whole builds instead: partial builds
+are grown one component at a time (a primary gem, then the weapon skill, then
+each other skill with its best essence, then the sets), each addition updating
+the partial build's score, and only the beam_width best partial builds are
+kept after every step. The aux gems are added with the last primary gem, so an
+aux gem never takes a gem that a later primary gem slot needs.
+
+Skills and essences are scored against the gems of their partial build, and
+sets against its gems and skills, so later components see every earlier
+choice. A build's score is the sum of its gem, skill and set combination
+scores, a skill's score adding 0.3 of its best essence's and 0.2 per synergy
+category it shares with a primary gem, as in the staged generator.
+
+When the time budget runs out, every partial build left is completed by adding
+its best next component only.
+"""
+
+import heapq
+import time
+from collections import Counter
+from typing import Collection, Dict, FrozenSet, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from .gem_loadout import GemCandidate, GemSlot, GemSlotRules
+from .models import BuildFocus, BuildType
+from .scoring import EssenceScorer, SetScorer, SkillScorer
+from .set_search import SetChoice, best_set_combination
+
+# Share of an essence's score that counts for its skill
+ESSENCE_SCORE_WEIGHT = 0.3
+# Bonus of a skill per synergy category it shares with a primary gem
+GEM_SKILL_SYNERGY_WEIGHT = 0.2
+
+
+class SkillChoice(NamedTuple):
+    """A skill and the key of its essence, None for the weapon skill."""
+
+    skill: str
+    essence: Optional[str]
+
+
+class BuildSpace(NamedTuple):
+    """Everything a build for one request can be made of."""
+
+    build_type: BuildType
+    focus: BuildFocus
+    gems: Sequence[GemCandidate]
+    gem_rules: GemSlotRules
+    # Synergy categories of each gem and skill, and skills of each category
+    gem_categories: Mapping[str, Collection[str]]
+    skill_categories: Mapping[str, Collection[str]]
+    category_skills: Mapping[str, Collection[str]]
+    weapons: Sequence[str]
+    skills: Sequence[str]
+    # Skills per build, the weapon skill included
+    skill_count: int
+    # Essence keys of each skill
+    skill_essences: Mapping[str, Sequence[str]]
+    skill_scorer: SkillScorer
+    essence_scorer: EssenceScorer
+    set_scorer: SetScorer
+    set_combinations: Sequence[Sequence[int]]
+
+
+class ScoredBuild(NamedTuple):
+    """A complete build and its score."""
+
+    score: float
+    gems: List[GemSlot]
+    skills: List[SkillChoice]
+    sets: List[SetChoice]
+
+
+class BeamResult(NamedTuple):
+    """Best builds found by the search."""
+
+    builds: List[ScoredBuild]
+    # False when the time budget cut the search short
+    complete: bool
+    expanded: int
+    elapsed_ms: float
+
+
+class _Partial(NamedTuple):
+    """A build under construction."""
+
+    score: float
+    gems: Tuple[GemSlot, ...]
+    used_gems: FrozenSet[str]
+    # Position of the last primary gem and skill in their candidate lists;
+    # later ones only come after it, so every build is built one way only
+    gem_position: int
+    skills: Tuple[SkillChoice, ...]
+    skill_position: int
+    sets: Optional[Tuple[SetChoice, ...]]
+
+
+class _Scores(NamedTuple):
+    """Skill and essence scores for one set of primary gems."""
+
+    skills: Dict[str, float]
+    essences: Dict[str, Optional[str]]
+
+
+class _Search:
+    """Expands partial builds of one build space."""
+
+    def __init__(self, space: BuildSpace) -> None:
+        self.space = space
+        rules = space.gem_rules
+        self.primaries = sorted(
+            (
+                gem for gem in space.gems
+                if gem.primary_score is not None
+                and (rules.star_ratings is None or gem.stars in rules.star_ratings)
+            ),
+            key=lambda gem: gem.primary_score,
+            reverse=True
+        )
+        self.gem_target = min(rules.primary_count, len(self.primaries))
+
+        # Aux candidates of each star group, best first
+        self.stars = {gem.name: gem.stars for gem in space.gems}
+        self.auxes: Dict[int, List[GemCandidate]] = {}
+        for gem in sorted(space.gems, key=lambda gem: gem.aux_score, reverse=True):
+            self.auxes.setdefault(gem.stars if rules.aux_match_stars else 0, []).append(gem)
+        self.aux_match_stars = rules.aux_match_stars
+
+        self.skills = [skill for skill in space.skills if skill not in space.weapons]
+        weapons = 1 if space.weapons else 0
+        self.skill_target = min(space.skill_count, weapons + len(self.skills)) if weapons else 0
+        self._scores: Dict[FrozenSet[str], _Scores] = {}
+
+    def done(self, partial: _Partial) -> bool:
+        return partial.sets is not None
+
+    def scores(self, partial: _Partial) -> _Scores:
+        """Score skills and their best essences against a partial build's gems."""
+        primaries = frozenset(slot.primary for slot in partial.gems)
+        scores = self._scores.get(primaries)
+        if scores is None:
+            space = self.space
+            synergy_counts = Counter(
+                category for gem in primaries for category in space.gem_categories.get(gem, ())
+            )
+            gem_skills = {
+                skill for category in synergy_counts for skill in space.category_skills.get(category, ())
+            }
+            skill_scores = space.skill_scorer.scores(space.build_type, space.focus, synergy_counts)
+            essence_scores = space.essence_scorer.scores(space.build_type, space.focus, gem_skills)
+
+            values: Dict[str, float] = {}
+            essences: Dict[str, Optional[str]] = {}
+            for skill in list(space.weapons) + self.skills:
+                keys = space.skill_essences.get(skill, ())
+                essence = max(keys, key=lambda key: essence_scores.get(key, 0.0), default=None)
+                shared = sum(
+                    len(set(space.gem_categories.get(gem, ())) & set(space.skill_categories.get(skill, ())))
+                    for gem in primaries
+                )
+                values[skill] = (
+                    skill_scores.get(skill, 0.0)
+                    + (ESSENCE_SCORE_WEIGHT * essence_scores.get(essence, 0.0) if essence else 0.0)
+                    + GEM_SKILL_SYNERGY_WEIGHT * shared
+                )
+                essences[skill] = essence if skill not in space.weapons else None
+            scores = self._scores[primaries] = _Scores(values, essences)
+        return scores
+
+    def expand(self, partial: _Partial) -> List[_Partial]:
+        """Add every possible next component to a partial build."""
+        if len(partial.gems) < self.gem_target:
+            return self._add_gem(partial)
+        if len(partial.skills) < self.skill_target:
+            return self._add_skill(partial)
+        return self._add_sets(partial)
+
+    def _add_gem(self, partial: _Partial) -> List[_Partial]:
+        children = []
+        needed = self.gem_target - len(partial.gems)
+        for position in range(partial.gem_position + 1, len(self.primaries) - needed + 1):
+            primary = self.primaries[position]
+            child = partial._replace(
+                score=partial.score + primary.primary_score,
+                gems=partial.gems + (GemSlot(primary.name, None),),
+                used_gems=partial.used_gems | {primary.name},
+                gem_position=position
+            )
+            children.append(self._add_auxes(child) if needed == 1 else child)
+        return children
+
+    def _add_auxes(self, partial: _Partial) -> _Partial:
+        """Give each primary gem the best aux gem left in its star group."""
+        used = set(partial.used_gems)
+        score = partial.score
+        slots = []
+        for slot in partial.gems:
+            aux = next(
+                (
+                    gem for gem in self.auxes.get(self.stars[slot.primary] if self.aux_match_stars else 0, [])
+                    if gem.name not in used
+                ),
+                None
+            )
+            if aux is not None:
+                used.add(aux.name)
+                score += aux.aux_score
+            slots.append(GemSlot(slot.primary, aux.name if aux else None))
+        return partial._replace(score=score, gems=tuple(slots), used_gems=frozenset(used))
+
+    def _add_skill(self, partial: _Partial) -> List[_Partial]:
+        scores = self.scores(partial)
+        if not partial.skills:
+            candidates = [(-1, weapon) for weapon in self.space.weapons]
+        else:
+            needed = self.skill_target - len(partial.skills)
+            candidates = [
+                (position, self.skills[position])
+                for position in range(partial.skill_position + 1, len(self.skills) - needed + 1)
+            ]
+        return [
+            partial._replace(
+                score=partial.score + scores.skills[skill],
+                skills=partial.skills + (SkillChoice(skill, scores.essences[skill]),),
+                skill_position=position
+            )
+            for position, skill in candidates
+        ]
+
+    def _add_sets(self, partial: _Partial) -> List[_Partial]:
+        space = self.space
+        bonus_values = space.set_scorer.bonus_values(
+            space.build_type,
+            space.focus,
+            piece_counts={pieces for combination in space.set_combinations for pieces in combination},
+            skills={choice.skill for choice in partial.skills},
+            gems={slot.primary for slot in partial.gems}
+        )
+        combination = best_set_combination(bonus_values, space.set_combinations)
+        if combination is None:
+            return [partial._replace(sets=())]
+        return [partial._replace(score=partial.score + combination.score, sets=tuple(combination.choices))]
+
+
+def beam_search_builds(
+        space: BuildSpace,
+        beam_width: int,
+        top_k: int = 1,
+        time_budget: Optional[float] = None
+    ) -> BeamResult:
+    """Search for the best complete builds.
+
+    Args:
+        space: What builds can be made of
+        beam_width: Partial builds kept after each step
+        top_k: Complete builds to return, at most beam_width
+        time_budget: Seconds to search before completing the partial builds
+            greedily, None for no limit
+
+    Returns:
+        BeamResult: The best builds, best first
+    """
+    start = time.perf_counter()
+    search = _Search(space)
+    beam = [_Partial(0.0, (), frozenset(), -1, (), -1, None)]
+    expanded = 0
+    complete = True
+
+    while not all(search.done(partial) for partial in beam):
+        if complete and time_budget is not None and time.perf_counter() - start > time_budget:
+            complete = False
+
+        children = []
+        for partial in beam:
+            if search.done(partial):
+                children.append(partial)
+                continue
+            grown = search.expand(partial)
+            expanded += len(grown)
+            if complete:
+                children.extend(grown)
+            elif grown:
+                # Out of time: only the best next component
+                children.append(max(grown, key=lambda child: child.score))
+        beam = heapq.nlargest(beam_width, children, key=lambda partial: partial.score)
+
+    builds = [
+        ScoredBuild(partial.score, list(partial.gems), list(partial.skills), list(partial.sets))
+        for partial in beam[:top_k]
+    ]
+    return BeamResult(builds, complete, expanded, (time.perf_counter() - start) * 1000)
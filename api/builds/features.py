@@ -0,0 +1,144 @@
+"""
+Feature matrices for scoring many build candidates at once.
+
+Candidates (gems, skills, essences, sets) become rows of named numeric features
+and a build type and focus become a weight per feature, so every candidate is
+scored with one matrix-vector product. NumPy does the product when it is
+installed; otherwise rows are kept sparse and multiplied in Python, with the
+same results.
+"""
+
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - depends on installed extras
+    numpy = None
+
+
+# Available backends, the last one is the default
+BACKENDS: List[str] = ["python"] + (["numpy"] if numpy is not None else [])
+DEFAULT_BACKEND = BACKENDS[-1]
+
+# A vector of the matrix's backend: a numpy array or a list of floats
+Vector = Any
+
+
+class FeatureMatrix:
+    """Rows of named features, one row per candidate.
+
+    Features a row does not have are 0.0. Columns are the sorted union of the
+    feature names of all rows.
+    """
+
+    def __init__(
+            self,
+            rows: Sequence[Mapping[str, float]],
+            backend: Optional[str] = None
+        ) -> None:
+        """Create a matrix from feature rows.
+
+        Args:
+            rows: Feature values keyed by feature name, one mapping per row
+            backend: "numpy" or "python", defaults to DEFAULT_BACKEND
+
+        Raises:
+            ValueError: If the backend is not available
+        """
+        self.backend = backend or DEFAULT_BACKEND
+        if self.backend not in BACKENDS:
+            raise ValueError(f"Unknown or unavailable scoring backend: {self.backend}")
+
+        self.columns: List[str] = sorted({name for row in rows for name in row})
+        self._column_ids: Dict[str, int] = {name: i for i, name in enumerate(self.columns)}
+        self._rows = len(rows)
+
+        if self.backend == "numpy":
+            self._matrix = numpy.zeros((len(rows), len(self.columns)))
+            for i, row in enumerate(rows):
+                for name, value in row.items():
+                    self._matrix[i, self._column_ids[name]] = value
+        else:
+            self._matrix = [
+                [(self._column_ids[name], float(value)) for name, value in row.items() if value]
+                for row in rows
+            ]
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def weights(self, weights: Mapping[str, float], default: float = 0.0) -> Vector:
+        """Turn feature weights into a weight vector over the columns.
+
+        Args:
+            weights: Weights keyed by feature name
+            default: Weight of features without one
+
+        Returns:
+            Vector: One weight per column
+        """
+        return self.vector(weights.get(name, default) for name in self.columns)
+
+    def vector(self, values: Any) -> Vector:
+        """Make a vector of the matrix's backend.
+
+        Args:
+            values: Iterable of floats
+
+        Returns:
+            Vector: The values as a backend vector
+        """
+        if self.backend == "numpy":
+            return numpy.fromiter(values, dtype=float)
+        return [float(value) for value in values]
+
+    def dot(self, vector: Vector) -> Vector:
+        """Multiply the matrix by a weight vector.
+
+        Args:
+            vector: One weight per column, see weights()
+
+        Returns:
+            Vector: One value per row
+        """
+        if self.backend == "numpy":
+            return self._matrix @ vector
+        return [sum((value * vector[column] for column, value in row), 0.0) for row in self._matrix]
+
+
+def normalize(numerator: Vector, denominator: Vector) -> Vector:
+    """Divide by the denominator, but by at least 1.0, and 0.0 where it is not positive.
+
+    Args:
+        numerator: Weighted scores
+        denominator: Total weights
+
+    Returns:
+        Vector: Normalized scores
+    """
+    if numpy is not None and isinstance(numerator, numpy.ndarray):
+        return numpy.where(denominator > 0, numerator / numpy.maximum(denominator, 1.0), 0.0)
+    return [n / max(d, 1.0) if d > 0 else 0.0 for n, d in zip(numerator, denominator)]
+
+
+def clip(values: Vector, low: float = 0.0, high: float = 1.0) -> Vector:
+    """Limit every value to a range.
+
+    Args:
+        values: Values to limit
+        low: Lowest value
+        high: Highest value
+
+    Returns:
+        Vector: Limited values
+    """
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        return numpy.clip(values, low, high)
+    return [min(max(value, low), high) for value in values]
+
+
+def tolist(values: Vector) -> List[float]:
+    """Convert a vector of any backend to a list of floats."""
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        return values.tolist()
+    return list(values)
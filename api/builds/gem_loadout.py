@@ -0,0 +1,294 @@
+"""
+Exact gem loadout search.
+
+A loadout fills every primary gem slot with a distinct gem and may give each
+primary an auxiliary gem of the same star rating. Its score is the sum of the
+primary and auxiliary scores of its gems. The best loadout is found with a
+depth-first branch-and-bound: gems are decided one at a time (primary,
+auxiliary or unused), best first, and a branch is dropped when even the best
+remaining scores, ignoring the star and uniqueness rules, cannot beat the best
+loadout found so far.
+
+When a time budget cuts the search short, the best loadout found so far is
+returned along with an upper bound on the optimum, the largest bound of the
+branches left unexplored.
+"""
+
+import time
+from bisect import insort
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+from ..models.game_data.schemas import GameConstraints
+
+
+# Time budget checks are spread out, reading the clock is not free
+_CLOCK_INTERVAL = 64
+
+
+class GemCandidate(NamedTuple):
+    """A gem that can go in a loadout."""
+
+    name: str
+    stars: int
+    # None when the gem cannot be a primary gem for the build
+    primary_score: Optional[float]
+    aux_score: float
+
+
+class GemSlot(NamedTuple):
+    """A primary gem and its auxiliary gem."""
+
+    primary: str
+    aux: Optional[str]
+
+
+class GemSlotRules(NamedTuple):
+    """Gem slot rules of a build."""
+
+    primary_count: int
+    # Star ratings primary gems may have, None for any
+    star_ratings: Optional[frozenset] = None
+    aux_required: int = 0
+    aux_match_stars: bool = True
+
+    @classmethod
+    def from_constraints(cls, constraints: Union[GameConstraints, Mapping[str, Any]]) -> "GemSlotRules":
+        """Read the rules from the "gem_slots" game constraints.
+
+        Args:
+            constraints: Game constraints, or a mapping of them as in
+                constraints.json
+
+        Returns:
+            GemSlotRules: The rules
+        """
+        if isinstance(constraints, GameConstraints):
+            gem_slots = constraints.gem_slots
+        else:
+            gem_slots = constraints["gem_slots"]
+        primary = gem_slots.get("primary", {})
+        auxiliary = gem_slots.get("auxiliary", {})
+        star_ratings = primary.get("star_ratings")
+        return cls(
+            primary_count=primary.get("required", gem_slots.get("total_required", 0)),
+            star_ratings=frozenset(int(stars) for stars in star_ratings) if star_ratings else None,
+            aux_required=auxiliary.get("required", 0),
+            aux_match_stars=auxiliary.get("must_match_primary_stars", True)
+        )
+
+
+class LoadoutResult(NamedTuple):
+    """Best loadout found and how far from optimal it may be."""
+
+    slots: List[GemSlot]
+    score: float
+    # Largest score any loadout can have; equals score when complete
+    upper_bound: float
+    # Whether the search finished, proving the loadout optimal
+    complete: bool
+    nodes: int
+    elapsed_ms: float
+
+    @property
+    def gap(self) -> float:
+        """Score the optimum may have above this loadout's."""
+        return max(self.upper_bound - self.score, 0.0)
+
+
+class _Node(NamedTuple):
+    """A partial loadout: gems before index are decided."""
+
+    bound: float
+    index: int
+    score: float
+    primaries: Tuple[int, ...]
+    auxes: Tuple[int, ...]
+    # Linked list of (candidate index, is primary) decisions
+    chosen: Optional[tuple]
+
+
+def _top_sums(values: Sequence[Optional[float]], limit: int) -> List[List[float]]:
+    """Sum the best k values of every suffix, for k up to limit.
+
+    Returns:
+        List[List[float]]: sums[i][k] is the sum of the k largest values from
+            index i on, or of all of them when there are fewer
+    """
+    sums = [[0.0] * (limit + 1) for _ in range(len(values) + 1)]
+    best: List[float] = []
+    for i in range(len(values) - 1, -1, -1):
+        if values[i] is not None:
+            insort(best, -values[i])
+        total = 0.0
+        for k in range(1, limit + 1):
+            if k <= len(best):
+                total -= best[k - 1]
+            sums[i][k] = total
+    return sums
+
+
+def optimize_gem_loadout(
+        candidates: Sequence[GemCandidate],
+        rules: GemSlotRules,
+        time_budget: Optional[float] = None
+    ) -> LoadoutResult:
+    """Find the highest scoring gem loadout.
+
+    Every primary gem slot must be filled; with fewer possible primary gems
+    than slots there is no loadout.
+
+    Args:
+        candidates: Gems to choose from, names must be unique
+        rules: Gem slot rules
+        time_budget: Seconds to search before returning the best loadout so
+            far, None to search until the loadout is proven optimal
+
+    Returns:
+        LoadoutResult: The best loadout found; no slots if none satisfies the
+            rules
+    """
+    start = time.perf_counter()
+
+    def can_be_primary(candidate: GemCandidate) -> bool:
+        return candidate.primary_score is not None and (
+            rules.star_ratings is None or candidate.stars in rules.star_ratings
+        )
+
+    # Best candidates first, so good loadouts are found early
+    gems = sorted(
+        candidates,
+        key=lambda c: max(c.primary_score if can_be_primary(c) else 0.0, c.aux_score),
+        reverse=True
+    )
+    primary_scores = [gem.primary_score if can_be_primary(gem) else None for gem in gems]
+    target = rules.primary_count
+
+    # Auxiliary gems must match a primary gem of their group
+    group_ids: Dict[int, int] = {}
+    groups = [group_ids.setdefault(gem.stars if rules.aux_match_stars else 0, len(group_ids)) for gem in gems]
+
+    # Primary gems left per group from each index on, for feasibility checks
+    primaries_left = [[0] * len(group_ids) for _ in range(len(gems) + 1)]
+    for i in range(len(gems) - 1, -1, -1):
+        primaries_left[i] = list(primaries_left[i + 1])
+        if primary_scores[i] is not None:
+            primaries_left[i][groups[i]] += 1
+
+    # Best remaining scores: primary, auxiliary, auxiliary per group, and
+    # either role, as each gem fills at most one slot
+    top_primary = _top_sums(primary_scores, target)
+    top_aux = _top_sums([gem.aux_score for gem in gems], target)
+    top_group_aux = [
+        _top_sums([gem.aux_score if groups[i] == group else None for i, gem in enumerate(gems)], target)
+        for group in range(len(group_ids))
+    ]
+    top_either = _top_sums(
+        [max(gem.aux_score, score) if score is not None else gem.aux_score
+         for gem, score in zip(gems, primary_scores)],
+        2 * target
+    )
+
+    def feasible(index: int, primaries: Tuple[int, ...], auxes: Tuple[int, ...]) -> bool:
+        # The primary slots can still be filled, with enough primary gems in
+        # each group for its auxiliary gems
+        primary_slots = target - sum(primaries)
+        left = primaries_left[index]
+        if primary_slots < 0 or sum(auxes) > target or sum(left) < primary_slots:
+            return False
+        missing = 0
+        for group, more in enumerate(left):
+            needed = auxes[group] - primaries[group]
+            if needed > more:
+                return False
+            missing += max(needed, 0)
+        return missing <= primary_slots
+
+    def bound(index: int, score: float, primaries: Tuple[int, ...], auxes: Tuple[int, ...]) -> float:
+        primary_slots = target - sum(primaries)
+        aux_slots = target - sum(auxes)
+        left = primaries_left[index]
+        # A group's auxiliary gems need primary gems of the group
+        group_aux = sum(
+            top_group_aux[group][index][min(primaries[group] - auxes[group] + min(primary_slots, left[group]), target)]
+            for group in range(len(group_ids))
+        )
+        return score + min(
+            top_primary[index][primary_slots] + min(top_aux[index][aux_slots], group_aux),
+            top_either[index][primary_slots + aux_slots]
+        )
+
+    empty = (0,) * len(group_ids)
+    stack = [_Node(bound(0, 0.0, empty, empty), 0, 0.0, empty, empty, None)] if feasible(0, empty, empty) else []
+    best: Optional[_Node] = None
+    best_score = float("-inf")
+    nodes = 0
+    complete = True
+
+    while stack:
+        node = stack.pop()
+        if node.bound <= best_score:
+            continue
+        nodes += 1
+        if time_budget is not None and nodes % _CLOCK_INTERVAL == 0:
+            if time.perf_counter() - start > time_budget:
+                stack.append(node)
+                complete = False
+                break
+
+        i = node.index
+        if i == len(gems):
+            if sum(node.auxes) >= rules.aux_required:
+                best, best_score = node, node.score
+            continue
+
+        group = groups[i]
+        added = tuple(int(g == group) for g in range(len(group_ids)))
+        options = [
+            # Leave the gem out
+            (node.primaries, node.auxes, 0.0, None),
+            # Use it as an auxiliary gem of a primary gem in its group
+            (node.primaries, tuple(map(sum, zip(node.auxes, added))), gems[i].aux_score, False),
+        ]
+        if primary_scores[i] is not None:
+            # Use it as a primary gem
+            options.append((tuple(map(sum, zip(node.primaries, added))), node.auxes, primary_scores[i], True))
+
+        # The last child pushed is explored first
+        for primaries, auxes, gain, is_primary in options:
+            if not feasible(i + 1, primaries, auxes):
+                continue
+            score = node.score + gain
+            child_bound = bound(i + 1, score, primaries, auxes)
+            if child_bound > best_score:
+                chosen = node.chosen if is_primary is None else (node.chosen, (i, is_primary))
+                stack.append(_Node(child_bound, i + 1, score, primaries, auxes, chosen))
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if best is None:
+        upper_bound = max((node.bound for node in stack), default=0.0) if not complete else 0.0
+        return LoadoutResult([], 0.0, upper_bound, complete, nodes, elapsed_ms)
+
+    upper_bound = max([best_score] + [node.bound for node in stack]) if not complete else best_score
+    return LoadoutResult(_slots(gems, best.chosen, rules.aux_match_stars), best_score, upper_bound, complete, nodes, elapsed_ms)
+
+
+def _slots(gems: Sequence[GemCandidate], chosen: Optional[tuple], match_stars: bool) -> List[GemSlot]:
+    """Pair the chosen primary and auxiliary gems, best with best per group."""
+    primaries: List[GemCandidate] = []
+    auxes: Dict[int, List[GemCandidate]] = {}
+    while chosen is not None:
+        chosen, (index, is_primary) = chosen
+        if is_primary:
+            primaries.append(gems[index])
+        else:
+            auxes.setdefault(gems[index].stars if match_stars else 0, []).append(gems[index])
+
+    primaries.sort(key=lambda gem: gem.primary_score, reverse=True)
+    for group in auxes.values():
+        group.sort(key=lambda gem: gem.aux_score)
+
+    slots = []
+    for gem in primaries:
+        group = auxes.get(gem.stars if match_stars else 0)
+        slots.append(GemSlot(gem.name, group.pop().name if group else None))
+    return slots
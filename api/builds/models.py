@@ -49,6 +49,7 @@ class Gem(BaseModel):
     name: str
     rank: int
     quality: Optional[int] = None
+    aux_gem: Optional[str] = None  # Auxiliary gem socketed with this primary gem
 
 
 class Skill(BaseModel):
@@ -93,6 +94,7 @@ class BuildResponse(BaseModel):
     name: str
     type: BuildType
     focus: BuildFocus
+    class_type: Optional[str] = None  # Character class, missing from builds saved without it
     gear: Dict[str, Dict]
     sets: Dict[str, Dict]
     skills: Dict[str, Dict]
@@ -1,9 +1,10 @@
 """Build routes."""
 
 import logging
+from typing import List, Optional
+
 from fastapi import APIRouter, Depends, Query, HTTPException, status, Request
 from ..auth.service import AuthService, get_auth_service
-from ..core.config import get_settings
 from .models import BuildFocus, BuildResponse, BuildType, BuildRecommendation
 from .service import BuildService
 from ..routes.game.classes import get_data_manager
@@ -16,29 +17,20 @@ router = APIRouter(prefix="/builds", tags=["builds"])
 
 async def get_build_service(request: Request = None):
     """Get build service instance."""
+    return await get_service(request)
+
+async def get_service(request: Request = None) -> BuildService:
+    """Get a build service for the request.
+    
+    The service reads the application's game data manager, so a request sees
+    the data generation pinned for it and the entries derived from it.
+    """
     if request is None:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Request context not available"
         )
-    settings = get_settings()
-    return await BuildService.create()  # Let it use settings.data_path
-
-# Global instance for singleton pattern
-_build_service = None
-
-async def get_service(request: Request = None) -> BuildService:
-    """Get or create the build service instance."""
-    global _build_service
-    if _build_service is None:
-        if request is None:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Request context not available"
-            )
-        settings = get_settings()
-        _build_service = await BuildService.create()  # Let it use settings.data_path
-    return _build_service
+    return await BuildService.create(get_data_manager(request))
 
 async def validate_character_class(
     character_class: CharacterClass = Query(..., description="Character class to generate build for"),
@@ -104,6 +96,8 @@ async def generate_build(
             build.raw_url = gist_data["raw_url"]
 
         return build
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error generating build: {str(e)}")
         raise HTTPException(
@@ -112,6 +106,67 @@ async def generate_build(
         )
 
 
+@router.post(
+    "/optimize",
+    response_model=List[BuildRecommendation],
+    summary="Optimize builds",
+    description="Search gems, skills, essences and sets together and return the best builds"
+)
+async def optimize_builds(
+    build_type: BuildType = Query(..., description="Type of build to generate"),
+    focus: BuildFocus = Query(..., description="Primary focus of the build"),
+    character_class: str = Depends(validate_character_class),
+    beam_width: Optional[int] = Query(
+        None,
+        ge=1,
+        le=256,
+        description="Partial builds kept per search step (default: BUILD_SEARCH_BEAM_WIDTH)"
+    ),
+    top_k: Optional[int] = Query(
+        None,
+        ge=1,
+        le=50,
+        description="Number of builds to return (default: BUILD_SEARCH_TOP_K)"
+    ),
+    use_inventory: bool = Query(
+        False,
+        description="Whether to consider user's inventory"
+    ),
+    build_service: BuildService = Depends(get_service),
+    auth_service: AuthService = Depends(get_auth_service),
+    request: Request = None
+) -> List[BuildRecommendation]:
+    """Generate the best builds with the joint build search."""
+    try:
+        inventory = None
+        if use_inventory:
+            token = request.headers.get("Authorization")
+            if not token or not token.startswith("Bearer "):
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Authorization required to use inventory"
+                )
+            token = token.split(" ")[1]
+            inventory = await auth_service.get_inventory_gist(token)
+
+        return await build_service.generate_builds(
+            build_type=build_type,
+            focus=focus,
+            character_class=character_class,
+            inventory=inventory,
+            beam_width=beam_width,
+            top_k=top_k
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error optimizing builds: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+
 @router.post(
     "/analyze",
     response_model=BuildResponse,
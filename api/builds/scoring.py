@@ -0,0 +1,1002 @@
+"""
+Build scoring engine.
+
+Gems, skills, essences and sets are turned into feature matrices once per data
+generation (see features.py), and each (build type, focus) pair into weight
+vectors, so every candidate of a kind is scored with one matrix-vector product
+instead of a Python loop per candidate.
+
+A gem's score depends only on the game data and the build's type and focus, so
+it is computed for every (gem, build type, focus) triple up front and looked up
+from a flat array. Skill, essence and set scores also depend on the gems and
+skills already picked for the build; those parts are added to the weight
+vectors per request.
+"""
+
+import re
+from array import array
+from itertools import product
+from typing import Any, Collection, Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple
+
+from pydantic import BaseModel
+
+from .features import FeatureMatrix, clip, normalize, tolist
+from .models import BuildFocus, BuildType
+
+
+# Stat category weights per focus; categories without a weight count half
+_PVE_WEIGHTS = {
+    BuildFocus.DPS: {
+        "critical_hit": 1.0,
+        "attack_speed": 0.9,
+        "damage": 1.0,
+        "penetration": 0.8,
+        "area_damage": 0.9,
+        "skill_damage": 0.8,
+        "primary_attack": 0.7,
+        "damage_over_time": 0.7
+    },
+    BuildFocus.SURVIVAL: {
+        "life": 1.0,
+        "armor": 0.9,
+        "resistance": 0.8,
+        "block": 0.7,
+        "healing": 0.9,
+        "damage_reduction": 1.0,
+        "shield": 0.8,
+        "dodge": 0.7
+    },
+    BuildFocus.BUFF: {
+        "movement_speed": 0.9,
+        "cooldown_reduction": 1.0,
+        "crowd_control": 0.7,
+        "resource_generation": 0.8,
+        "buff_duration": 0.8,
+        "proc_chance": 0.7,
+        "area_effect": 0.9,
+        "control_duration": 0.6
+    }
+}
+
+_PVP_WEIGHTS = {
+    BuildFocus.DPS: {
+        "critical_hit": 0.9,
+        "attack_speed": 0.8,
+        "damage": 1.0,
+        "penetration": 1.0,
+        "area_damage": 0.7,
+        "skill_damage": 0.9,
+        "primary_attack": 0.8,
+        "damage_over_time": 0.6
+    },
+    BuildFocus.SURVIVAL: {
+        "life": 1.0,
+        "armor": 1.0,
+        "resistance": 0.9,
+        "block": 0.8,
+        "healing": 0.7,
+        "damage_reduction": 1.0,
+        "shield": 0.9,
+        "dodge": 0.8
+    },
+    BuildFocus.BUFF: {
+        "movement_speed": 1.0,
+        "cooldown_reduction": 0.9,
+        "crowd_control": 1.0,
+        "resource_generation": 0.7,
+        "buff_duration": 0.8,
+        "proc_chance": 0.7,
+        "area_effect": 0.8,
+        "control_duration": 0.9
+    }
+}
+
+# Raids and farming are both PvE content
+GEM_SCORE_WEIGHTS: Dict[BuildType, Dict[BuildFocus, Dict[str, float]]] = {
+    BuildType.RAID: _PVE_WEIGHTS,
+    BuildType.FARM: _PVE_WEIGHTS,
+    BuildType.PVP: _PVP_WEIGHTS,
+}
+DEFAULT_CATEGORY_WEIGHT = 0.5
+
+# Synergy categories whose gems can be primary gems for each focus, named as
+# in synergies.json and the gem synergy metadata
+FOCUS_SYNERGY_CATEGORIES: Dict[BuildFocus, FrozenSet[str]] = {
+    BuildFocus.DPS: frozenset({
+        "critical_hit",
+        "damage_boost",
+        "attack_speed",
+        "direct_damage",
+        "damage_over_time",
+        "counter_damage",
+        "area_damage"
+    }),
+    BuildFocus.SURVIVAL: frozenset({"survival", "control"}),
+    BuildFocus.BUFF: frozenset({"movement_speed", "mobility", "control"}),
+}
+
+# A gem's stat value in a category: its rank 10 value and whether it scales
+StatBoost = Tuple[float, bool]
+
+
+def synergy_gems(synergies: Any) -> Dict[str, List[str]]:
+    """Get the gems of each synergy category.
+
+    Args:
+        synergies: GameSynergies, or a mapping of category to a dict with a
+            "gems" list as in synergies.json
+
+    Returns:
+        Dict[str, List[str]]: Gem names keyed by category
+    """
+    if isinstance(synergies, BaseModel):
+        return {name: list(group.gems) for name, group in synergies if group is not None}
+    return {
+        name: list(data["gems"])
+        for name, data in (synergies or {}).items()
+        if isinstance(data, Mapping) and "gems" in data
+    }
+
+
+def synergy_skills(synergies: Any) -> Dict[str, List[str]]:
+    """Get the skills of each synergy category.
+
+    Args:
+        synergies: GameSynergies, or a mapping of category to a dict with a
+            "skills" list as in synergies.json
+
+    Returns:
+        Dict[str, List[str]]: Skill names keyed by category, for categories
+            that list skills
+    """
+    if isinstance(synergies, BaseModel):
+        groups = {name: getattr(group, "skills", None) for name, group in synergies if group is not None}
+    else:
+        groups = {
+            name: data.get("skills")
+            for name, data in (synergies or {}).items()
+            if isinstance(data, Mapping)
+        }
+    return {name: list(skills) for name, skills in groups.items() if skills}
+
+
+def gem_stat_boosts(stat_boosts: Any) -> Dict[str, Dict[str, StatBoost]]:
+    """Get the rank 10 stat boost of each gem in each stat category.
+
+    Args:
+        stat_boosts: GameStats, or a mapping of category to gem name to a dict
+            with "rank_10" and "scaling" values
+
+    Returns:
+        Dict[str, Dict[str, StatBoost]]: Boosts keyed by category and gem name
+    """
+    if isinstance(stat_boosts, BaseModel):
+        boosts = {}
+        for category, stat_category in stat_boosts:
+            boosts[category] = {
+                source.name: (
+                    max((value.value for value in source.rank_10_values), default=0.0),
+                    any(value.scaling for value in source.rank_10_values)
+                )
+                for source in stat_category.gems
+            }
+        return boosts
+    return {
+        category: {
+            gem_name: (stat.get("rank_10", 0.0), bool(stat.get("scaling", False)))
+            for gem_name, stat in gems.items()
+            if isinstance(stat, Mapping)
+        }
+        for category, gems in (stat_boosts or {}).items()
+        if isinstance(gems, Mapping)
+    }
+
+
+def gem_score(
+        gem_name: str,
+        categories: Iterable[str],
+        stat_boosts: Mapping[str, Mapping[str, StatBoost]],
+        weights: Mapping[str, float]
+    ) -> float:
+    """Score a gem's stats in its synergy categories for one build type and focus.
+
+    Args:
+        gem_name: Name of the gem
+        categories: Synergy categories of the gem
+        stat_boosts: Stat boosts keyed by category and gem name
+        weights: Category weights of the build type and focus
+
+    Returns:
+        Score from 0.0 to 1.0
+    """
+    score = 0.0
+    total_weight = 0.0
+    for category in categories:
+        if category not in stat_boosts:
+            continue
+        weight = weights.get(category, DEFAULT_CATEGORY_WEIGHT)
+        total_weight += weight
+
+        boost = stat_boosts[category].get(gem_name)
+        if boost is not None:
+            rank_10_value, scaling = boost
+            # Higher scores for scaling stats
+            scaling_bonus = 0.2 if scaling else 0.0
+            score += (min(rank_10_value / 100.0, 1.0) + scaling_bonus) * weight
+
+    return score / max(total_weight, 1.0) if total_weight > 0 else 0.0
+
+
+# Aux gems only give their rank 1 effect, so it outweighs the gem's score
+AUX_SCORE_WEIGHT = 0.4
+AUX_RANK_1_WEIGHT = 0.6
+DEFAULT_RANK_1_RATIO = 0.5
+
+
+def gem_rank_1_values(stat_boosts: Any) -> Dict[str, float]:
+    """Get the largest rank 1 stat value of each gem.
+
+    Args:
+        stat_boosts: GameStats, whose base values are the rank 1 values, or a
+            mapping of category to gem name to a dict with a "rank_1" value
+
+    Returns:
+        Dict[str, float]: Rank 1 values keyed by gem name
+    """
+    values: Dict[str, float] = {}
+    if isinstance(stat_boosts, BaseModel):
+        for _, stat_category in stat_boosts:
+            for source in stat_category.gems:
+                for value in source.base_values:
+                    values[source.name] = max(values.get(source.name, value.value), value.value)
+        return values
+    for gems in (stat_boosts or {}).values():
+        if not isinstance(gems, Mapping):
+            continue
+        for gem_name, stat in gems.items():
+            if isinstance(stat, Mapping) and "rank_1" in stat:
+                values[gem_name] = max(values.get(gem_name, stat["rank_1"]), stat["rank_1"])
+    return values
+
+
+def aux_gem_score(gem_score: float, rank_1_value: Optional[float]) -> float:
+    """Score a gem as an aux gem.
+
+    Args:
+        gem_score: The gem's score for the build, see GemScoreTable
+        rank_1_value: The gem's rank 1 stat value, None if unknown
+
+    Returns:
+        Score, weighted towards the rank 1 effect
+    """
+    rank_1_ratio = rank_1_value / 100.0 if rank_1_value is not None else DEFAULT_RANK_1_RATIO
+    return gem_score * AUX_SCORE_WEIGHT + rank_1_ratio * AUX_RANK_1_WEIGHT
+
+
+class GemScoreTable:
+    """Scores of every gem for every build type and focus.
+
+    Scores are stored row-major in one array, a row per gem and a column per
+    (build type, focus) pair. Gems outside every synergy category score 0.0.
+    """
+
+    COLUMNS: Dict[Tuple[BuildType, BuildFocus], int] = {
+        pair: column for column, pair in enumerate(product(BuildType, BuildFocus))
+    }
+
+    def __init__(self, categories: Dict[str, FrozenSet[str]], scores: array) -> None:
+        """Create a table from computed scores; use build() instead.
+
+        Args:
+            categories: Synergy categories keyed by gem name, in row order
+            scores: Row-major scores
+        """
+        self._categories = categories
+        self._rows = {gem_name: row for row, gem_name in enumerate(categories)}
+        self._scores = scores
+
+    @classmethod
+    def build(cls, synergies: Any, stat_boosts: Any, backend: Optional[str] = None) -> "GemScoreTable":
+        """Score every gem of the synergy categories.
+
+        Each gem is a row with a "value:<category>" feature holding its
+        boost's score and a "weight:<category>" indicator for every category
+        it counts in, so a (build type, focus) pair's scores and weights are
+        two matrix-vector products.
+
+        Args:
+            synergies: Synergy data, see synergy_gems()
+            stat_boosts: Gem stat boosts, see gem_stat_boosts()
+            backend: Feature matrix backend, see features.BACKENDS
+
+        Returns:
+            GemScoreTable: The computed table
+        """
+        boosts = gem_stat_boosts(stat_boosts)
+        gem_categories: Dict[str, set] = {}
+        for category, gems in synergy_gems(synergies).items():
+            for gem_name in gems:
+                gem_categories.setdefault(gem_name, set()).add(category)
+
+        categories = {gem_name: frozenset(names) for gem_name, names in gem_categories.items()}
+        rows = []
+        for gem_name, names in categories.items():
+            row = {}
+            for category in names:
+                if category not in boosts:
+                    continue
+                row[f"weight:{category}"] = 1.0
+                boost = boosts[category].get(gem_name)
+                if boost is not None:
+                    rank_10_value, scaling = boost
+                    # Higher scores for scaling stats
+                    row[f"value:{category}"] = min(rank_10_value / 100.0, 1.0) + (0.2 if scaling else 0.0)
+            rows.append(row)
+        matrix = FeatureMatrix(rows, backend)
+
+        width = len(cls.COLUMNS)
+        scores = array("d", bytes(8 * len(categories) * width))
+        for (build_type, focus), column in cls.COLUMNS.items():
+            weights = GEM_SCORE_WEIGHTS[build_type][focus]
+            category_weights = [
+                weights.get(name.split(":", 1)[1], DEFAULT_CATEGORY_WEIGHT) for name in matrix.columns
+            ]
+            score = matrix.dot(matrix.vector(
+                weight if name.startswith("value:") else 0.0
+                for name, weight in zip(matrix.columns, category_weights)
+            ))
+            total_weight = matrix.dot(matrix.vector(
+                weight if name.startswith("weight:") else 0.0
+                for name, weight in zip(matrix.columns, category_weights)
+            ))
+            for row, value in enumerate(tolist(normalize(score, total_weight))):
+                scores[row * width + column] = value
+        return cls(categories, scores)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, gem_name: str) -> bool:
+        return gem_name in self._rows
+
+    def score(self, gem_name: str, build_type: BuildType, focus: BuildFocus) -> float:
+        """Look up a gem's score.
+
+        Args:
+            gem_name: Name of the gem
+            build_type: Type of build
+            focus: Build focus
+
+        Returns:
+            Score from 0.0 to 1.0
+        """
+        row = self._rows.get(gem_name)
+        if row is None:
+            return 0.0
+        return self._scores[row * len(self.COLUMNS) + self.COLUMNS[build_type, focus]]
+
+    def categories(self, gem_name: str) -> FrozenSet[str]:
+        """Get the synergy categories of a gem.
+
+        Args:
+            gem_name: Name of the gem
+
+        Returns:
+            FrozenSet[str]: Category names, empty for unknown gems
+        """
+        return self._categories.get(gem_name, frozenset())
+
+
+# Skill type weights per focus, raids and farming are both PvE content
+_PVE_SKILL_TYPE_WEIGHTS = {
+    BuildFocus.DPS: {
+        "damage": 1.0,
+        "aoe": 0.9,
+        "control": 0.5,
+        "mobility": 0.3
+    },
+    BuildFocus.SURVIVAL: {
+        "damage": 0.4,
+        "control": 0.8,
+        "mobility": 0.6,
+        "defense": 1.0
+    },
+    BuildFocus.BUFF: {
+        "damage": 0.3,
+        "control": 0.7,
+        "mobility": 0.5,
+        "support": 1.0
+    }
+}
+
+_PVP_SKILL_TYPE_WEIGHTS = {
+    BuildFocus.DPS: {
+        "damage": 0.9,
+        "control": 0.7,
+        "mobility": 0.8,
+        "aoe": 0.5
+    },
+    BuildFocus.SURVIVAL: {
+        "damage": 0.5,
+        "control": 0.8,
+        "mobility": 0.7,
+        "defense": 1.0
+    },
+    BuildFocus.BUFF: {
+        "damage": 0.4,
+        "control": 0.9,
+        "mobility": 0.8,
+        "support": 1.0
+    }
+}
+
+SKILL_TYPE_WEIGHTS: Dict[BuildType, Dict[BuildFocus, Dict[str, float]]] = {
+    BuildType.RAID: _PVE_SKILL_TYPE_WEIGHTS,
+    BuildType.FARM: _PVE_SKILL_TYPE_WEIGHTS,
+    BuildType.PVP: _PVP_SKILL_TYPE_WEIGHTS,
+}
+SECOND_TYPE_FACTOR = 0.5
+FOCUS_CATEGORY_WEIGHT = 0.3
+SKILL_GEM_SYNERGY_WEIGHT = 0.5
+
+
+def _as_dict(data: Any) -> Dict[str, Any]:
+    """Get a model's fields, or a mapping's items, as a dict."""
+    if isinstance(data, BaseModel):
+        return data.model_dump(by_alias=True)
+    return dict(data) if isinstance(data, Mapping) else {}
+
+
+class SkillScorer:
+    """Scores every skill of a class for a build.
+
+    A skill's features are its base types ("type:<name>", the second base
+    type counting half), its categories ("category:<name>") and the synergy
+    categories listing it ("synergy:<name>"). Scores are the weighted sum of
+    features over the sum of the weights that applied, at least 1.0.
+    """
+
+    def __init__(
+            self,
+            registry: Mapping[str, Any],
+            focus_categories: Mapping[BuildFocus, Collection[str]],
+            synergies: Any = None,
+            backend: Optional[str] = None
+        ) -> None:
+        """Build the skill feature matrix.
+
+        Args:
+            registry: Skill data keyed by skill name, as in base_skills.json
+            focus_categories: Skill categories that match each focus
+            synergies: Synergy data, see synergy_skills()
+            backend: Feature matrix backend, see features.BACKENDS
+        """
+        category_skills = synergy_skills(synergies)
+        self.skills: List[str] = list(registry)
+        rows = []
+        for skill_name, skill in registry.items():
+            data = _as_dict(skill)
+            row: Dict[str, float] = {}
+            if data.get("base_type"):
+                name = f"type:{data['base_type']}"
+                row[name] = row.get(name, 0.0) + 1.0
+            if data.get("second_base_type"):
+                name = f"type:{data['second_base_type']}"
+                row[name] = row.get(name, 0.0) + SECOND_TYPE_FACTOR
+            for category in data.get("categories") or []:
+                name = f"category:{category}"
+                row[name] = row.get(name, 0.0) + 1.0
+            for category, skills in category_skills.items():
+                if skill_name in skills:
+                    row[f"synergy:{category}"] = 1.0
+            rows.append(row)
+        self.matrix = FeatureMatrix(rows, backend)
+        self._focus_categories = {focus: frozenset(names) for focus, names in focus_categories.items()}
+
+    def scores(
+            self,
+            build_type: BuildType,
+            focus: BuildFocus,
+            synergy_counts: Optional[Mapping[str, int]] = None
+        ) -> Dict[str, float]:
+        """Score every skill.
+
+        Args:
+            build_type: Type of build
+            focus: Build focus
+            synergy_counts: Number of selected gems in each synergy category
+
+        Returns:
+            Dict[str, float]: Scores from 0.0 to 1.0 keyed by skill name
+        """
+        type_weights = SKILL_TYPE_WEIGHTS[build_type][focus]
+        focus_categories = self._focus_categories.get(focus, frozenset())
+        synergy_counts = synergy_counts or {}
+
+        score_weights = []
+        total_weights = []
+        for column in self.matrix.columns:
+            kind, name = column.split(":", 1)
+            if kind == "type":
+                score_weights.append(type_weights.get(name, 0.0))
+                total_weights.append(1.0 if name in type_weights else 0.0)
+                continue
+            if kind == "category":
+                weight = FOCUS_CATEGORY_WEIGHT if name in focus_categories else 0.0
+            else:
+                weight = SKILL_GEM_SYNERGY_WEIGHT * synergy_counts.get(name, 0)
+            score_weights.append(weight)
+            total_weights.append(weight)
+
+        score = self.matrix.dot(self.matrix.vector(score_weights))
+        total_weight = self.matrix.dot(self.matrix.vector(total_weights))
+        return dict(zip(self.skills, tolist(normalize(score, total_weight))))
+
+
+# Essence features the scoring rules look at
+ESSENCE_SKILL_TYPES = frozenset({"damage", "control", "buff"})
+ESSENCE_TAGS = frozenset({"attack_speed", "utility", "pvp", "pve", "farm"})
+ESSENCE_GEM_SYNERGY_BONUS = 0.3
+
+# Skill type, whether the effect is a percentage bonus, whether it reduces
+# cooldowns, and the scored effect tags
+EssenceProfile = Tuple[str, bool, bool, FrozenSet[str]]
+
+
+def essence_profile(essence: Any) -> EssenceProfile:
+    """Reduce an essence to the features its score depends on.
+
+    Args:
+        essence: EssenceData or a dict of essence data; the skill type is read
+            from "skill_type", falling back to "effect_type"
+
+    Returns:
+        EssenceProfile: The essence's profile
+    """
+    data = _as_dict(essence)
+    skill_type = data.get("skill_type") or data.get("effect_type") or ""
+    effect = data.get("effect", "")
+    tags = frozenset(data.get("effect_tags") or []) & ESSENCE_TAGS
+
+    percent_effect = cooldown_reduction = False
+    if isinstance(effect, str):
+        effect = effect.lower()
+        percent_effect = "increased" in effect or "more" in effect
+        cooldown_reduction = "cooldown" in effect and "reduced" in effect
+
+    return (
+        skill_type if skill_type in ESSENCE_SKILL_TYPES else "",
+        percent_effect,
+        cooldown_reduction,
+        tags
+    )
+
+
+def essence_rule_score(profile: EssenceProfile, build_type: BuildType, focus: BuildFocus) -> float:
+    """Score an essence profile before gem synergies.
+
+    Args:
+        profile: Profile of the essence, see essence_profile()
+        build_type: Type of build
+        focus: Build focus
+
+    Returns:
+        Score, may be above 1.0
+    """
+    skill_type, percent_effect, cooldown_reduction, effect_tags = profile
+    base_score = 0.0
+    focus_bonus = 0.0
+    build_type_bonus = 0.0
+
+    # Score based on effect type
+    if focus == BuildFocus.DPS:
+        if skill_type == "damage":
+            base_score = 0.4
+            focus_bonus = 0.3
+            # Higher scores for percentage-based and attack speed effects
+            if percent_effect or "attack_speed" in effect_tags:
+                base_score = 0.6
+                focus_bonus = 0.4
+        elif skill_type in {"control", "buff"}:
+            base_score = 0.1
+    elif focus == BuildFocus.SURVIVAL:
+        if skill_type in {"control", "buff"}:
+            base_score = 0.4
+            focus_bonus = 0.3
+        elif skill_type == "damage":
+            base_score = 0.1
+            focus_bonus = 0.1
+
+    # Build type bonuses
+    if build_type == BuildType.PVP:
+        # In PvP, control and utility skills are more valuable
+        if skill_type == "control" or "utility" in effect_tags:
+            build_type_bonus = 0.4
+            base_score = max(base_score, 0.3)
+        elif "pvp" in effect_tags:
+            build_type_bonus = 0.3
+            base_score = max(base_score, 0.5)
+        elif "pve" in effect_tags:
+            base_score = min(base_score, 0.1)
+            focus_bonus = 0.0
+        elif skill_type == "damage":
+            # Pure damage skills without a PvP tag count less
+            base_score = min(base_score, 0.15)
+            focus_bonus = min(focus_bonus, 0.1)
+    elif build_type == BuildType.FARM:
+        if "farm" in effect_tags:
+            build_type_bonus = 0.2
+            base_score = max(base_score, 0.3)
+    elif build_type == BuildType.RAID:
+        if skill_type == "damage":
+            build_type_bonus = 0.4
+            base_score = max(base_score, 0.5)
+            if "attack_speed" in effect_tags:
+                build_type_bonus += 0.3
+            if percent_effect:
+                build_type_bonus += 0.3
+
+    # Percentage bonus, only when aligned with the focus and build type
+    if percent_effect:
+        if focus == BuildFocus.DPS and skill_type == "damage":
+            # In PvP, only PvP-tagged skills get it
+            if build_type != BuildType.PVP or "pvp" in effect_tags:
+                base_score = max(base_score, 0.4)
+                focus_bonus = max(focus_bonus, 0.3)
+        elif focus == BuildFocus.SURVIVAL and skill_type in {"control", "buff"}:
+            base_score = max(base_score, 0.3)
+            focus_bonus = max(focus_bonus, 0.2)
+
+    if cooldown_reduction:
+        base_score = max(base_score, 0.3)
+
+    # Attack speed bonus, separate from the percentage bonus
+    if "attack_speed" in effect_tags:
+        base_score = max(base_score, 0.4)
+        focus_bonus = max(focus_bonus, 0.3)
+
+    return base_score + focus_bonus + build_type_bonus
+
+
+def essence_skill(essence: Any) -> Optional[str]:
+    """Get the skill an essence modifies, from "skill" or "modifies_skill"."""
+    data = _as_dict(essence)
+    return data.get("skill") or data.get("modifies_skill")
+
+
+class EssenceScorer:
+    """Scores every essence of a class for a build.
+
+    The scoring rules are not linear in an essence's tags, so each distinct
+    profile (see essence_profile()) is a one-hot feature whose weight is the
+    rule score of that profile, computed once per (build type, focus). The
+    modified skill is a "skill:<name>" indicator weighted by the gem synergy
+    bonus when a selected gem synergizes with it.
+    """
+
+    def __init__(self, essences: Mapping[str, Any], backend: Optional[str] = None) -> None:
+        """Build the essence feature matrix.
+
+        Args:
+            essences: Essence data keyed by essence key
+            backend: Feature matrix backend, see features.BACKENDS
+        """
+        self.essences: List[str] = list(essences)
+        profiles: Dict[EssenceProfile, str] = {}
+        rows = []
+        for essence in essences.values():
+            profile = essence_profile(essence)
+            row = {profiles.setdefault(profile, f"profile:{len(profiles)}"): 1.0}
+            skill = essence_skill(essence)
+            if skill:
+                row[f"skill:{skill}"] = 1.0
+            rows.append(row)
+        self.matrix = FeatureMatrix(rows, backend)
+        self._profiles = {column: profile for profile, column in profiles.items()}
+        self._rule_scores: Dict[Tuple[BuildType, BuildFocus], List[float]] = {}
+
+    def scores(
+            self,
+            build_type: BuildType,
+            focus: BuildFocus,
+            synergy_skills: Collection[str] = ()
+        ) -> Dict[str, float]:
+        """Score every essence.
+
+        Args:
+            build_type: Type of build
+            focus: Build focus
+            synergy_skills: Skills that synergize with the selected gems
+
+        Returns:
+            Dict[str, float]: Scores from 0.0 to 1.0 keyed by essence key
+        """
+        rule_scores = self._rule_scores.get((build_type, focus))
+        if rule_scores is None:
+            rule_scores = [
+                essence_rule_score(self._profiles[column], build_type, focus)
+                if column in self._profiles else 0.0
+                for column in self.matrix.columns
+            ]
+            self._rule_scores[build_type, focus] = rule_scores
+
+        weights = [
+            ESSENCE_GEM_SYNERGY_BONUS
+            if column.startswith("skill:") and column[len("skill:"):] in synergy_skills
+            else weight
+            for column, weight in zip(self.matrix.columns, rule_scores)
+        ]
+        scores = clip(self.matrix.dot(self.matrix.vector(weights)))
+        return dict(zip(self.essences, tolist(scores)))
+
+
+def essence_score(
+        essence: Any,
+        build_type: BuildType,
+        focus: BuildFocus,
+        synergy_skills: Collection[str] = ()
+    ) -> float:
+    """Score a single essence, see EssenceScorer.
+
+    Args:
+        essence: EssenceData or a dict of essence data
+        build_type: Type of build
+        focus: Build focus
+        synergy_skills: Skills that synergize with the selected gems
+
+    Returns:
+        Score from 0.0 to 1.0
+    """
+    score = essence_rule_score(essence_profile(essence), build_type, focus)
+    if essence_skill(essence) in synergy_skills:
+        score += ESSENCE_GEM_SYNERGY_BONUS
+    return min(max(score, 0.0), 1.0)
+
+
+# Set bonus stat weights per focus, buff builds score survival stats
+_DPS_SET_STAT_WEIGHTS = {"damage": 0.4, "critical_hit": 0.3, "attack_speed": 0.3}
+_SURVIVAL_SET_STAT_WEIGHTS = {"life": 0.4, "armor": 0.3, "resistance": 0.3}
+SET_STAT_WEIGHTS: Dict[BuildFocus, Dict[str, float]] = {
+    BuildFocus.DPS: _DPS_SET_STAT_WEIGHTS,
+    BuildFocus.SURVIVAL: _SURVIVAL_SET_STAT_WEIGHTS,
+    BuildFocus.BUFF: _SURVIVAL_SET_STAT_WEIGHTS,
+}
+SET_SKILL_SYNERGY_WEIGHT = 0.5
+SET_GEM_SYNERGY_WEIGHT = 0.3
+# Set scores are stat percentages, scaled to 0.0 - 1.0
+SET_SCORE_SCALE = 100.0
+
+# Stats named in set bonus descriptions, most specific first
+_SET_BONUS_STATS = (
+    ("critical_hit", "critical hit"),
+    ("attack_speed", "attack speed"),
+    ("life", "life"),
+    ("armor", "armor"),
+    ("resistance", "resist"),
+    ("damage", "damage"),
+)
+_PERCENT = re.compile(r"(\d+(?:\.\d+)?)%")
+
+
+def set_bonus_stats(bonus: Any) -> Dict[str, float]:
+    """Get the stat values of one set bonus.
+
+    Args:
+        bonus: A mapping of stat name to value, or a bonus description, whose
+            first percentage counts for the most specific stat it names
+
+    Returns:
+        Dict[str, float]: Stat values keyed by stat name
+    """
+    if isinstance(bonus, Mapping):
+        return {
+            stat: float(value)
+            for stat, value in bonus.items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)
+        }
+    if not isinstance(bonus, str):
+        return {}
+    match = _PERCENT.search(bonus)
+    if match is None:
+        return {}
+    description = bonus.lower()
+    for stat, keyword in _SET_BONUS_STATS:
+        if keyword in description:
+            return {stat: float(match.group(1))}
+    return {}
+
+
+def equipment_sets(sets: Any) -> Dict[str, Dict[str, Any]]:
+    """Get the data of each equipment set.
+
+    Args:
+        sets: SetBonusRegistry, a mapping with a "registry", or a mapping of
+            set name to set data
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Set data keyed by set name
+    """
+    if isinstance(sets, BaseModel) and hasattr(sets, "registry"):
+        sets = sets.registry
+    elif isinstance(sets, Mapping) and isinstance(sets.get("registry"), Mapping):
+        sets = sets["registry"]
+    return {name: _as_dict(data) for name, data in (sets or {}).items()}
+
+
+def set_bonus_tiers(data: Mapping[str, Any]) -> Dict[int, Any]:
+    """Get the bonuses of one set by the piece count that activates them.
+
+    Args:
+        data: Set data, with "bonuses" keyed by piece count or "bonus_2pc",
+            "bonus_4pc" and "bonus_6pc" entries
+
+    Returns:
+        Dict[int, Any]: Bonuses keyed by piece count, without missing ones
+    """
+    if isinstance(data.get("bonuses"), Mapping):
+        tiers = {int(pieces): bonus for pieces, bonus in data["bonuses"].items()}
+    else:
+        tiers = {pieces: data.get(f"bonus_{pieces}pc") for pieces in (2, 4, 6)}
+    return {pieces: bonus for pieces, bonus in sorted(tiers.items()) if bonus}
+
+
+def set_synergy_features(data: Mapping[str, Any]) -> Dict[str, float]:
+    """Get the skill and gem synergy features of one set, see set_features()."""
+    features: Dict[str, float] = {}
+    for skill_name, synergy in (data.get("skill_synergies") or {}).items():
+        features[f"skill_damage:{skill_name}"] = float(synergy.get("damage", 0))
+        features[f"skill_defense:{skill_name}"] = float(synergy.get("defense", 0))
+    for gem_name, synergy in (data.get("gem_synergies") or {}).items():
+        features[f"gem:{gem_name}"] = float(synergy.get("effect_bonus", 0))
+    return features
+
+
+def set_features(data: Mapping[str, Any]) -> Dict[str, float]:
+    """Get the features of one set.
+
+    Features are the stat values of its bonuses summed over the piece
+    thresholds ("stat:<name>"), and its skill and gem synergy values
+    ("skill_damage:<skill>", "skill_defense:<skill>", "gem:<gem>").
+
+    Args:
+        data: Set data, see set_bonus_tiers()
+
+    Returns:
+        Dict[str, float]: Feature values keyed by feature name
+    """
+    features: Dict[str, float] = {}
+    for bonus in set_bonus_tiers(data).values():
+        for stat, value in set_bonus_stats(bonus).items():
+            features[f"stat:{stat}"] = features.get(f"stat:{stat}", 0.0) + value
+    features.update(set_synergy_features(data))
+    return features
+
+
+# Sets without a piece count have the most a set can have
+DEFAULT_SET_PIECES = 6
+
+
+class SetScorer:
+    """Scores every equipment set for a build, see set_features().
+
+    Besides whole sets, it values wearing a number of pieces of each set: the
+    bonuses of the piece thresholds reached plus the set's synergies. The
+    bonus value of every (set, threshold) is computed once per build type and
+    focus.
+    """
+
+    def __init__(self, sets: Any, backend: Optional[str] = None) -> None:
+        """Build the set feature matrices.
+
+        Args:
+            sets: Equipment sets, see equipment_sets()
+            backend: Feature matrix backend, see features.BACKENDS
+        """
+        sets = equipment_sets(sets)
+        self.sets: List[str] = list(sets)
+        self.matrix = FeatureMatrix([set_features(data) for data in sets.values()], backend)
+
+        # One row per (set, threshold) with the stats of that bonus alone
+        self._tiers: List[Tuple[str, int]] = []
+        tier_rows = []
+        self._pieces: Dict[str, int] = {}
+        for set_name, data in sets.items():
+            self._pieces[set_name] = int(data.get("pieces") or DEFAULT_SET_PIECES)
+            for pieces, bonus in set_bonus_tiers(data).items():
+                self._tiers.append((set_name, pieces))
+                tier_rows.append({f"stat:{stat}": value for stat, value in set_bonus_stats(bonus).items()})
+        self._tier_matrix = FeatureMatrix(tier_rows, backend)
+        self._tier_values: Dict[Tuple[BuildType, BuildFocus], Dict[str, Dict[int, float]]] = {}
+
+    def _weights(
+            self,
+            matrix: FeatureMatrix,
+            focus: BuildFocus,
+            skills: Collection[str],
+            gems: Collection[str],
+            stats: bool = True
+        ) -> List[float]:
+        """Get the scaled feature weights of a focus and the selected items."""
+        stat_weights = SET_STAT_WEIGHTS[focus]
+        skill_kind = "skill_damage" if focus == BuildFocus.DPS else "skill_defense"
+        weights = []
+        for column in matrix.columns:
+            kind, name = column.split(":", 1)
+            if kind == "stat":
+                weight = stat_weights.get(name, 0.0) if stats else 0.0
+            elif kind == skill_kind:
+                weight = SET_SKILL_SYNERGY_WEIGHT if name in skills else 0.0
+            elif kind == "gem":
+                weight = SET_GEM_SYNERGY_WEIGHT if name in gems else 0.0
+            else:
+                weight = 0.0
+            weights.append(weight / SET_SCORE_SCALE)
+        return weights
+
+    def scores(
+            self,
+            build_type: BuildType,
+            focus: BuildFocus,
+            skills: Collection[str] = (),
+            gems: Collection[str] = ()
+        ) -> Dict[str, float]:
+        """Score every set.
+
+        Args:
+            build_type: Type of build
+            focus: Build focus
+            skills: Names of the selected skills
+            gems: Names of the selected gems
+
+        Returns:
+            Dict[str, float]: Scores from 0.0 to 1.0 keyed by set name
+        """
+        weights = self._weights(self.matrix, focus, skills, gems)
+        scores = clip(self.matrix.dot(self.matrix.vector(weights)))
+        return dict(zip(self.sets, tolist(scores)))
+
+    def bonus_values(
+            self,
+            build_type: BuildType,
+            focus: BuildFocus,
+            piece_counts: Iterable[int],
+            skills: Collection[str] = (),
+            gems: Collection[str] = ()
+        ) -> Dict[str, Dict[int, float]]:
+        """Value wearing each number of pieces of every set.
+
+        Args:
+            build_type: Type of build
+            focus: Build focus
+            piece_counts: Numbers of pieces to value
+            skills: Names of the selected skills
+            gems: Names of the selected gems
+
+        Returns:
+            Dict[str, Dict[int, float]]: Values from 0.0 to 1.0 keyed by set
+                name and piece count, for the counts each set has pieces for
+        """
+        tier_values = self._tier_values.get((build_type, focus))
+        if tier_values is None:
+            weights = self._weights(self._tier_matrix, focus, (), ())
+            tier_values = {set_name: {} for set_name in self.sets}
+            values = tolist(self._tier_matrix.dot(self._tier_matrix.vector(weights)))
+            for (set_name, pieces), value in zip(self._tiers, values):
+                tier_values[set_name][pieces] = value
+            self._tier_values[build_type, focus] = tier_values
+
+        synergy_weights = self._weights(self.matrix, focus, skills, gems, stats=False)
+        synergies = tolist(self.matrix.dot(self.matrix.vector(synergy_weights)))
+
+        piece_counts = sorted(set(piece_counts))
+        bonus_values = {}
+        for set_name, synergy in zip(self.sets, synergies):
+            tiers = tier_values[set_name]
+            bonus_values[set_name] = {
+                count: min(max(
+                    sum(value for pieces, value in tiers.items() if pieces <= count) + synergy, 0.0
+                ), 1.0)
+                for count in piece_counts
+                if count <= self._pieces[set_name]
+            }
+        return bonus_values
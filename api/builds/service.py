@@ -1,15 +1,19 @@
 """Build generation service."""
 
-import json
+import asyncio
 import logging
 import os
-from typing import Dict, List, Optional, Set, Union
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple, Union
 
 from fastapi import HTTPException, status
 from pydantic import BaseModel, Field
 
+from ..core import codec
 from ..core.config import get_settings, Settings
 from ..models.game_data.manager import GameDataManager
+from ..models.game_data.names import normalize_name
+from ..models.game_data.schemas import BuildTypes
 from .models import (
     BuildFocus,
     BuildRecommendation,
@@ -20,6 +24,20 @@ from .models import (
     Skill,
     Equipment
 )
+from .beam_search import BuildSpace, beam_search_builds
+from .gem_loadout import GemCandidate, GemSlotRules, optimize_gem_loadout
+from .set_search import best_set_combination, set_combinations
+from .scoring import (
+    FOCUS_SYNERGY_CATEGORIES,
+    EssenceScorer,
+    GemScoreTable,
+    SetScorer,
+    SkillScorer,
+    aux_gem_score,
+    gem_rank_1_values,
+    synergy_gems,
+    synergy_skills
+)
 
 
 logger = logging.getLogger(__name__)
@@ -69,18 +87,30 @@ class BuildService:
         "BRACER_1": "Bracer 1", # First bracer slot
         "BRACER_2": "Bracer 2"  # Second bracer slot
     }
+    
+    # Skill lists of a class's constraints.json, as (slots, key) pairs
+    SKILL_SLOT_KEYS = (("skill_slots", "available_skills"), ("weapon_slots", "available_weapons"))
 
-    def __init__(self, settings: Optional[Settings] = None):
+    def __init__(
+        self,
+        settings: Optional[Settings] = None,
+        data_manager: Optional[GameDataManager] = None
+    ):
         """Initialize the build service.
         
         Args:
-            settings: Optional Settings instance. If not provided, will use default settings.
+            settings: Optional Settings instance. If not provided, will use the
+                data manager's settings or the default settings.
+            data_manager: Optional game data manager, e.g. the application's.
+                If not provided, the service gets a manager of its own.
             
         Note:
             This should not be called directly. Use create() instead.
         """
-        self.settings = get_settings() if settings is None else settings
-        self.data_manager = GameDataManager(settings=self.settings)
+        if settings is None:
+            settings = data_manager.settings if data_manager is not None else get_settings()
+        self.settings = settings
+        self.data_manager = data_manager if data_manager is not None else GameDataManager(settings=settings)
         self.CHARACTER_CLASSES = self._get_available_classes()
         # Data will be loaded by create()
         self.build_types = None
@@ -91,21 +121,43 @@ class BuildService:
         self.gem_skillmap = None
         self.stat_boosts = None
         self.sets = None
+        self.class_constraints: Optional[Dict[str, Dict]] = None  # Class constraints.json by class
+        self.class_data: Optional[Dict[str, Dict]] = None  # Other class files by class, e.g. base_skills
 
     @classmethod
-    async def create(cls) -> "BuildService":
+    async def create(cls, data_manager: Optional[GameDataManager] = None) -> "BuildService":
         """Create a new build service instance.
         
+        The service holds the data of the data manager's current generation,
+        so it should be created per request; the data itself is loaded once
+        per generation by the manager.
+        
+        Args:
+            data_manager: Optional game data manager, e.g. the application's
+        
         Returns:
             BuildService: The initialized build service
             
         Raises:
             HTTPException: If required data files are missing
         """
-        service = cls()
+        service = cls(data_manager=data_manager)
         await service._load_data()
         return service
 
+    async def preload(self) -> None:
+        """Build the derived entries of every class for the current generation.
+        
+        Used by the preforking server after GameDataManager.preload(), so the
+        workers inherit the scorers instead of building them on their first
+        build request.
+        """
+        await self._gem_score_table()
+        await self._set_scorer()
+        for class_name in sorted(self.CHARACTER_CLASSES):
+            await self._skill_scorer(class_name, self.class_data[class_name]["base_skills"]["registry"])
+            await self._essence_scorer(class_name)
+
     def _get_available_classes(self) -> Set[str]:
         """Get list of available character classes from data directory.
         
@@ -143,8 +195,8 @@ class BuildService:
             # Load equipment data
             self.sets = await self.data_manager.get_data("sets")
             
-            # Validate loaded data
-            self._validate_data_structure()
+            # Load class data
+            self.class_constraints, self.class_data = await self._class_data()
             
         except Exception as e:
             logger.error(f"Error loading data: {str(e)}")
@@ -153,6 +205,39 @@ class BuildService:
                 detail=f"Error loading data: {str(e)}"
             )
 
+    async def _class_data(self) -> Tuple[Dict[str, Dict], Dict[str, Dict]]:
+        """Get the class files of the current data generation.
+        
+        Returns:
+            Tuple of the constraints.json of every class and the other class
+            files, with the skill registries keyed by the constraint names
+            
+        Raises:
+            HTTPException: If a class file is invalid
+        """
+        async def build() -> Tuple[Dict[str, Dict], Dict[str, Dict]]:
+            class_constraints = {}
+            class_data = {}
+            for class_name in sorted(self.CHARACTER_CLASSES):
+                class_constraints[class_name] = await self.data_manager.get_class_file(
+                    class_name, "constraints"
+                )
+                class_data[class_name] = {
+                    "base_skills": await self.data_manager.get_class_file(class_name, "base_skills")
+                }
+            
+            self._validate_data_structure(class_constraints, class_data)
+            for class_name, data in class_data.items():
+                data["base_skills"] = {
+                    **data["base_skills"],
+                    "registry": self._match_skill_names(
+                        data["base_skills"]["registry"], class_constraints[class_name]
+                    )
+                }
+            return class_constraints, class_data
+        
+        return await self.data_manager.get_derived("builds/class_data", build)
+    
     def _load_json_file(self, relative_path: str) -> Dict:
         """Load a JSON file from the data directory.
         
@@ -170,8 +255,7 @@ class BuildService:
             if not os.path.exists(file_path):
                 raise FileNotFoundError(f"Required data file not found: {file_path}")
                 
-            with open(file_path, "r") as f:
-                return json.load(f)
+            return codec.load_file(file_path)
                 
         except Exception as e:
             logger.error(f"Error loading {relative_path}: {str(e)}")
@@ -180,66 +264,61 @@ class BuildService:
                 detail=f"Failed to load {relative_path}: {str(e)}"
             )
     
-    def _validate_data_structure(self) -> None:
-        """Validate the structure of loaded data.
-        
-        Raises:
-            HTTPException: If data structure is invalid.
-        """
-        # Validate synergies structure
-        if not isinstance(self.synergies, dict):
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Synergies must be a dictionary"
-            )
+    @staticmethod
+    def _match_skill_names(registry: Dict, class_constraints: Dict) -> Dict:
+        """Key a class's skill registry by the skill names its constraints use.
         
-        required_synergy_keys = {"metadata", "synergies"}
-        if not all(key in self.synergies for key in required_synergy_keys):
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Missing required keys in synergies data"
-            )
+        The two files spell some names differently, e.g. "Hammer Of The
+        Ancients" and "Hammer of the Ancients"; essences use the names of the
+        constraints.
         
-        # Validate constraints structure
-        required_constraints = {"gem_slots", "essence_slots"}
-        if not all(key in self.constraints for key in required_constraints):
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Missing required constraint categories"
-            )
+        Args:
+            registry: Skill data keyed by skill name, as in base_skills.json
+            class_constraints: The class's constraints.json
+            
+        Returns:
+            The registry keyed by the constraint names where they match
+        """
+        names = {
+            normalize_name(skill): skill
+            for slots, key in BuildService.SKILL_SLOT_KEYS
+            for skill in class_constraints[slots][key]
+        }
+        return {names.get(normalize_name(skill), skill): data for skill, data in registry.items()}
+    
+    def _validate_data_structure(
+        self,
+        class_constraints: Dict[str, Dict],
+        class_data: Dict[str, Dict]
+    ) -> None:
+        """Validate the structure of loaded data.
         
-        # Validate stats structure
-        required_stats_keys = {"metadata", "stats"}
-        if not all(key in self.stat_boosts for key in required_stats_keys):
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Missing required keys in stats data"
-            )
+        The game data categories are validated by their models when they are
+        loaded; the class files are plain JSON and are checked here.
         
-        # Validate equipment data structure
-        required_equipment_keys = {"metadata", "gear", "sets"}  
-        if not all(key in self.sets for key in required_equipment_keys):
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Missing required keys in equipment data"
-            )
+        Args:
+            class_constraints: constraints.json of every class
+            class_data: Other class files of every class
         
-        # Validate class data structure
-        for class_name, data in self.class_data.items():
-            # Validate base skills
-            required_skill_keys = {"metadata", "skills"}
-            if not all(key in data["base_skills"] for key in required_skill_keys):
+        Raises:
+            HTTPException: If data structure is invalid.
+        """
+        for class_name, constraints in class_constraints.items():
+            # Validate skill and weapon slots
+            if not all(
+                key in constraints.get(slots, {})
+                for slots, key in self.SKILL_SLOT_KEYS
+            ):
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"Missing required keys in base skills for class {class_name}"
+                    detail=f"Missing skill or weapon slots in constraints for class {class_name}"
                 )
             
-            # Validate essences
-            required_essence_keys = {"metadata", "essences", "indexes"}
-            if not all(key in data["essences"] for key in required_essence_keys):
+            # Validate base skills
+            if "registry" not in class_data[class_name]["base_skills"]:
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"Missing required essence keys for class {class_name}"
+                    detail=f"Missing skill registry in base skills for class {class_name}"
                 )
 
     async def generate_build(
@@ -308,17 +387,28 @@ class BuildService:
                 selected_equipment
             )
             
+            set_pieces = Counter(piece.name for piece in selected_equipment.values())
             return BuildResponse(
-                build_type=build_type,
-                focus=focus,
-                character_class=character_class,
-                gems=selected_gems,
-                skills=selected_skills,
-                equipment=selected_equipment,
+                build=BuildRecommendation(
+                    gems=selected_gems,
+                    skills=selected_skills,
+                    equipment=list(selected_equipment.values()),
+                    synergies=synergies
+                ),
+                stats=self._calculate_stats(selected_gems, selected_skills, selected_equipment),
                 recommendations=recommendations,
-                synergies=synergies
+                name=f"{character_class.title()} {build_type.value} {focus.value} build",
+                type=build_type,
+                focus=focus,
+                class_type=character_class,
+                gear={},
+                sets={name: {"pieces": pieces} for name, pieces in set_pieces.items()},
+                skills={skill.name: {"essence": skill.essence} for skill in selected_skills},
+                paragon={}
             )
             
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Error generating build: {str(e)}")
             raise HTTPException(
@@ -326,6 +416,168 @@ class BuildService:
                 detail=f"Failed to generate build: {str(e)}"
             )
     
+    async def generate_builds(
+        self,
+        build_type: BuildType,
+        focus: BuildFocus,
+        character_class: str,
+        inventory: Optional[Dict] = None,
+        beam_width: Optional[int] = None,
+        top_k: Optional[int] = None
+    ) -> List[BuildRecommendation]:
+        """Generate the best builds with a joint search over every component.
+        
+        Unlike generate_build(), which fixes the gems before choosing the
+        skills and the skills before the sets, the gems, skills, essences and
+        sets are searched together, see beam_search_builds().
+        
+        Args:
+            build_type: Type of build to generate (PVE, PVP, etc.)
+            focus: Primary focus of the build (DPS, survival, etc.)
+            character_class: Character class
+            inventory: Optional user inventory to consider
+            beam_width: Partial builds kept per search step, defaults to
+                BUILD_SEARCH_BEAM_WIDTH
+            top_k: Builds to return, defaults to BUILD_SEARCH_TOP_K
+        
+        Returns:
+            List of builds, best first
+        
+        Raises:
+            HTTPException: If the class is invalid or no valid build is found
+        """
+        if character_class not in self.CHARACTER_CLASSES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid character class: {character_class}. Available classes: {', '.join(sorted(self.CHARACTER_CLASSES))}"
+            )
+        
+        try:
+            space = await self._build_space(build_type, focus, character_class)
+            top_k = top_k or self.settings.BUILD_SEARCH_TOP_K
+            result = beam_search_builds(
+                space,
+                beam_width=max(beam_width or self.settings.BUILD_SEARCH_BEAM_WIDTH, top_k),
+                top_k=top_k,
+                time_budget=self.settings.BUILD_SEARCH_BUDGET_MS / 1000
+            )
+            if not result.complete:
+                logger.info(
+                    f"Build search ran out of time after {result.elapsed_ms:.0f} ms and "
+                    f"{result.expanded} partial builds, completed its builds greedily"
+                )
+            
+            essences = await self.data_manager.get_class_essences(character_class)
+            builds = []
+            for build in result.builds:
+                skills = [
+                    Skill(
+                        name=choice.skill,
+                        essence=essences[choice.essence].essence_name if choice.essence else None
+                    )
+                    for choice in build.skills
+                ]
+                try:
+                    self._validate_skill_selection([skill.name for skill in skills], character_class, build_type)
+                except HTTPException as e:
+                    logger.debug(f"Skipping build with score {build.score:.3f}: {e.detail}")
+                    continue
+                
+                gems = []
+                for slot in build.gems:
+                    owned_rank, quality = self._gem_rank(slot.primary, inventory)
+                    gems.append(Gem(name=slot.primary, rank=owned_rank, quality=quality, aux_gem=slot.aux))
+                
+                equipment = []
+                set_slots = list(self.SET_SLOTS.values())
+                for choice in build.sets:
+                    equipment.extend(
+                        await self._get_best_set_pieces(
+                            set_name=choice.set_name,
+                            slots=set_slots[len(equipment):len(equipment) + choice.pieces]
+                        )
+                    )
+                
+                builds.append(BuildRecommendation(
+                    gems=gems,
+                    skills=skills,
+                    equipment=equipment,
+                    synergies=await self._find_synergies(gems, skills, equipment)
+                ))
+            
+            if not builds:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Unable to create valid skill selection"
+                )
+            return builds
+        
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error generating builds: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to generate builds: {str(e)}"
+            )
+    
+    async def _build_space(
+        self,
+        build_type: BuildType,
+        focus: BuildFocus,
+        character_class: str
+    ) -> BuildSpace:
+        """Gather what the builds of a class can be made of.
+        
+        Args:
+            build_type: Type of build
+            focus: Build focus
+            character_class: Character class
+            
+        Returns:
+            BuildSpace for beam_search_builds()
+            
+        Raises:
+            HTTPException: If the class has no weapon skills
+        """
+        class_constraints = self.class_constraints[character_class]
+        available_skills = class_constraints["skill_slots"]["available_skills"]
+        available_weapons = class_constraints["weapon_slots"]["available_weapons"]
+        if not available_weapons:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No weapon skills available"
+            )
+        
+        skill_registry = self.class_data[character_class]["base_skills"]["registry"]
+        essence_engine = await self.data_manager.get_essence_engine(character_class)
+        gem_scores = await self._gem_score_table()
+        candidates = await self._gem_candidates(build_type, focus)
+        
+        return BuildSpace(
+            build_type=build_type,
+            focus=focus,
+            gems=candidates,
+            gem_rules=GemSlotRules.from_constraints(self.constraints),
+            gem_categories={gem.name: self._get_gem_categories(gem_scores, gem.name) for gem in candidates},
+            skill_categories={
+                skill: skill_registry[skill].get("categories", [])
+                for skill in available_skills + available_weapons
+            },
+            category_skills=synergy_skills(self.synergies),
+            weapons=available_weapons,
+            skills=available_skills,
+            skill_count=5,
+            skill_essences={
+                skill: list(essence_engine.query(skill=skill))
+                for skill in available_skills + available_weapons
+            },
+            skill_scorer=await self._skill_scorer(character_class, skill_registry),
+            essence_scorer=await self._essence_scorer(character_class),
+            set_scorer=await self._set_scorer(),
+            set_combinations=set_combinations(self.constraints)
+        )
+    
     def _validate_inventory(self, inventory: Dict) -> None:
         """Validate inventory format and contents.
         
@@ -368,6 +620,9 @@ class BuildService:
     ) -> List[Gem]:
         """Select gems based on build criteria.
         
+        The gems are the highest scoring loadout under the gem slot
+        constraints, see optimize_gem_loadout().
+        
         Args:
             build_type: Type of build
             focus: Build focus
@@ -375,144 +630,101 @@ class BuildService:
             
         Returns:
             List of selected gems
+            
+        Raises:
+            HTTPException: If no loadout fills every primary gem slot
         """
-        # Get gem slot constraints
-        slot_constraints = self.constraints["gem_slots"]
-        total_slots = slot_constraints["total_required"]
-        
-        # Initialize selected gems
-        selected_gems = []
-        used_gems = set()  # Track used gems to avoid duplicates
-        
-        # Get gems that match the build focus
-        focus_gems = []
-        for category, data in self.synergies.items():
-            if self._matches_focus(category, focus):
-                focus_gems.extend(data["gems"])
-        
-        # Sort gems by effectiveness for the build type
-        focus_gems.sort(
-            key=lambda g: self._calculate_gem_score(g, build_type, focus),
-            reverse=True
+        # Find the best loadout under the gem slot rules
+        rules = GemSlotRules.from_constraints(self.constraints)
+        candidates = await self._gem_candidates(build_type, focus)
+        loadout = optimize_gem_loadout(
+            candidates,
+            rules,
+            time_budget=self.settings.GEM_SEARCH_BUDGET_MS / 1000
         )
-        
-        # Select primary gems first
-        for gem in focus_gems:
-            if len(selected_gems) >= total_slots:
-                break
-                
-            if gem in used_gems:
-                continue
-            
-            # Check if gem is in inventory
-            if inventory and gem in inventory:
-                owned_rank = inventory[gem]["owned_rank"]
-                quality = inventory[gem].get("quality")
-            else:
-                # Get rank from gem data
-                gem_data = None
-                for skill_gems in self.gem_data["effects"]["gems_by_skill"].values():
-                    for g in skill_gems:
-                        if g["Name"] == gem:
-                            gem_data = g
-                            break
-                    if gem_data:
-                        break
-                
-                if not gem_data:
-                    raise HTTPException(
-                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                        detail=f"Gem data not found: {gem}"
-                    )
-                
-                owned_rank = int(gem_data["Rank"])
-                quality = None
-            
-            # Find best aux gem for this primary gem
-            aux_gem = self._select_aux_gem(
-                primary_gem=gem,
-                build_type=build_type,
-                focus=focus,
-                inventory=inventory,
-                used_gems=used_gems
+        if not loadout.slots:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"No gem loadout fills the {rules.primary_count} primary gem slots of a "
+                       f"{build_type.value} {focus.value} build"
             )
-            
+        if not loadout.complete:
+            logger.info(
+                f"Gem loadout search stopped after {loadout.elapsed_ms:.0f} ms and "
+                f"{loadout.nodes} nodes, score {loadout.score:.3f} is within "
+                f"{loadout.gap:.3f} of optimal"
+            )
+        
+        selected_gems = []
+        for slot in loadout.slots:
+            owned_rank, quality = self._gem_rank(slot.primary, inventory)
             selected_gems.append(Gem(
-                name=gem,
+                name=slot.primary,
                 rank=owned_rank,
                 quality=quality,
-                aux_gem=aux_gem
+                aux_gem=slot.aux
             ))
-            
-            # Mark both primary and aux gems as used
-            used_gems.add(gem)
-            if aux_gem:
-                used_gems.add(aux_gem)
         
         return selected_gems
     
-    def _select_aux_gem(
-        self,
-        primary_gem: str,
-        build_type: BuildType,
-        focus: BuildFocus,
-        inventory: Optional[Dict],
-        used_gems: Set[str]
-    ) -> Optional[str]:
-        """Select an aux gem for a primary gem.
+    async def _gem_candidates(self, build_type: BuildType, focus: BuildFocus) -> List[GemCandidate]:
+        """Score every gem as a primary and as an aux gem.
+        
+        Gems of synergy categories matching the build focus can be primary
+        gems; any gem can be an aux gem.
         
         Args:
-            primary_gem: Name of the primary gem
             build_type: Type of build
             focus: Build focus
-            inventory: Optional user inventory
-            used_gems: Set of already used gems
             
         Returns:
-            Name of selected aux gem or None
+            List of gem candidates
         """
-        # Get primary gem's star rating
-        try:
-            progression_data = self.gem_data["gems"][primary_gem]
-            primary_star_rating = progression_data.get("star_rating")
-            if not primary_star_rating:
-                return None
-        except (KeyError, AttributeError):
-            return None
-        
-        # Get all gems with matching star rating
+        focus_gems = {
+            gem
+            for category, gems in synergy_gems(self.synergies).items()
+            if self._matches_focus(category, focus)
+            for gem in gems
+        }
+        rank_1_values = gem_rank_1_values(self.stat_boosts)
+        gem_scores = await self._gem_score_table()
+        catalog = await self.data_manager.get_gem_catalog()
+        
         candidates = []
-        for gem_name, data in self.gem_data["gems"].items():
-            if (
-                gem_name != primary_gem
-                and gem_name not in used_gems
-                and data.get("star_rating") == primary_star_rating
-            ):
-                candidates.append(gem_name)
-        
-        if not candidates:
-            return None
-        
-        # Calculate aux scores
-        aux_scores = []
-        for gem_name in candidates:
-            # Calculate base score
-            base_score = self._calculate_gem_score(gem_name, build_type, focus)
-            
-            # Adjust score based on rank 1 effect value
-            try:
-                rank_1_value = self.gem_data["stat_boosts"][gem_name]["rank_1"]
-                rank_1_ratio = rank_1_value / 100.0
-            except (KeyError, AttributeError):
-                rank_1_ratio = 0.5
-            
-            # Final score is weighted towards rank 1 effectiveness
-            final_score = (base_score * 0.4) + (rank_1_ratio * 0.6)
-            aux_scores.append((gem_name, final_score))
-        
-        # Sort by score and return best option
-        aux_scores.sort(key=lambda x: x[1], reverse=True)
-        return aux_scores[0][0] if aux_scores else None
+        for gem in catalog.query():
+            score = self._calculate_gem_score(gem_scores, gem.name, build_type, focus)
+            candidates.append(GemCandidate(
+                name=gem.name,
+                stars=int(gem.stars),
+                primary_score=score if gem.name in focus_gems else None,
+                aux_score=aux_gem_score(score, rank_1_values.get(gem.name))
+            ))
+        return candidates
+    
+    def _gem_rank(self, gem: str, inventory: Optional[Dict]) -> Tuple[int, Optional[int]]:
+        """Get the rank and quality of a gem, from the inventory if it is owned.
+        
+        Args:
+            gem: Name of the gem
+            inventory: Optional user inventory
+            
+        Returns:
+            Tuple of rank and quality
+            
+        Raises:
+            HTTPException: If the gem is not owned and has no gem data
+        """
+        if inventory and gem in inventory:
+            return inventory[gem]["owned_rank"], inventory[gem].get("quality")
+        
+        # A gem that is not owned is recommended at rank 1
+        if gem in self.gems.root:
+            return 1, None
+        
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Gem data not found: {gem}"
+        )
     
     async def _select_skills(
         self,
@@ -554,8 +766,7 @@ class BuildService:
             )
             
         # Get build type requirements
-        build_constraints = self.constraints["build_types"][build_type.value.lower()]
-        build_required_categories = build_constraints.get("required_categories", {})
+        build_required_categories = self._required_categories(build_type)
         
         # Get skill registry
         skill_registry = self.class_data[character_class]["base_skills"]["registry"]
@@ -575,31 +786,40 @@ class BuildService:
                     detail=f"Required skill categories not met for build type {build_type.value}. Category {category} needs {count}, but only {available_categories.get(category, 0)} available"
                 )
         
+        # Essences are looked up per skill through the class's essence query engine
+        essence_engine = await self.data_manager.get_essence_engine(character_class)
+        
+        # Score every skill and essence of the class at once
+        gem_scores = await self._gem_score_table()
+        synergy_counts = Counter(
+            category for gem in selected_gems for category in self._get_gem_categories(gem_scores, gem.name)
+        )
+        category_skills = synergy_skills(self.synergies)
+        gem_skills = {skill for category in synergy_counts for skill in category_skills.get(category, [])}
+        skill_scorer = await self._skill_scorer(character_class, skill_registry)
+        essence_scorer = await self._essence_scorer(character_class)
+        base_scores = skill_scorer.scores(build_type, focus, synergy_counts)
+        essence_scores = essence_scorer.scores(build_type, focus, gem_skills)
+        
         # Get skills that match focus and have gem synergies
         skill_scores = {}
         for skill in available_skills + available_weapons:
-            # Calculate base score from focus match
-            base_score = self._calculate_skill_score(skill, build_type, focus, selected_gems)
+            # Base score from focus match
+            base_score = base_scores.get(skill, 0.0)
             
             # Add bonus for gem synergies
             gem_synergy_bonus = 0
             for gem in selected_gems:
-                gem_categories = self._get_gem_categories(gem.name)
+                gem_categories = self._get_gem_categories(gem_scores, gem.name)
                 skill_categories = skill_registry[skill].get("categories", [])
                 matching_categories = set(gem_categories) & set(skill_categories)
                 if matching_categories:
                     gem_synergy_bonus += 0.2 * len(matching_categories)
             
             # Add bonus for essence availability
-            essence_data = self.class_data[character_class]["essences"]
-            skill_essences = essence_data.get("indexes", {}).get("by_skill", {}).get(skill, [])
+            skill_essences = essence_engine.query(skill=skill)
             if skill_essences:
-                best_essence_score = 0
-                for essence_slug in skill_essences[:10]:  # Limit essence search
-                    essence = essence_data["essences"].get(essence_slug)
-                    if essence:
-                        score = self._calculate_essence_score(essence, build_type, focus, selected_gems)
-                        best_essence_score = max(best_essence_score, score)
+                best_essence_score = max(essence_scores.get(key, 0.0) for key in skill_essences)
                 base_score += best_essence_score * 0.3  # Weight essence contribution
             
             final_score = base_score + gem_synergy_bonus
@@ -623,7 +843,6 @@ class BuildService:
         used_skills = {weapon_skill}
         
         # Then select secondary skills prioritizing synergies and essences
-        essence_data = self.class_data[character_class]["essences"]
         secondary_skills = []
         
         for skill, _ in sorted_skills:
@@ -635,21 +854,17 @@ class BuildService:
             best_score = -1
             
             # Get essences for this skill
-            skill_essences = essence_data.get("indexes", {}).get("by_skill", {}).get(skill, [])
+            skill_essences = essence_engine.query(skill=skill)
             
-            for essence_slug in skill_essences[:10]:  # Limit essence search
-                essence = essence_data["essences"].get(essence_slug)
-                if not essence:
-                    continue
-                    
-                score = self._calculate_essence_score(essence, build_type, focus, selected_gems)
+            for key, essence in skill_essences.items():
+                score = essence_scores.get(key, 0.0)
                 if score > best_score:
                     best_score = score
                     best_essence = essence
                     
             secondary_skills.append(Skill(
                 name=skill,
-                essence=best_essence["essence_name"] if best_essence else None
+                essence=best_essence.essence_name if best_essence else None
             ))
             used_skills.add(skill)
             
@@ -722,8 +937,7 @@ class BuildService:
                     
             # Check build type specific requirements first
             if build_type:
-                build_constraints = self.constraints["build_types"][build_type.value.lower()]
-                build_required_categories = build_constraints.get("required_categories", {})
+                build_required_categories = self._required_categories(build_type)
                 
                 for category, count in build_required_categories.items():
                     if skill_categories.get(category, 0) < count:
@@ -777,31 +991,19 @@ class BuildService:
                 detail=f"Error validating skill selection: {str(e)}"
             )
 
-    def _validate_weapon_selection(
-        self,
-        selected_weapon: str,
-        character_class: str
-    ) -> bool:
-        """Validate weapon selection against constraints.
+    def _required_categories(self, build_type: BuildType) -> Dict[str, int]:
+        """Get the skill categories a build type requires.
         
         Args:
-            selected_weapon: Selected weapon
-            character_class: Character class
+            build_type: Type of build
             
         Returns:
-            True if valid, False otherwise
+            Number of skills required per category, from the build type's
+            "required_categories" in build_types.json if it has any
         """
-        try:
-            # Get class constraints
-            class_constraints = self.class_constraints[character_class]
-            available_weapons = class_constraints["weapon_slots"]["available_weapons"]
-            
-            # Check weapon is available
-            return selected_weapon in available_weapons
-            
-        except (KeyError, TypeError):
-            return False
-    
+        build_config = self.build_types.build_types.get(build_type.value.lower(), {})
+        return build_config.get("required_categories", {})
+
     async def _select_equipment(
         self,
         build_type: BuildType,
@@ -843,17 +1045,10 @@ class BuildService:
             inventory=inventory
         )
         
-        # Assign set pieces to slots
+        # Assign set pieces to slots; the weapon skill is validated with the skills
         for slot, piece in zip(self.SET_SLOTS.values(), set_pieces):
             equipment[slot] = piece
         
-        # Validate equipment selection against class constraints
-        if not self._validate_weapon_selection(equipment["Hands"], character_class):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid equipment selection for character class"
-            )
-        
         return equipment
     
     async def _select_set_pieces(
@@ -866,6 +1061,9 @@ class BuildService:
     ) -> List[Equipment]:
         """Select set pieces based on build criteria.
         
+        The set slots are split between sets in the best of the valid
+        combinations, see best_set_combination().
+        
         Args:
             build_type: Type of build
             focus: Build focus
@@ -877,49 +1075,29 @@ class BuildService:
             List of selected set pieces
         """
         try:
-            # Get available sets
-            available_sets = self.sets  
-            
-            # Calculate scores for each set
-            set_scores = []
-            for set_name, data in available_sets.items():
-                score = await self._calculate_set_score(
-                    set_name=set_name,
-                    data=data,
-                    build_type=build_type,
-                    focus=focus,
-                    selected_gems=selected_gems,
-                    selected_skills=selected_skills
-                )
-                set_scores.append((set_name, score))
+            # Value every piece count of every set at once
+            combinations = set_combinations(self.constraints)
+            set_scorer = await self._set_scorer()
+            bonus_values = set_scorer.bonus_values(
+                build_type,
+                focus,
+                piece_counts={pieces for combination in combinations for pieces in combination},
+                skills={skill.name for skill in selected_skills},
+                gems={gem.name for gem in selected_gems}
+            )
             
-            # Sort sets by score
-            set_scores.sort(key=lambda x: x[1], reverse=True)
+            # Search every valid combination (6+2, 4+4, 4+2+2, 2+2+2+2)
+            combination = best_set_combination(bonus_values, combinations)
+            if combination is None:
+                raise KeyError(f"No valid set combination of {len(bonus_values)} sets")
             
-            # Select pieces based on valid combinations (6+2, 4+4, etc.)
             selected_pieces = []
-            remaining_slots = 8
-            
-            # Try 6+2 combination first
-            if remaining_slots >= 8:
-                primary_set = set_scores[0][0]
-                secondary_set = set_scores[1][0]
-                
-                # Add 6 pieces from primary set
+            set_slots = list(self.SET_SLOTS.values())
+            for choice in combination.choices:
                 selected_pieces.extend(
                     await self._get_best_set_pieces(
-                        set_name=primary_set,
-                        count=6,
-                        inventory=inventory
-                    )
-                )
-                
-                # Add 2 pieces from secondary set
-                selected_pieces.extend(
-                    await self._get_best_set_pieces(
-                        set_name=secondary_set,
-                        count=2,
-                        inventory=inventory
+                        set_name=choice.set_name,
+                        slots=set_slots[len(selected_pieces):len(selected_pieces) + choice.pieces]
                     )
                 )
             
@@ -1015,130 +1193,29 @@ class BuildService:
         # Normalize score to 0-1 range
         return min(max(total_score / 100.0, 0.0), 1.0)
 
-    async def _calculate_set_score(
-        self,
-        set_name: str,
-        data: Dict,
-        build_type: BuildType,
-        focus: BuildFocus,
-        selected_gems: List[Gem],
-        selected_skills: List[Skill]
-    ) -> float:
-        """Calculate score for a set.
-        
-        Args:
-            set_name: Name of the set
-            data: Set data
-            build_type: Type of build (PVE, PVP, etc)
-            focus: Build focus (DPS, Survival, etc)
-            selected_gems: List of selected gems
-            selected_skills: List of selected skills
-            
-        Returns:
-            Score between 0 and 1
-        """
-        total_score = 0.0
-        
-        # Score set bonuses
-        for bonus_key in ["bonus_2pc", "bonus_4pc", "bonus_6pc"]:
-            bonus = data.get(bonus_key, {})
-            if focus == BuildFocus.DPS:
-                total_score += (
-                    bonus.get("damage", 0) * 0.4 +
-                    bonus.get("critical_hit", 0) * 0.3 +
-                    bonus.get("attack_speed", 0) * 0.3
-                )
-            else:  # Survival focus
-                total_score += (
-                    bonus.get("life", 0) * 0.4 +
-                    bonus.get("armor", 0) * 0.3 +
-                    bonus.get("resistance", 0) * 0.3
-                )
-                
-        # Score skill synergies
-        skill_synergies = data.get("skill_synergies", {})
-        for skill in selected_skills:
-            if skill.name in skill_synergies:
-                synergies = skill_synergies[skill.name]
-                if focus == BuildFocus.DPS:
-                    total_score += synergies.get("damage", 0) * 0.5
-                else:  # Survival focus
-                    total_score += synergies.get("defense", 0) * 0.5
-                    
-        # Score gem synergies
-        gem_synergies = data.get("gem_synergies", {})
-        for gem in selected_gems:
-            if gem.name in gem_synergies:
-                synergies = gem_synergies[gem.name]
-                total_score += synergies.get("effect_bonus", 0) * 0.3
-                
-        # Normalize score to 0-1 range
-        return min(max(total_score / 100.0, 0.0), 1.0)
-    
     async def _get_best_set_pieces(
         self,
         set_name: str,
-        count: int,
-        inventory: Optional[Dict]
+        slots: List[str]
     ) -> List[Equipment]:
-        """Get the best pieces from a set.
+        """Get the pieces of a set for the given set slots.
+        
+        The set data has no stats per piece, so each slot gets the set's piece
+        for that slot.
         
         Args:
             set_name: Name of the set
-            count: Number of pieces to get
-            inventory: Optional user inventory
+            slots: Set slots to fill, one piece each
             
         Returns:
             List of selected equipment pieces
-        """
-        try:
-            pieces = []
-            set_data = self.sets[set_name]  
-            
-            # Sort pieces by their base stats
-            sorted_pieces = sorted(
-                set_data.items(),
-                key=lambda x: sum(x[1].get("base_stats", {}).values()),
-                reverse=True
-            )
             
-            # Take the top N pieces
-            for piece_name, _ in sorted_pieces[:count]:
-                # Get details from inventory if available
-                if inventory and piece_name in inventory:
-                    details = inventory[piece_name]
-                    pieces.append(Equipment(
-                        name=piece_name,
-                        slot=details.get("slot"),
-                        rank=details.get("rank"),
-                        quality=details.get("quality"),
-                        essence=details.get("essence")
-                    ))
-                else:
-                    pieces.append(Equipment(
-                        name=piece_name,
-                        slot=None,
-                        rank=None,
-                        quality=None,
-                        essence=None
-                    ))
-            
-            return pieces
-        
-        except (KeyError, AttributeError) as e:
-            logger.warning(
-                f"Error getting pieces for set {set_name}: {str(e)}"
-            )
-            return [
-                Equipment(
-                    name=None,
-                    slot=f"set_{i}",
-                    rank=None,
-                    quality=None,
-                    essence=None
-                )
-                for i in range(count)
-            ]
+        Raises:
+            KeyError: If the set is not found
+        """
+        if set_name not in self.sets.registry:
+            raise KeyError(f"Set not found: {set_name}")
+        return [Equipment(name=set_name, slot=slot) for slot in slots]
     
     def _calculate_stats(
         self,
@@ -1218,17 +1295,30 @@ class BuildService:
         return []
     
     def _matches_focus(self, category: str, focus: BuildFocus) -> bool:
-        """Check if a category matches the build focus.
+        """Check if a synergy category matches the build focus.
+        
+        Args:
+            category: Synergy category to check
+            focus: Build focus
+            
+        Returns:
+            True if category matches focus, see FOCUS_SYNERGY_CATEGORIES
+        """
+        return category in FOCUS_SYNERGY_CATEGORIES[focus]
+    
+    def _focus_categories(self, focus: BuildFocus) -> Set[str]:
+        """Get the skill categories that match a build focus.
         
         Args:
-            category: Category to check
             focus: Build focus
             
         Returns:
-            True if category matches focus
+            Set of category names
         """
         # Get focus categories from build types data
         build_types = self.build_types
+        if isinstance(build_types, BuildTypes):
+            build_types = build_types.build_types
         focus_categories = set()
         
         # Extract categories from terms in build types data
@@ -1239,377 +1329,96 @@ class BuildService:
                     term.split()[0] for term in focus_data.get("terms", [])
                 )
         
-        return category in focus_categories
+        return focus_categories
 
-    def _calculate_gem_score(
-        self,
-        gem_name: str,
-        build_type: BuildType,
-        focus: BuildFocus
-    ) -> float:
-        """Calculate a gem's effectiveness score.
+    async def _gem_score_table(self) -> GemScoreTable:
+        """Get the gem score table of the current data generation.
         
-        Args:
-            gem_name: Name of the gem
-            build_type: Type of build
-            focus: Build focus
-            
         Returns:
-            Score from 0.0 to 1.0
+            GemScoreTable: Scores of every gem for every build type and focus
         """
-        score = 0.0
-        total_weight = 0.0
-        
-        # Get gem's categories and their stats
-        categories = self._get_gem_categories(gem_name)
-        
-        # Base weights for different aspects
-        weights = {
-            BuildType.PVE: {
-                BuildFocus.DPS: {
-                    "critical_hit": 1.0,
-                    "attack_speed": 0.9,
-                    "damage": 1.0,
-                    "penetration": 0.8,
-                    "area_damage": 0.9,
-                    "skill_damage": 0.8,
-                    "primary_attack": 0.7,
-                    "damage_over_time": 0.7
-                },
-                BuildFocus.SURVIVAL: {
-                    "life": 1.0,
-                    "armor": 0.9,
-                    "resistance": 0.8,
-                    "block": 0.7,
-                    "healing": 0.9,
-                    "damage_reduction": 1.0,
-                    "shield": 0.8,
-                    "dodge": 0.7
-                },
-                BuildFocus.BUFF: {
-                    "movement_speed": 0.9,
-                    "cooldown_reduction": 1.0,
-                    "crowd_control": 0.7,
-                    "resource_generation": 0.8,
-                    "buff_duration": 0.8,
-                    "proc_chance": 0.7,
-                    "area_effect": 0.9,
-                    "control_duration": 0.6
-                }
-            },
-            BuildType.PVP: {
-                BuildFocus.DPS: {
-                    "critical_hit": 0.9,
-                    "attack_speed": 0.8,
-                    "damage": 1.0,
-                    "penetration": 1.0,
-                    "area_damage": 0.7,
-                    "skill_damage": 0.9,
-                    "primary_attack": 0.8,
-                    "damage_over_time": 0.6
-                },
-                BuildFocus.SURVIVAL: {
-                    "life": 1.0,
-                    "armor": 1.0,
-                    "resistance": 0.9,
-                    "block": 0.8,
-                    "healing": 0.7,
-                    "damage_reduction": 1.0,
-                    "shield": 0.9,
-                    "dodge": 0.8
-                },
-                BuildFocus.BUFF: {
-                    "movement_speed": 1.0,
-                    "cooldown_reduction": 0.9,
-                    "crowd_control": 1.0,
-                    "resource_generation": 0.7,
-                    "buff_duration": 0.8,
-                    "proc_chance": 0.7,
-                    "area_effect": 0.8,
-                    "control_duration": 0.9
-                }
-            }
-        }
-        
-        # Get stat values for the gem
-        try:
-            gem_stats = self.stat_boosts
-            for category in categories:
-                if category in gem_stats:
-                    # Get weight for this category
-                    weight = weights[build_type][focus].get(category, 0.5)
-                    total_weight += weight
-                    
-                    # Calculate score based on stat values
-                    if gem_name in gem_stats[category]:
-                        stat_data = gem_stats[category][gem_name]
-                        
-                        # Higher scores for scaling stats
-                        scaling_bonus = 0.2 if stat_data.get("scaling", False) else 0.0
-                        
-                        # Base score from rank 10 value
-                        rank_10_value = stat_data.get("rank_10", 0.0)
-                        normalized_value = min(rank_10_value / 100.0, 1.0)
-                        
-                        category_score = (normalized_value + scaling_bonus) * weight
-                        score += category_score
-        
-        except (KeyError, AttributeError) as e:
-            logger.warning(
-                f"Error calculating score for gem {gem_name}: {str(e)}"
-            )
-            return 0.0
+        async def build() -> GemScoreTable:
+            synergies = await self.data_manager.get_data("synergies")
+            stat_boosts = await self.data_manager.get_data("gems/stat_boosts")
+            return await asyncio.to_thread(GemScoreTable.build, synergies, stat_boosts)
         
-        # Normalize final score
-        return score / max(total_weight, 1.0) if total_weight > 0 else 0.0
+        return await self.data_manager.get_derived("builds/gem_scores", build)
     
-    def _calculate_skill_score(
-        self,
-        skill_name: str,
-        build_type: BuildType,
-        focus: BuildFocus,
-        selected_gems: List[Gem]
-    ) -> float:
-        """Calculate effectiveness score for a skill.
+    async def _skill_scorer(self, character_class: str, registry: Dict) -> SkillScorer:
+        """Get the skill scorer of a class for the current data generation.
         
         Args:
-            skill_name: Name of skill
-            build_type: Type of build
-            focus: Build focus
-            selected_gems: Previously selected gems
+            character_class: Character class
+            registry: Base skill registry of the class
             
         Returns:
-            Score between 0 and 1
+            SkillScorer: Scores of the class's skills
         """
-        try:
-            # Define type weights for different build types and focuses
-            type_weights = {
-                BuildType.PVE: {
-                    BuildFocus.DPS: {
-                        "damage": 1.0,
-                        "aoe": 0.9,
-                        "control": 0.5,
-                        "mobility": 0.3
-                    },
-                    BuildFocus.SURVIVAL: {
-                        "damage": 0.4,
-                        "control": 0.8,
-                        "mobility": 0.6,
-                        "defense": 1.0
-                    },
-                    BuildFocus.BUFF: {
-                        "damage": 0.3,
-                        "control": 0.7,
-                        "mobility": 0.5,
-                        "support": 1.0
-                    }
-                },
-                BuildType.PVP: {
-                    BuildFocus.DPS: {
-                        "damage": 0.9,
-                        "control": 0.7,
-                        "mobility": 0.8,
-                        "aoe": 0.5
-                    },
-                    BuildFocus.SURVIVAL: {
-                        "damage": 0.5,
-                        "control": 0.8,
-                        "mobility": 0.7,
-                        "defense": 1.0
-                    },
-                    BuildFocus.BUFF: {
-                        "damage": 0.4,
-                        "control": 0.9,
-                        "mobility": 0.8,
-                        "support": 1.0
-                    }
-                }
-            }
-            
-            # Get skill data
-            skill_data = self.class_data["barbarian"]["base_skills"]["registry"][skill_name]
-            score = 0.0
-            weight = 0.0
-            
-            # Calculate score based on base type
-            base_type = skill_data.get("base_type")
-            if base_type in type_weights[build_type][focus]:
-                type_score = type_weights[build_type][focus][base_type]
-                score += type_score
-                weight += 1.0
-            
-            # Add score for secondary type if present
-            second_type = skill_data.get("second_base_type")
-            if second_type and second_type in type_weights[build_type][focus]:
-                type_score = type_weights[build_type][focus][second_type] * 0.5  # Half weight for secondary
-                score += type_score
-                weight += 0.5
-            
-            # Check categories
-            categories = skill_data.get("categories", [])
-            for category in categories:
-                if self._matches_focus(category, focus):
-                    score += 0.3  # Bonus for matching category
-                    weight += 0.3
-            
-            # Check gem synergies
-            for gem in selected_gems:
-                for category in self._get_gem_categories(gem.name):
-                    if category in self.synergies:
-                        if skill_name in self.synergies[category]["skills"]:
-                            score += 0.5  # Bonus for gem synergy
-                            weight += 0.5
-            
-            # Normalize final score
-            return score / max(weight, 1.0) if weight > 0 else 0.0
-            
-        except (KeyError, AttributeError) as e:
-            logger.warning(f"Error calculating skill score for {skill_name}: {str(e)}")
-            return 0.0
+        async def build() -> SkillScorer:
+            focus_categories = {focus: self._focus_categories(focus) for focus in BuildFocus}
+            return await asyncio.to_thread(SkillScorer, registry, focus_categories, self.synergies)
+        
+        return await self.data_manager.get_derived(f"builds/skill_scorer/{character_class}", build)
     
-    def _get_gem_categories(self, gem_name: str) -> List[str]:
-        """Get categories that a gem belongs to.
+    async def _essence_scorer(self, character_class: str) -> EssenceScorer:
+        """Get the essence scorer of a class for the current data generation.
         
         Args:
-            gem_name: Name of the gem
+            character_class: Character class
             
         Returns:
-            List of category names
+            EssenceScorer: Scores of the class's essences
+        """
+        async def build() -> EssenceScorer:
+            essences = await self.data_manager.get_class_essences(character_class)
+            return await asyncio.to_thread(EssenceScorer, essences)
+        
+        return await self.data_manager.get_derived(f"builds/essence_scorer/{character_class}", build)
+    
+    async def _set_scorer(self) -> SetScorer:
+        """Get the set scorer of the current data generation.
+        
+        Returns:
+            SetScorer: Scores of the equipment sets
         """
-        # First check synergies
-        categories = []
-        for category, data in self.synergies.items():
-            if gem_name in data["gems"]:
-                categories.append(category)
+        async def build() -> SetScorer:
+            sets = await self.data_manager.get_data("sets")
+            return await asyncio.to_thread(SetScorer, sets)
         
-        return list(set(categories))  # Remove duplicates
+        return await self.data_manager.get_derived("builds/set_scorer", build)
     
-    def _calculate_essence_score(
+    def _calculate_gem_score(
         self,
-        essence: Dict,
+        gem_scores: GemScoreTable,
+        gem_name: str,
         build_type: BuildType,
-        focus: BuildFocus,
-        selected_gems: List[Gem]
+        focus: BuildFocus
     ) -> float:
-        """Calculate effectiveness score for an essence.
+        """Calculate a gem's effectiveness score.
         
         Args:
-            essence: Essence data
+            gem_scores: Gem score table, see _gem_score_table()
+            gem_name: Name of the gem
             build_type: Type of build
             focus: Build focus
-            selected_gems: Previously selected gems
             
         Returns:
-            Score between 0 and 1
+            Score from 0.0 to 1.0
         """
-        skill_type = essence.get("skill_type", "")
-        effect = essence.get("effect", "")
-        effect_tags = essence.get("effect_tags", [])
-        
-        base_score = 0.0
-        focus_bonus = 0.0
-        build_type_bonus = 0.0
-        gem_bonus = 0.0
-        
-        # Score based on effect type
-        if skill_type:
-            if focus == BuildFocus.DPS:
-                if skill_type == "damage":
-                    base_score = 0.4  # Increased base score for damage
-                    focus_bonus = 0.3  # Focus bonus for damage
-                    # Higher scores for percentage-based effects
-                    if isinstance(effect, str):
-                        if "increased" in effect.lower() or "more" in effect.lower():
-                            base_score = max(base_score, 0.6)  # Higher base score for percentage bonuses
-                            focus_bonus = max(focus_bonus, 0.4)  # Increased bonus for percentage effects
-                        if "attack_speed" in effect_tags:
-                            base_score = max(base_score, 0.6)  # Higher base score for attack speed
-                            focus_bonus = max(focus_bonus, 0.4)  # Increased bonus for attack speed
-                elif skill_type in {"control", "buff"}:
-                    base_score = 0.1  # Lower score for non-damage essences
-                    focus_bonus = 0.0  # No focus bonus for non-damage essences
-            elif focus == BuildFocus.SURVIVAL:
-                if skill_type in {"control", "buff"}:
-                    base_score = 0.4  # Base score for defensive essences
-                    focus_bonus = 0.3  # Focus bonus for survival
-                elif skill_type == "damage":
-                    base_score = 0.1  # Lower score for damage essences
-                    focus_bonus = 0.1  # Lower focus bonus
-                    
-        # Build type bonuses
-        if build_type == BuildType.PVP:
-            # In PvP, control and utility skills are more valuable
-            if skill_type == "control" or "utility" in effect_tags:
-                build_type_bonus = 0.4  # Higher bonus for control/utility in PvP
-                base_score = max(base_score, 0.3)  # Higher minimum score for control/utility
-            elif "pvp" in effect_tags:
-                build_type_bonus = 0.3  # Higher bonus for PvP effects
-                base_score = max(base_score, 0.5)  # Higher minimum score for PvP effects
-            elif "pve" in effect_tags:
-                base_score = min(base_score, 0.1)  # Lower score for PvE effects in PvP
-                focus_bonus = 0.0  # No focus bonus for PvE effects
-                build_type_bonus = 0.0  # No build type bonus for PvE effects
-            elif skill_type == "damage":
-                # Reduce score for pure damage skills in PvP unless they have PvP tag
-                base_score = min(base_score, 0.15)  # Lower base score for damage
-                focus_bonus = min(focus_bonus, 0.1)  # Lower focus bonus for damage
-        elif build_type == BuildType.FARM:
-            if "farm" in effect_tags:
-                build_type_bonus = 0.2
-                base_score = max(base_score, 0.3)  # Higher minimum score for farming effects
-        elif build_type == BuildType.RAID:
-            if skill_type == "damage":
-                build_type_bonus = 0.4  # Increased bonus for damage skills in raids
-                base_score = max(base_score, 0.5)  # Higher minimum score for damage
-                # Additional bonus for attack speed in raids
-                if "attack_speed" in effect_tags:
-                    build_type_bonus += 0.3  # Extra bonus for attack speed in raids
-                # Additional bonus for percentage-based effects in raids
-                if isinstance(effect, str):
-                    if "increased" in effect.lower() or "more" in effect.lower():
-                        build_type_bonus += 0.3  # Extra bonus for percentage-based effects in raids
-                
-        # Percentage bonus
-        if isinstance(effect, str):
-            if "increased" in effect.lower() or "more" in effect.lower():
-                # Only apply percentage bonus if it's aligned with the focus and build type
-                if (focus == BuildFocus.DPS and skill_type == "damage"):
-                    # In PvP, only give percentage bonus to PvP-tagged skills
-                    if build_type == BuildType.PVP and "pvp" not in effect_tags:
-                        pass  # No percentage bonus for non-PvP damage skills
-                    else:
-                        base_score = max(base_score, 0.4)  # Higher minimum score for percentage bonuses
-                        focus_bonus = max(focus_bonus, 0.3)  # Increased bonus for percentage effects
-                elif (focus == BuildFocus.SURVIVAL and skill_type in {"control", "buff"}):
-                    base_score = max(base_score, 0.3)  # Higher minimum score for percentage bonuses
-                    focus_bonus = max(focus_bonus, 0.2)  # Increased bonus for percentage effects
-            
-            # Cooldown reduction bonus
-            if "cooldown" in effect.lower() and "reduced" in effect.lower():
-                base_score = max(base_score, 0.3)  # Higher minimum score for cooldown reduction
-            
-        # Attack speed bonus (separate from percentage bonus)
-        if "attack_speed" in effect_tags:
-            base_score = max(base_score, 0.4)  # Higher minimum score for attack speed
-            focus_bonus = max(focus_bonus, 0.3)  # Increased bonus for attack speed
-        
-        # Calculate initial score before gem bonus
-        initial_score = base_score + focus_bonus + build_type_bonus
-        
-        # Gem synergies
-        for gem in selected_gems:
-            if gem.name in self.gem_data["synergies"]:
-                gem_synergies = self.gem_data["synergies"][gem.name].get("skills", [])
-                if essence.get("skill") in gem_synergies:
-                    gem_bonus = 0.3  # Fixed bonus for gem synergy
-                    break  # Only apply one gem bonus
-                    
-        # Calculate final score
-        total_score = initial_score + gem_bonus
+        return gem_scores.score(gem_name, build_type, focus)
+    
+    def _get_gem_categories(self, gem_scores: GemScoreTable, gem_name: str) -> List[str]:
+        """Get categories that a gem belongs to.
         
-        # Normalize score to 0-1 range
-        return min(max(total_score, 0.0), 1.0)
-
+        Args:
+            gem_scores: Gem score table, see _gem_score_table()
+            gem_name: Name of the gem
+            
+        Returns:
+            List of category names
+        """
+        return list(gem_scores.categories(gem_name))
+    
     async def _select_gear_piece(
         self,
         slot: str,
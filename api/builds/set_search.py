@@ -0,0 +1,121 @@
+"""
+Equipment set combination search.
+
+The set slots are split between sets in one of the valid combinations of the
+game constraints (6+2, 4+4, 4+2+2 or 2+2+2+2), each part going to a different
+set. The best split is found with a dynamic program over the sets: the state is
+the multiset of parts filled so far, and each set either fills one more part or
+none. Every valid combination is searched at once. Only the few best sets for
+each part size can be in the best split, so the search time barely grows with
+the number of sets.
+"""
+
+import heapq
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+from ..models.game_data.schemas import GameConstraints
+
+
+DEFAULT_COMBINATIONS: List[Tuple[int, ...]] = [(6, 2), (4, 4), (4, 2, 2), (2, 2, 2, 2)]
+
+
+class SetChoice(NamedTuple):
+    """Number of pieces worn from a set."""
+
+    set_name: str
+    pieces: int
+
+
+class SetCombination(NamedTuple):
+    """Sets filling the set slots and their total bonus value."""
+
+    choices: List[SetChoice]
+    score: float
+
+
+def set_combinations(constraints: Union[GameConstraints, Mapping[str, Any]]) -> List[Tuple[int, ...]]:
+    """Read the valid set piece combinations from the game constraints.
+
+    Args:
+        constraints: Game constraints, or a mapping of them as in
+            constraints.json
+
+    Returns:
+        List[Tuple[int, ...]]: Piece counts per set of each combination,
+            largest first; DEFAULT_COMBINATIONS when none are given
+    """
+    if isinstance(constraints, GameConstraints):
+        set_slots = constraints.set_slots
+    else:
+        set_slots = constraints.get("set_slots", {})
+    combinations = set_slots.get("valid_combinations") or DEFAULT_COMBINATIONS
+    return [tuple(sorted(combination, reverse=True)) for combination in combinations]
+
+
+def best_set_combination(
+        bonus_values: Mapping[str, Mapping[int, float]],
+        combinations: Sequence[Sequence[int]] = DEFAULT_COMBINATIONS
+    ) -> Optional[SetCombination]:
+    """Find the highest valued way to fill the set slots.
+
+    Args:
+        bonus_values: Bonus value of wearing each piece count of each set,
+            keyed by set name and piece count; counts a set lacks cannot be
+            worn
+        combinations: Valid piece counts per set
+
+    Returns:
+        Optional[SetCombination]: The best combination, None if no valid
+            combination can be filled
+    """
+    sizes = sorted({size for combination in combinations for size in combination})
+    # A state counts the filled parts of each size
+    targets = {tuple(combination.count(size) for size in sizes) for combination in combinations}
+
+    # Transitions between states that can still grow into a valid combination
+    transitions: Dict[Tuple[int, ...], List[Tuple[int, Tuple[int, ...]]]] = {}
+    pending = [(0,) * len(sizes)]
+    while pending:
+        state = pending.pop()
+        if state in transitions:
+            continue
+        transitions[state] = []
+        for i in range(len(sizes)):
+            grown = state[:i] + (state[i] + 1,) + state[i + 1:]
+            if any(all(have <= want for have, want in zip(grown, target)) for target in targets):
+                transitions[state].append((i, grown))
+                pending.append(grown)
+
+    # A set outside the best few for every size it fills can always be swapped
+    # for an unused one that is worth as much, so only those few are searched
+    parts = max(len(combination) for combination in combinations)
+    candidates = set()
+    for size in sizes:
+        candidates.update(heapq.nlargest(
+            parts,
+            (name for name, values in bonus_values.items() if size in values),
+            key=lambda name: bonus_values[name][size]
+        ))
+
+    # Best value of each state and its choices, as a linked list
+    best: Dict[Tuple[int, ...], Tuple[float, Optional[tuple]]] = {(0,) * len(sizes): (0.0, None)}
+    for set_name in (name for name in bonus_values if name in candidates):
+        values = bonus_values[set_name]
+        for state, (score, chosen) in list(best.items()):
+            for i, grown in transitions[state]:
+                if sizes[i] not in values:
+                    continue
+                value = score + values[sizes[i]]
+                if grown not in best or value > best[grown][0]:
+                    best[grown] = (value, (chosen, SetChoice(set_name, sizes[i])))
+
+    filled = [best[target] for target in targets if target in best]
+    if not filled:
+        return None
+    score, chosen = max(filled, key=lambda entry: entry[0])
+    choices = []
+    while chosen is not None:
+        chosen, choice = chosen
+        choices.append(choice)
+    choices.sort(key=lambda choice: choice.pieces, reverse=True)
+    return SetCombination(choices, score)
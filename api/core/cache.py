@@ -0,0 +1,444 @@
+"""
+HTTP caching for the game data endpoints.
+
+Endpoints such as ``/game/stats`` or ``/game/sets`` return the same payload for
+a given data generation, but still reshape the data and run response_model
+serialization on every request. The ResponseCacheMiddleware stores the final
+encoded response body per (path, query parameters, data generation) and
+replays it on later requests without calling the route at all. Entries of
+older generations are dropped as soon as a newer generation is seen, so a data
+reload invalidates the cache without any explicit hook. Each stored body is
+compressed once with gzip, and with brotli when it is installed, and the
+variant matching the request's ``Accept-Encoding`` is served.
+
+The ETagMiddleware tags game data responses with a strong ETag derived from
+the data's content hash and the request, and answers a matching
+``If-None-Match`` with 304 before the route runs.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on installed extras
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, str, int]
+
+# Headers that describe one particular transfer and are not replayed from the cache
+UNCACHED_HEADERS = frozenset({b"date", b"server", b"x-cache"})
+
+# CORS headers depend on the request's Origin, not on the cached resource
+UNCACHED_HEADER_PREFIXES = (b"access-control-",)
+
+# Bodies smaller than this are not worth compressing
+COMPRESS_MIN_SIZE = 512
+
+# Supported content codings in order of preference
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def compress_variants(body: bytes) -> Dict[str, bytes]:
+    """Compress a response body with every supported content coding.
+
+    Runs once per cached response, so the highest compression levels are used.
+
+    Args:
+        body: Encoded response body
+
+    Returns:
+        Dict[str, bytes]: Compressed bodies keyed by content coding; empty if
+            the body is too small to be worth compressing
+    """
+    if len(body) < COMPRESS_MIN_SIZE:
+        return {}
+    variants = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(body, quality=11)
+    return variants
+
+
+def choose_encoding(accept_encoding: Optional[bytes], available: Iterable[str]) -> Optional[str]:
+    """Pick the content coding to send for an Accept-Encoding header.
+
+    Args:
+        accept_encoding: Raw Accept-Encoding header, if any
+        available: Content codings the response is available in
+
+    Returns:
+        Optional[str]: The accepted coding with the highest quality value,
+            preferring brotli over gzip on ties, or None to send the body as is
+    """
+    if not accept_encoding:
+        return None
+    qualities: Dict[str, float] = {}
+    for part in accept_encoding.decode("latin-1").lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[coding.strip()] = quality
+
+    best, best_quality = None, 0.0
+    for coding in ENCODINGS:
+        if coding not in available:
+            continue
+        quality = qualities.get(coding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def data_version(cache: Any) -> str:
+    """Get a version string of a data generation that is stable across processes.
+
+    Args:
+        cache: Pinned GameDataCache
+
+    Returns:
+        str: The content hash of the source files, or the metadata timestamp
+            when the generation was loaded without hashing its sources
+    """
+    if cache.content_hash:
+        return cache.content_hash
+    return f"{cache.metadata.version}@{cache.metadata.last_updated.isoformat()}"
+
+
+class CachedResponse(NamedTuple):
+    """An encoded response ready to be sent again."""
+
+    status: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+    variants: Mapping[str, bytes]
+
+    def start_message(self, encoding: Optional[str], cache_status: bytes) -> Message:
+        """Build the response start message for a content coding.
+
+        Args:
+            encoding: Content coding of the body that follows, None for the raw body
+            cache_status: Value of the X-Cache header
+
+        Returns:
+            Message: The http.response.start message
+        """
+        body = self.variants[encoding] if encoding else self.body
+        headers = [
+            (name, value) for name, value in self.headers
+            if name.lower() != b"content-length"
+        ]
+        headers.append((b"content-length", str(len(body)).encode()))
+        if self.variants:
+            headers.append((b"vary", b"Accept-Encoding"))
+        if encoding:
+            headers.append((b"content-encoding", encoding.encode()))
+        headers.append((b"x-cache", cache_status))
+        return {"type": "http.response.start", "status": self.status, "headers": headers}
+
+    async def send(self, send: Send, encoding: Optional[str], cache_status: bytes) -> None:
+        """Send the response in a content coding."""
+        await send(self.start_message(encoding, cache_status))
+        body = self.variants[encoding] if encoding else self.body
+        await send({"type": "http.response.body", "body": body})
+
+
+class ResponseCache:
+    """Bounded cache of encoded responses for the newest data generation."""
+
+    def __init__(self, max_entries: int = 256) -> None:
+        """Initialize the response cache.
+
+        Args:
+            max_entries: Maximum number of responses kept; the least recently
+                used response is evicted first
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, CachedResponse]" = OrderedDict()
+        self._generation: Optional[int] = None
+        self._stats: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "invalidations": 0,
+        }
+
+    @staticmethod
+    def make_key(path: str, query_string: bytes, generation: int) -> CacheKey:
+        """Build the cache key of a request.
+
+        Query parameters are sorted, so their order does not split the cache.
+
+        Args:
+            path: Request path
+            query_string: Raw query string
+            generation: Data generation the request is pinned to
+
+        Returns:
+            CacheKey: The cache key
+        """
+        params = sorted(parse_qsl(query_string.decode("latin-1"), keep_blank_values=True))
+        return path, urlencode(params), generation
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Hit, miss, eviction and invalidation counts and the number of entries."""
+        return {**self._stats, "entries": len(self._entries)}
+
+    def _observe(self, generation: int) -> None:
+        """Drop every entry if a newer data generation has been published."""
+        if self._generation is None or generation > self._generation:
+            if self._entries:
+                logger.info(
+                    f"Data generation {generation} published, dropping "
+                    f"{len(self._entries)} cached responses"
+                )
+                self._stats["invalidations"] += 1
+            self._entries.clear()
+            self._generation = generation
+
+    def get(self, key: CacheKey) -> Optional[CachedResponse]:
+        """Look up a cached response and count the hit or miss.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Optional[CachedResponse]: The cached response, or None on a miss
+        """
+        self._observe(key[2])
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self._stats["hits"] += 1
+        return entry
+
+    def put(self, key: CacheKey, response: CachedResponse) -> None:
+        """Store a response.
+
+        Responses of generations older than the newest one seen are not
+        stored, since no later request will ask for them.
+
+        Args:
+            key: Cache key from make_key()
+            response: Encoded response to store
+        """
+        self._observe(key[2])
+        if key[2] != self._generation:
+            return
+        self._entries[key] = response
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        """Drop every cached response."""
+        self._entries.clear()
+
+
+class ResponseCacheMiddleware:
+    """ASGI middleware serving cached responses for a fixed set of GET paths.
+
+    It has to run inside the DataGenerationMiddleware, so the generation it
+    keys on is the one the route would read from, and inside the
+    CORSMiddleware, whose headers depend on each request's Origin.
+    """
+
+    def __init__(self, app: ASGIApp, cache: ResponseCache, paths: Iterable[str]) -> None:
+        self.app = app
+        self.cache = cache
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or scope["path"] not in self.paths
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        data_manager = scope["app"].state.data_manager
+        try:
+            generation = (await data_manager.pinned_cache()).generation
+        except Exception as e:
+            logger.warning(f"Response cache bypassed, game data unavailable: {e}")
+            await self.app(scope, receive, send)
+            return
+
+        key = ResponseCache.make_key(scope["path"], scope["query_string"], generation)
+        accept_encoding = dict(scope["headers"]).get(b"accept-encoding")
+        entry = self.cache.get(key)
+        if entry is not None:
+            await entry.send(send, choose_encoding(accept_encoding, entry.variants), b"HIT")
+            return
+
+        start: Optional[Message] = None
+        chunks: List[bytes] = []
+
+        async def send_and_capture(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                if message["status"] != 200:
+                    await send({
+                        **message,
+                        "headers": list(message.get("headers", [])) + [(b"x-cache", b"MISS")],
+                    })
+                    return
+                # Hold the start message until the body is complete and compressed
+                start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            body = b"".join(chunks)
+            headers = [
+                (name, value) for name, value in start.get("headers", [])
+                if name.lower() not in UNCACHED_HEADERS
+                and not name.lower().startswith(UNCACHED_HEADER_PREFIXES)
+            ]
+            variants = await asyncio.to_thread(compress_variants, body)
+            entry = CachedResponse(start["status"], headers, body, variants)
+            self.cache.put(key, entry)
+            await entry.send(send, choose_encoding(accept_encoding, variants), b"MISS")
+
+        await self.app(scope, receive, send_and_capture)
+
+
+class ETagMiddleware:
+    """ASGI middleware adding ETags and 304 responses to game data GET requests.
+
+    Only successful responses are tagged.
+
+    It has to run inside the DataGenerationMiddleware, so the ETag describes
+    the generation the route would read from.
+    """
+
+    def __init__(
+            self,
+            app: ASGIApp,
+            prefix: str,
+            exclude: Iterable[str] = (),
+            app_version: str = ""
+        ) -> None:
+        """Initialize the middleware.
+
+        Args:
+            app: Wrapped ASGI app
+            prefix: Path prefix of the tagged endpoints
+            exclude: Path prefixes under ``prefix`` that are not derived from
+                game data and are never tagged
+            app_version: Application version, so a deploy changes every ETag
+        """
+        self.app = app
+        self.prefix = prefix
+        self.exclude = tuple(exclude)
+        self.app_version = app_version
+
+    def _applies(self, scope: Scope) -> bool:
+        """Check if a request is tagged."""
+        if scope["type"] != "http" or scope["method"] != "GET":
+            return False
+        path = scope["path"]
+        return path.startswith(self.prefix) and not path.startswith(self.exclude)
+
+    def make_etag(self, version: str, path: str, query_string: bytes) -> bytes:
+        """Build the strong ETag of a request.
+
+        Args:
+            version: Data version from data_version()
+            path: Request path
+            query_string: Raw query string
+
+        Returns:
+            bytes: Quoted ETag header value
+        """
+        _, query, _ = ResponseCache.make_key(path, query_string, 0)
+        digest = hashlib.sha256(
+            "\n".join((version, self.app_version, path, query)).encode()
+        ).hexdigest()[:32]
+        return f'"{digest}"'.encode()
+
+    @staticmethod
+    def encoded_etag(etag: bytes, encoding: Optional[bytes]) -> bytes:
+        """Get the ETag of a compressed variant, which must differ from the raw one."""
+        if not encoding:
+            return etag
+        return etag[:-1] + b"-" + encoding + b'"'
+
+    @staticmethod
+    def match(if_none_match: bytes, etag: bytes) -> Optional[bytes]:
+        """Find the tag of an If-None-Match header that matches an ETag.
+
+        Tags are compared weakly and match the raw ETag or the ETag of any
+        compressed variant of it. ``*`` is not honored, since the middleware
+        cannot tell whether the resource exists without running the route.
+
+        Args:
+            if_none_match: Raw If-None-Match header
+            etag: ETag of the raw response
+
+        Returns:
+            Optional[bytes]: The matching tag, or None if no tag matches
+        """
+        variants = {etag} | {ETagMiddleware.encoded_etag(etag, e.encode()) for e in ("br", "gzip")}
+        for tag in if_none_match.split(b","):
+            tag = tag.strip().removeprefix(b"W/")
+            if tag in variants:
+                return tag
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not self._applies(scope):
+            await self.app(scope, receive, send)
+            return
+
+        data_manager = scope["app"].state.data_manager
+        try:
+            version = data_version(await data_manager.pinned_cache())
+        except Exception as e:
+            logger.warning(f"ETag skipped, game data unavailable: {e}")
+            await self.app(scope, receive, send)
+            return
+
+        etag = self.make_etag(version, scope["path"], scope["query_string"])
+        if_none_match = dict(scope["headers"]).get(b"if-none-match")
+        matched = self.match(if_none_match, etag) if if_none_match is not None else None
+        if matched is not None:
+            await send({
+                "type": "http.response.start",
+                "status": 304,
+                "headers": [(b"etag", matched), (b"vary", b"Accept-Encoding")],
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_etag(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = list(message.get("headers", []))
+                encoding = dict(headers).get(b"content-encoding")
+                headers.append((b"etag", self.encoded_etag(etag, encoding)))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
@@ -0,0 +1,153 @@
+"""
+Pluggable JSON codec for data files and API responses.
+
+The game data loaders parse several megabytes of JSON on every reload and the
+catalog endpoints encode large payloads, so both go through one codec that
+uses the fastest JSON library available: orjson, then msgspec, then the
+standard library. The fast libraries are optional; without them everything
+falls back to ``json`` with the same results.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, NamedTuple, Optional, Union
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on installed extras
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - depends on installed extras
+    msgspec = None
+
+logger = logging.getLogger(__name__)
+
+
+class JSONCodec(NamedTuple):
+    """A JSON implementation.
+
+    ``loads`` accepts str or bytes and raises ValueError on invalid JSON.
+    ``dumps`` returns compact UTF-8 encoded bytes.
+    """
+
+    name: str
+    loads: Callable[[Union[str, bytes]], Any]
+    dumps: Callable[[Any], bytes]
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    """Encode compactly like FastAPI's JSONResponse."""
+    return json.dumps(
+        obj,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+CODECS: Dict[str, JSONCodec] = {"json": JSONCodec("json", json.loads, _stdlib_dumps)}
+if msgspec is not None:
+    _msgspec_encoder = msgspec.json.Encoder()
+    CODECS["msgspec"] = JSONCodec("msgspec", msgspec.json.decode, _msgspec_encoder.encode)
+if orjson is not None:
+    CODECS["orjson"] = JSONCodec(
+        "orjson",
+        orjson.loads,
+        lambda obj: orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS),
+    )
+
+# Codec names in order of preference
+PREFERENCE = ("orjson", "msgspec", "json")
+
+
+def _fastest() -> JSONCodec:
+    """Get the most preferred installed codec."""
+    return next(CODECS[name] for name in PREFERENCE if name in CODECS)
+
+
+_default: JSONCodec = _fastest()
+
+
+def get_codec(name: Optional[str] = None) -> JSONCodec:
+    """Get a codec by name.
+
+    Args:
+        name: "orjson", "msgspec" or "json", "auto" for the fastest installed
+            codec, or None for the codec currently in use
+
+    Returns:
+        JSONCodec: The codec
+
+    Raises:
+        ValueError: If the codec is unknown or its library is not installed
+    """
+    if name is None:
+        return _default
+    if name == "auto":
+        return _fastest()
+    if name not in CODECS:
+        if name in PREFERENCE:
+            raise ValueError(f"JSON codec {name} is not installed")
+        raise ValueError(f"Unknown JSON codec: {name}")
+    return CODECS[name]
+
+
+def set_codec(name: str) -> JSONCodec:
+    """Select the codec used by loads(), dumps() and load_file().
+
+    Args:
+        name: Codec name, "auto" picks the fastest installed one
+
+    Returns:
+        JSONCodec: The selected codec
+
+    Raises:
+        ValueError: If the codec is unknown or its library is not installed
+    """
+    global _default
+    _default = _fastest() if name == "auto" else get_codec(name)
+    logger.info(f"Using {_default.name} JSON codec")
+    return _default
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON with the current codec.
+
+    Raises:
+        ValueError: If the data is not valid JSON
+    """
+    return _default.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode an object to compact JSON bytes with the current codec."""
+    return _default.dumps(obj)
+
+
+def load_file(path: Path) -> Any:
+    """Read and parse a JSON file with the current codec.
+
+    Args:
+        path: Path to the JSON file
+
+    Returns:
+        Any: The parsed data
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the file is not valid JSON
+    """
+    return _default.loads(Path(path).read_bytes())
+
+
+class CodecJSONResponse(JSONResponse):
+    """JSON response encoded with the current codec."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -47,6 +47,92 @@ class Settings(BaseSettings):
         if self.DATA_DIR.is_absolute():
             return self.DATA_DIR
         return self.PROJECT_ROOT / self.DATA_DIR
+
+    DATA_PACK_DIR: Path = Field(
+        default="./data/compiled",
+        description="Directory containing the compiled game data pack"
+    )
+
+    @property
+    def data_pack_path(self) -> Path:
+        """Get absolute path to compiled data pack directory."""
+        if self.DATA_PACK_DIR.is_absolute():
+            return self.DATA_PACK_DIR
+        return self.PROJECT_ROOT / self.DATA_PACK_DIR
+
+    DATA_LOAD_EXECUTOR: str = Field(
+        default="thread",
+        description="Executor for parallel category loading (thread or process)"
+    )
+    DATA_LOAD_WORKERS: Optional[int] = Field(
+        default=None,
+        description="Parallel category load workers, defaults to one per category"
+    )
+    GAME_DATA_LAZY: bool = Field(
+        default=False,
+        description="Load and validate each game data category on first access"
+    )
+    GAME_DATA_WARM: str = Field(
+        default="",
+        description="Comma-separated game data categories to preload at startup"
+    )
+    GAME_DATA_SHARED: bool = Field(
+        default=False,
+        description="Map the compiled data pack read-only and unpickle each entry into "
+                    "the worker's memory on first access"
+    )
+    GAME_DATA_VALIDATE: bool = Field(
+        default=False,
+        description="Always validate the JSON sources instead of trusting the compiled data pack"
+    )
+    DATA_WATCH_ENABLED: bool = Field(
+        default=True,
+        description="Watch the data directory and reload game data when it changes"
+    )
+    DATA_WATCH_POLL_INTERVAL: float = Field(
+        default=2.0,
+        description="Seconds between metadata checks when inotify is unavailable"
+    )
+
+    JSON_CODEC: str = Field(
+        default="auto",
+        description="JSON codec for data files and responses (auto, orjson, msgspec or json)"
+    )
+    RESPONSE_CACHE_ENABLED: bool = Field(
+        default=True,
+        description="Cache encoded responses of the static game catalog endpoints"
+    )
+    RESPONSE_CACHE_MAX_ENTRIES: int = Field(
+        default=256,
+        description="Maximum number of cached responses per data generation"
+    )
+
+    ETAGS_ENABLED: bool = Field(
+        default=True,
+        description="Send ETags and answer If-None-Match with 304 on game data endpoints"
+    )
+
+    GEM_SEARCH_BUDGET_MS: float = Field(
+        default=250.0,
+        description="Milliseconds the gem loadout search may take per build before settling for its best loadout"
+    )
+    BUILD_SEARCH_BEAM_WIDTH: int = Field(
+        default=16,
+        description="Partial builds the joint build search keeps after each step"
+    )
+    BUILD_SEARCH_TOP_K: int = Field(
+        default=3,
+        description="Builds the joint build search returns by default"
+    )
+    BUILD_SEARCH_BUDGET_MS: float = Field(
+        default=500.0,
+        description="Milliseconds the joint build search may take per request before completing its builds greedily"
+    )
+
+    @property
+    def warm_categories(self) -> List[str]:
+        """Get list of game data categories to preload at startup."""
+        return [category.strip() for category in self.GAME_DATA_WARM.split(",") if category.strip()]
     
     # Environment
     ENVIRONMENT: str = Field(
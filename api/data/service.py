@@ -1,12 +1,13 @@
 """Service for accessing game data."""
 
-import json
 import logging
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, TypeVar, Union
 
 from fastapi import HTTPException, status
 
+from ..core import codec
 from ..core.config import get_settings
 from .models import (
     BuildCategory,
@@ -61,15 +62,13 @@ class DataService:
         gems_file = self.data_dir / "gems" / "gem_skillmap.json"
         if not gems_file.exists():
             raise FileNotFoundError(f"Gems data file not found: {gems_file}")
-        with open(gems_file, "r") as f:
-            self.gems_data = json.load(f)
+        self.gems_data = codec.load_file(gems_file)
 
         # Load equipment sets data
         sets_file = self.data_dir / "equipment" / "sets.json"
         if not sets_file.exists():
             raise FileNotFoundError(f"Sets data file not found: {sets_file}")
-        with open(sets_file, "r") as f:
-            self.sets_data = json.load(f)
+        self.sets_data = codec.load_file(sets_file)
 
         # Load skills data for each class
         self.skills_data = {}
@@ -77,19 +76,18 @@ class DataService:
             if class_dir.is_dir():
                 skills_file = class_dir / "base_skills.json"
                 if skills_file.exists():
-                    with open(skills_file, "r") as f:
-                        class_data = json.load(f)
-                        # Convert cooldowns to float
-                        for skill in class_data["skills"]:
-                            if "cooldown" in skill:
-                                try:
-                                    skill["cooldown"] = float(skill["cooldown"])
-                                except (ValueError, TypeError):
-                                    logger.warning(
-                                        f"Invalid cooldown value for skill {skill['name']}: {skill['cooldown']}"
-                                    )
-                                    skill["cooldown"] = None
-                        self.skills_data[class_dir.name] = class_data
+                    class_data = codec.load_file(skills_file)
+                    # Convert cooldowns to float
+                    for skill in class_data["skills"]:
+                        if "cooldown" in skill:
+                            try:
+                                skill["cooldown"] = float(skill["cooldown"])
+                            except (ValueError, TypeError):
+                                logger.warning(
+                                    f"Invalid cooldown value for skill {skill['name']}: {skill['cooldown']}"
+                                )
+                                skill["cooldown"] = None
+                    self.skills_data[class_dir.name] = class_data
 
     def _paginate(
         self,
@@ -269,8 +267,7 @@ class DataService:
         if not stats_file.exists():
             raise FileNotFoundError(f"Stats data file not found: {stats_file}")
 
-        with open(stats_file, "r") as f:
-            data = json.load(f)
+        data = codec.load_file(stats_file)
 
         if stat:
             if stat not in data:
@@ -283,10 +280,7 @@ class DataService:
         return {name: StatInfo(**info) for name, info in data.items()}
 
 
-# Singleton instance
-_data_service = DataService()
-
-
+@lru_cache()
 def get_data_service() -> DataService:
-    """Get DataService instance."""
-    return _data_service
+    """Get the DataService instance, loading its data on first use."""
+    return DataService()
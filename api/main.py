@@ -9,9 +9,13 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .auth.routes import router as auth_router
+from .core import codec
+from .core.cache import ETagMiddleware, ResponseCache, ResponseCacheMiddleware
 from .core.config import get_settings
 from .routes import router as api_router
+from .routes.game import CACHED_ROUTES, router as game_router
 from .models.game_data.manager import GameDataManager
+from .models.game_data.pinning import DataGenerationMiddleware
 
 
 settings = get_settings()
@@ -34,18 +38,29 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         settings.ENVIRONMENT
     )
     
-    # Initialize GameDataManager
-    logger.info(f"Initializing GameDataManager with data_dir: {settings.data_path}")
-    app.state.data_manager = GameDataManager(settings=settings)
+    if getattr(app.state, "data_preloaded", False):
+        # Loaded by the preforking server before this worker was forked
+        data_manager = app.state.data_manager
+    else:
+        # Initialize GameDataManager
+        logger.info(f"Initializing GameDataManager with data_dir: {settings.data_path}")
+        data_manager = GameDataManager(settings=settings)
+        app.state.data_manager = data_manager
+        if settings.warm_categories:
+            await data_manager.warm(settings.warm_categories)
+    if settings.DATA_WATCH_ENABLED:
+        data_manager.start_watching()
     
     yield
     
     # Shutdown
+    await data_manager.close()
     logger.info("Shutting down %s", settings.PROJECT_NAME)
 
 
 def create_app() -> FastAPI:
     """Create FastAPI application."""
+    codec.set_codec(settings.JSON_CODEC)
     app = FastAPI(
         title=settings.PROJECT_NAME,
         description="Diablo Immortal Build Optimizer API",
@@ -53,10 +68,34 @@ def create_app() -> FastAPI:
         docs_url=f"{settings.API_V1_STR}/docs",
         redoc_url=f"{settings.API_V1_STR}/redoc",
         openapi_url=f"{settings.API_V1_STR}/openapi.json",
+        default_response_class=codec.CodecJSONResponse,
         lifespan=lifespan
     )
 
-    # Set CORS middleware
+    # Serve static catalog endpoints from encoded responses
+    if settings.RESPONSE_CACHE_ENABLED:
+        app.state.response_cache = ResponseCache(max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES)
+        app.add_middleware(
+            ResponseCacheMiddleware,
+            cache=app.state.response_cache,
+            paths=[f"{settings.API_V1_STR}{game_router.prefix}{path}" for path in CACHED_ROUTES]
+        )
+
+    # Answer unchanged game data with 304 before the cache or route runs
+    if settings.ETAGS_ENABLED:
+        game_prefix = f"{settings.API_V1_STR}{game_router.prefix}"
+        app.add_middleware(
+            ETagMiddleware,
+            prefix=f"{game_prefix}/",
+            exclude=[f"{game_prefix}/builds"],
+            app_version=settings.VERSION
+        )
+
+    # Pin one game data generation per request
+    app.add_middleware(DataGenerationMiddleware)
+
+    # Set CORS middleware, added last so it wraps the cache and sets the CORS
+    # headers of each request instead of replaying those of a cached one
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.cors_origins,
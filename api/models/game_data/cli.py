@@ -0,0 +1,111 @@
+"""
+Command line interface for the game data.
+
+Installed as ``dibo-data``:
+
+    dibo-data check             Check data/indexed without writing anything
+    dibo-data compile           Check data/indexed and compile the data pack,
+                                rebuilding only what changed since the last one
+    dibo-data verify            Check that the data pack matches the sources
+"""
+
+import argparse
+import logging
+import sys
+from typing import List, Optional
+
+from api.core.config import get_settings
+
+from .compiler import CompileResult, check_data, compile_data, verify_data_pack
+
+
+def _print_issues(result: CompileResult) -> None:
+    """Print the issues of a check and a one line summary."""
+    for issue in result.issues:
+        print(issue)
+    warnings = len(result.issues) - len(result.errors)
+    print(
+        f"Checked {result.checked_files} files: "
+        f"{len(result.errors)} errors, {warnings} warnings"
+    )
+
+
+def _check(args: argparse.Namespace) -> int:
+    """Run the data checks."""
+    result = check_data(get_settings(), strict=args.strict)
+    _print_issues(result)
+    blocking = result.issues if args.strict else result.errors
+    return 1 if blocking else 0
+
+
+def _compile(args: argparse.Namespace) -> int:
+    """Check the data and compile the data pack."""
+    settings = get_settings()
+    result = compile_data(settings, strict=args.strict, incremental=not args.full)
+    _print_issues(result)
+    if result.manifest is None:
+        print("Data pack not written")
+        return 1
+
+    manifest = result.manifest
+    print(
+        f"Compiled {len(manifest.categories)} entries from {len(manifest.files)} files: "
+        f"{len(result.changed)} files changed, {len(result.rebuilt)} entries rebuilt, "
+        f"{len(result.reused)} reused"
+    )
+    print(f"Content hash: {manifest.content_hash}")
+    print(f"Written to: {settings.data_pack_path}")
+    return 0
+
+
+def _verify(args: argparse.Namespace) -> int:
+    """Compare the data pack's manifest with the current sources."""
+    result = verify_data_pack(get_settings())
+    for label, paths in (("changed", result.changed), ("missing", result.missing), ("added", result.added)):
+        for path in paths:
+            print(f"{label}: {path}")
+    for problem in result.problems:
+        print(problem)
+
+    if result.up_to_date:
+        print(f"Data pack {result.manifest.content_hash[:12]} is up to date")
+        return 0
+    print("Data pack is out of date, run dibo-data compile")
+    return 1
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the dibo-data command.
+
+    Args:
+        argv: Command line arguments, sys.argv if not given
+
+    Returns:
+        int: Exit status, 0 on success
+    """
+    parser = argparse.ArgumentParser(prog="dibo-data", description="Check and compile the game data")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Log progress")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    check = commands.add_parser("check", help="Check data/indexed without writing anything")
+    check.add_argument("--strict", action="store_true", help="Fail on warnings too")
+    check.set_defaults(run=_check)
+
+    compile_ = commands.add_parser("compile", help="Check data/indexed and compile the data pack")
+    compile_.add_argument("--strict", action="store_true", help="Refuse to compile on warnings too")
+    compile_.add_argument("--full", action="store_true", help="Rebuild everything, ignoring the previous pack")
+    compile_.set_defaults(run=_compile)
+
+    verify = commands.add_parser("verify", help="Check that the data pack matches the sources")
+    verify.set_defaults(run=_verify)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(
+        level="INFO" if args.verbose else "WARNING",
+        format="%(levelname)s - %(message)s"
+    )
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,597 @@
+"""
+Game data compiler.
+
+Checks the whole indexed data directory and compiles it into a data pack:
+every JSON file must parse, every file with a schema must validate, and the
+gem and class indexes must agree with the files they describe. Only a clean
+tree is compiled, so the runtime can trust the pack and its manifest instead
+of validating the data at request time.
+
+Everything in the pack is an artifact with an explicit list of the source
+files it is read from and the artifacts it is derived from. Compiling diffs the
+current file hashes against the previous manifest, re-validates only the
+changed files and rebuilds only the artifacts that depend on them; every other
+artifact is taken from the previous pack as is.
+"""
+
+import logging
+from datetime import datetime
+from functools import partial
+from graphlib import TopologicalSorter
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Literal, NamedTuple, Optional, Set, Tuple, Type
+
+from pydantic import BaseModel, Field
+
+from api.core import codec
+from api.core.config import Settings, get_settings
+
+from .essence_index import (
+    CLASSES_DIR,
+    PREBUILT_INDEXES,
+    EssenceQueryEngine,
+    list_classes,
+    read_essence_indexes,
+)
+from .gem_catalog import GemCatalog
+from .gem_index import build_gem_index, gem_metadata_files, read_gem_metadata
+from .gem_registry import GEMS_DIR, INDEX_FILE as GEM_INDEX_FILE, load_gem_file
+from .manager import GameDataManager, category_files, load_category_file
+from .names import NameIndex
+from .pack import (
+    PACK_FORMAT_VERSION,
+    DataPackManifest,
+    compute_content_hash,
+    compute_schema_hash,
+    load_data_pack,
+    load_manifest,
+    write_data_pack,
+)
+from .schemas import GameDataMetadata, GemRegistry
+from .schemas.essences import ClassEssences
+
+logger = logging.getLogger(__name__)
+
+METADATA_FILE = "metadata.json"
+CLASS_INDEX_FILE = f"{CLASSES_DIR}/index.json"
+GEM_FILES = "gems/files"
+
+
+class DataIssue(BaseModel):
+    """A problem found in a data file."""
+
+    path: str = Field(description="File path relative to the data directory")
+    message: str = Field(description="Description of the problem")
+    severity: Literal["error", "warning"] = Field(
+        default="error",
+        description="Errors block compiling, warnings only do in strict mode"
+    )
+
+    def __str__(self) -> str:
+        return f"{self.severity}: {self.path}: {self.message}"
+
+
+class CompileResult(BaseModel):
+    """Outcome of checking and compiling the data directory."""
+
+    checked_files: int = Field(description="Number of JSON files checked")
+    issues: List[DataIssue] = Field(default_factory=list, description="Problems found")
+    changed: List[str] = Field(
+        default_factory=list,
+        description="Source files changed since the previous pack, all of them without one"
+    )
+    rebuilt: List[str] = Field(default_factory=list, description="Artifacts built by this run")
+    reused: List[str] = Field(default_factory=list, description="Artifacts taken from the previous pack")
+    manifest: Optional[DataPackManifest] = Field(
+        default=None,
+        description="Manifest of the written pack, None if nothing was written"
+    )
+
+    @property
+    def errors(self) -> List[DataIssue]:
+        """Issues that block compiling."""
+        return [issue for issue in self.issues if issue.severity == "error"]
+
+
+class VerifyResult(BaseModel):
+    """Comparison of a compiled pack's manifest with the current sources."""
+
+    manifest: Optional[DataPackManifest] = Field(description="Manifest of the pack, if any")
+    changed: List[str] = Field(default_factory=list, description="Files whose hash changed")
+    missing: List[str] = Field(default_factory=list, description="Files that no longer exist")
+    added: List[str] = Field(default_factory=list, description="Source files not in the manifest")
+    problems: List[str] = Field(default_factory=list, description="Other reasons the pack is unusable")
+
+    @property
+    def up_to_date(self) -> bool:
+        """Whether the runtime would load the pack."""
+        return self.manifest is not None and not (
+            self.changed or self.missing or self.added or self.problems
+        )
+
+
+class BuildContext(NamedTuple):
+    """State shared by the artifact builders of one compile."""
+
+    data_path: Path
+    built: Dict[str, Any]
+    previous: Dict[str, Any]
+    changed: Set[str]
+    issues: List[DataIssue]
+
+
+class Artifact(NamedTuple):
+    """A data pack entry and what it is built from."""
+
+    sources: Tuple[str, ...]
+    requires: Tuple[str, ...]
+    build: Callable[[BuildContext], Any]
+
+
+def _read_gem_index(data_path: Path) -> Dict[str, str]:
+    """Read gems/index.json as gem file paths relative to the data directory."""
+    index = codec.load_file(data_path / GEM_INDEX_FILE)["index"]
+    return {name: f"{GEMS_DIR}/{rel_path}" for name, rel_path in index.items()}
+
+
+def _build_category(model_cls: Type[BaseModel], rel_path: str, ctx: BuildContext) -> BaseModel:
+    """Validate a category file."""
+    return load_category_file(ctx.data_path, model_cls, rel_path)
+
+
+def _build_gem_files(paths: Tuple[str, ...], ctx: BuildContext) -> Dict[str, Any]:
+    """Validate the changed gem files and reuse the others from the previous pack."""
+    previous = ctx.previous.get(GEM_FILES, {})
+    gems = {}
+    for rel_path in paths:
+        if rel_path in previous and rel_path not in ctx.changed:
+            gems[rel_path] = previous[rel_path]
+            continue
+        try:
+            gems[rel_path] = load_gem_file(ctx.data_path / rel_path)
+        except FileNotFoundError:
+            # Reported by check_gem_index()
+            continue
+        except ValueError as e:
+            ctx.issues.append(DataIssue(path=rel_path, message=f"Invalid Gem: {e}"))
+    return gems
+
+
+def _build_gem_registry(ctx: BuildContext) -> GemRegistry:
+    """Assemble the gem registry from the gem index and the validated gem files."""
+    files = ctx.built[GEM_FILES]
+    gems = {}
+    for name, rel_path in _read_gem_index(ctx.data_path).items():
+        gem = files.get(rel_path)
+        if gem is None:
+            continue
+        if gem.name != name:
+            ctx.issues.append(DataIssue(path=rel_path, message=f"Gem is named {gem.name}, indexed as {name}"))
+        gems[name] = gem
+    return GemRegistry(gems)
+
+
+def _build_gem_names(ctx: BuildContext) -> NameIndex:
+    """Build the gem name index."""
+    return NameIndex([(name, name) for name in ctx.built["gems/data"]])
+
+
+def _build_gem_index(ctx: BuildContext) -> Dict[str, Any]:
+    """Build the inverted gem index from the gem metadata files."""
+    metadata = read_gem_metadata(ctx.data_path)
+    return build_gem_index(metadata, ctx.built["names/gems"], ctx.built["gems/data"])
+
+
+def _build_gem_catalog(ctx: BuildContext) -> GemCatalog:
+    """Build the sorted gem catalog."""
+    return GemCatalog(ctx.built["gems/data"], ctx.built["gems/skillmap"], ctx.built["names/gems"])
+
+
+def _build_essence_engine(class_name: str, ctx: BuildContext) -> EssenceQueryEngine:
+    """Build a class's essence query engine from its essences and prebuilt indexes."""
+    essences = ctx.built[f"essences/{class_name}"]
+    return EssenceQueryEngine(essences, read_essence_indexes(ctx.data_path, class_name))
+
+
+def dependency_graph(data_path: Path) -> Dict[str, Artifact]:
+    """Get every artifact of the data pack with its sources and dependencies.
+
+    Args:
+        data_path: Root of the indexed data directory
+
+    Returns:
+        Dict[str, Artifact]: Artifacts keyed by their key in the pack
+    """
+    graph: Dict[str, Artifact] = {}
+    for category, (model_cls, rel_path) in GameDataManager.CATEGORY_LOADERS.items():
+        if rel_path != GEM_INDEX_FILE:
+            graph[category] = Artifact(
+                tuple(category_files(data_path, rel_path)), (), partial(_build_category, model_cls, rel_path)
+            )
+
+    try:
+        gem_paths = tuple(sorted(set(_read_gem_index(data_path).values())))
+    except (FileNotFoundError, KeyError, TypeError, ValueError):
+        # Reported by check_gem_index()
+        gem_paths = ()
+    graph[GEM_FILES] = Artifact(gem_paths, (), partial(_build_gem_files, gem_paths))
+    graph["gems/data"] = Artifact((GEM_INDEX_FILE,), (GEM_FILES,), _build_gem_registry)
+    graph["names/gems"] = Artifact((), ("gems/data",), _build_gem_names)
+    graph["gems/index"] = Artifact(
+        tuple(gem_metadata_files(data_path)), ("gems/data", "names/gems"), _build_gem_index
+    )
+    graph["gems/catalog"] = Artifact(
+        (), ("gems/data", "gems/skillmap", "names/gems"), _build_gem_catalog
+    )
+
+    index_files = sorted({file_name for file_name, _ in PREBUILT_INDEXES.values()})
+    for class_name in list_classes(data_path):
+        class_dir = f"{CLASSES_DIR}/{class_name}"
+        essences_file = f"{class_dir}/essences.json"
+        graph[f"essences/{class_name}"] = Artifact(
+            (essences_file,), (), partial(_build_category, ClassEssences, essences_file)
+        )
+        graph[f"essences/{class_name}/engine"] = Artifact(
+            tuple(
+                f"{class_dir}/indexes/{file_name}" for file_name in index_files
+                if (data_path / class_dir / "indexes" / file_name).is_file()
+            ),
+            (f"essences/{class_name}",),
+            partial(_build_essence_engine, class_name)
+        )
+    return graph
+
+
+def graph_sources(graph: Dict[str, Artifact]) -> List[str]:
+    """Get every source file of a dependency graph, plus the data metadata.
+
+    This is the same set of files GameDataManager.source_files() hashes, so the
+    runtime and the compiler agree on the content hash.
+    """
+    return sorted({METADATA_FILE}.union(*(artifact.sources for artifact in graph.values())))
+
+
+def pack_segments(graph: Dict[str, Artifact]) -> List[List[str]]:
+    """Group artifacts that are derived from each other into pack segments.
+
+    Derived artifacts hold references to the objects they are built from, so
+    they are pickled together to keep a single copy of those objects.
+
+    Args:
+        graph: Dependency graph from dependency_graph()
+
+    Returns:
+        List[List[str]]: Artifact keys of each segment
+    """
+    group_of = {key: {key} for key in graph}
+    for key, artifact in graph.items():
+        for required in artifact.requires:
+            if group_of[key] is not group_of[required]:
+                merged = group_of[key] | group_of[required]
+                for member in merged:
+                    group_of[member] = merged
+    groups = {id(group): group for group in group_of.values()}
+    return sorted(sorted(group) for group in groups.values())
+
+
+def affected_artifacts(
+        graph: Dict[str, Artifact],
+        changed: Set[str],
+        available: Set[str]
+    ) -> List[str]:
+    """Get the artifacts that must be rebuilt, in build order.
+
+    An artifact is rebuilt when one of its source files changed, when it is not
+    available from the previous pack, or when an artifact it requires is rebuilt.
+
+    Args:
+        graph: Dependency graph from dependency_graph()
+        changed: Changed, added and removed source files
+        available: Artifacts in the previous pack
+
+    Returns:
+        List[str]: Keys of the artifacts to rebuild, dependencies first
+    """
+    order = TopologicalSorter({key: artifact.requires for key, artifact in graph.items()}).static_order()
+    dirty: List[str] = []
+    for key in order:
+        artifact = graph[key]
+        if (
+            key not in available
+            or changed.intersection(artifact.sources)
+            or set(dirty).intersection(artifact.requires)
+        ):
+            dirty.append(key)
+    return dirty
+
+
+def check_json_files(data_path: Path) -> List[DataIssue]:
+    """Check that every JSON file in the data directory parses.
+
+    Args:
+        data_path: Root of the indexed data directory
+
+    Returns:
+        List[DataIssue]: Files that are not valid JSON
+    """
+    issues = []
+    for path in sorted(data_path.rglob("*.json")):
+        try:
+            codec.load_file(path)
+        except ValueError as e:
+            issues.append(DataIssue(path=str(path.relative_to(data_path)), message=f"Invalid JSON: {e}"))
+    return issues
+
+
+def check_gem_index(data_path: Path) -> List[DataIssue]:
+    """Check gems/index.json against the gem files on disk.
+
+    Every indexed file must exist and every gem file must be indexed exactly
+    once. The gem files themselves are validated when the registry is built.
+
+    Args:
+        data_path: Root of the indexed data directory
+
+    Returns:
+        List[DataIssue]: Inconsistencies between the index and the gem files
+    """
+    try:
+        index = _read_gem_index(data_path)
+    except (FileNotFoundError, KeyError, TypeError, ValueError) as e:
+        return [DataIssue(path=GEM_INDEX_FILE, message=f"Unreadable gem index: {e}")]
+
+    issues = []
+    indexed: Dict[str, str] = {}
+    for name, path in index.items():
+        if path in indexed:
+            issues.append(DataIssue(path=GEM_INDEX_FILE, message=f"{name} and {indexed[path]} share {path}"))
+        indexed[path] = name
+        if not (data_path / path).is_file():
+            issues.append(DataIssue(path=GEM_INDEX_FILE, message=f"{name} points to missing {path}"))
+
+    for path in sorted((data_path / GEMS_DIR / "core").rglob("*.json")):
+        rel_path = str(path.relative_to(data_path))
+        if rel_path not in indexed:
+            issues.append(DataIssue(path=rel_path, message="Gem file is not in the gem index"))
+    return issues
+
+
+def _check_class(
+        data_path: Path,
+        class_name: str,
+        entry: Dict[str, Any],
+        built: Dict[str, Any]
+    ) -> List[DataIssue]:
+    """Check one class's essence files and indexes against its classes/index.json entry."""
+    class_dir = f"{CLASSES_DIR}/{class_name}"
+    issues = []
+
+    # The class index counts the per-slot essence files
+    slot_counts: Dict[str, int] = {}
+    for path in sorted((data_path / class_dir / "essences").glob("*.json")):
+        rel_path = str(path.relative_to(data_path))
+        try:
+            slot_file = codec.load_file(path)
+            slot_counts[path.stem] = len(slot_file["essences"])
+            listed = slot_file["metadata"]["essence_count"]
+        except (KeyError, TypeError, ValueError):
+            issues.append(DataIssue(path=rel_path, message="Not a slot essence file"))
+            continue
+        if listed != slot_counts[path.stem]:
+            issues.append(DataIssue(
+                path=rel_path,
+                message=f"Metadata lists {listed} essences, file has {slot_counts[path.stem]}",
+                severity="warning"
+            ))
+    for slot, expected in (entry.get("essence_slots") or {}).items():
+        if slot_counts.get(slot) != expected:
+            issues.append(DataIssue(
+                path=CLASS_INDEX_FILE,
+                message=f"{class_name} lists {expected} {slot} essences, "
+                        f"{class_dir}/essences/{slot}.json has {slot_counts.get(slot, 0)}",
+                severity="warning"
+            ))
+    if entry.get("total_essences") not in (None, sum(slot_counts.values())):
+        issues.append(DataIssue(
+            path=CLASS_INDEX_FILE,
+            message=f"{class_name} lists {entry['total_essences']} essences, "
+                    f"its slot files have {sum(slot_counts.values())}",
+            severity="warning"
+        ))
+
+    # essences.json is what the runtime serves
+    essences = built.get(f"essences/{class_name}")
+    engine = built.get(f"essences/{class_name}/engine")
+    if essences is None or engine is None:
+        # Failed to validate, reported by the build
+        return issues
+
+    rel_path = f"{class_dir}/essences.json"
+    count = len(essences.essences)
+    if essences.metadata.total_essences != count:
+        issues.append(DataIssue(
+            path=rel_path,
+            message=f"Metadata lists {essences.metadata.total_essences} essences, file has {count}",
+            severity="warning"
+        ))
+    for dimension in engine.rebuilt:
+        issues.append(DataIssue(
+            path=f"{class_dir}/indexes",
+            message=f"Prebuilt {dimension} index is missing or does not match {rel_path}, "
+                    "the runtime rebuilds it",
+            severity="warning"
+        ))
+    return issues
+
+
+def check_class_index(data_path: Path, built: Dict[str, Any]) -> List[DataIssue]:
+    """Check classes/index.json and each class's essences and prebuilt indexes.
+
+    Args:
+        data_path: Root of the indexed data directory
+        built: Built artifacts, with the essences and engine of every class
+
+    Returns:
+        List[DataIssue]: Inconsistent class indexes and essence files
+    """
+    try:
+        index: Dict[str, Dict[str, Any]] = codec.load_file(data_path / CLASS_INDEX_FILE)["classes"]
+    except (FileNotFoundError, KeyError, TypeError, ValueError) as e:
+        return [DataIssue(path=CLASS_INDEX_FILE, message=f"Unreadable class index: {e}")]
+
+    issues = []
+    classes = list_classes(data_path)
+    for class_name in sorted(set(index) - set(classes)):
+        issues.append(DataIssue(path=CLASS_INDEX_FILE, message=f"{class_name} has no essence data"))
+    for class_name in classes:
+        if class_name not in index:
+            issues.append(DataIssue(path=CLASS_INDEX_FILE, message=f"{class_name} is not indexed"))
+        issues.extend(_check_class(data_path, class_name, index.get(class_name, {}), built))
+    return issues
+
+
+def _previous_pack(pack_dir: Path) -> Tuple[Dict[str, str], Dict[str, Any]]:
+    """Get the file hashes and artifacts of the previous pack.
+
+    Returns:
+        Tuple of the per-file hashes and the artifacts, both empty if there is
+        no usable previous pack
+    """
+    manifest = load_manifest(pack_dir)
+    if manifest is None:
+        return {}, {}
+    entries = load_data_pack(pack_dir, manifest.content_hash, compute_schema_hash())
+    if entries is None:
+        return {}, {}
+    return manifest.files, entries
+
+
+def compile_data(
+        settings: Optional[Settings] = None,
+        strict: bool = False,
+        incremental: bool = True,
+        write: bool = True
+    ) -> CompileResult:
+    """Check the data directory and compile it into a data pack if it is clean.
+
+    Args:
+        settings: Settings with the data and pack directories, the
+            application settings if not given
+        strict: Refuse to compile on warnings as well as errors
+        incremental: Rebuild only the artifacts whose sources changed since
+            the previous pack, instead of everything
+        write: Write the pack, False to only check the data
+
+    Returns:
+        CompileResult: The issues found, the artifacts rebuilt and reused, and
+            the manifest of the written pack unless nothing was written
+    """
+    settings = settings or get_settings()
+    data_path = settings.data_path
+    graph = dependency_graph(data_path)
+    sources = graph_sources(graph)
+    present = [rel_path for rel_path in sources if (data_path / rel_path).is_file()]
+    content_hash, files = compute_content_hash(data_path, present)
+
+    previous_files, previous = _previous_pack(settings.data_pack_path) if incremental else ({}, {})
+    changed = {
+        rel_path for rel_path in set(files) | set(previous_files)
+        if files.get(rel_path) != previous_files.get(rel_path)
+    }
+    rebuild = affected_artifacts(graph, changed, set(previous))
+
+    result = CompileResult(
+        checked_files=len(list(data_path.rglob("*.json"))),
+        issues=check_json_files(data_path) + check_gem_index(data_path),
+        changed=sorted(changed),
+    )
+    ctx = BuildContext(data_path, {}, previous, changed, result.issues)
+    for key in graph:
+        if key not in rebuild:
+            ctx.built[key] = previous[key]
+            result.reused.append(key)
+    for key in rebuild:
+        artifact = graph[key]
+        if any(required not in ctx.built for required in artifact.requires):
+            # A dependency failed and has been reported already
+            continue
+        try:
+            ctx.built[key] = artifact.build(ctx)
+        except FileNotFoundError:
+            ctx.issues.append(DataIssue(path=artifact.sources[0], message="File not found"))
+            continue
+        except ValueError as e:
+            path = artifact.sources[0] if len(artifact.sources) == 1 else key
+            ctx.issues.append(DataIssue(path=path, message=f"Invalid data: {e}"))
+            continue
+        result.rebuilt.append(key)
+    result.issues.extend(check_class_index(data_path, ctx.built))
+
+    logger.info(
+        f"Rebuilt {len(result.rebuilt)} and reused {len(result.reused)} artifacts "
+        f"for {len(changed)} changed files"
+    )
+    blocking = result.issues if strict else result.errors
+    if blocking:
+        logger.error(f"Found {len(blocking)} blocking data issues, not compiling")
+        return result
+    if not write:
+        return result
+
+    result.manifest = DataPackManifest(
+        format_version=PACK_FORMAT_VERSION,
+        content_hash=content_hash,
+        schema_hash=compute_schema_hash(),
+        files=files,
+        categories=sorted(ctx.built),
+        metadata=GameDataMetadata.model_validate(codec.load_file(data_path / METADATA_FILE)),
+        created_at=datetime.now()
+    )
+    write_data_pack(settings.data_pack_path, ctx.built, result.manifest, pack_segments(graph))
+    return result
+
+
+def check_data(settings: Optional[Settings] = None, strict: bool = False) -> CompileResult:
+    """Run every check and validation over the data directory without writing.
+
+    Args:
+        settings: Settings with the data directory, the application settings
+            if not given
+        strict: Treat warnings as blocking
+
+    Returns:
+        CompileResult: Number of checked files and the issues found
+    """
+    return compile_data(settings, strict=strict, incremental=False, write=False)
+
+
+def verify_data_pack(settings: Optional[Settings] = None) -> VerifyResult:
+    """Check whether the compiled pack still matches the sources and schemas.
+
+    Args:
+        settings: Settings with the data and pack directories, the
+            application settings if not given
+
+    Returns:
+        VerifyResult: Files that changed since the pack was compiled
+    """
+    settings = settings or get_settings()
+    manifest = load_manifest(settings.data_pack_path)
+    if manifest is None:
+        return VerifyResult(manifest=None, problems=["No data pack manifest"])
+
+    result = VerifyResult(manifest=manifest)
+    if manifest.format_version != PACK_FORMAT_VERSION:
+        result.problems.append(
+            f"Pack format {manifest.format_version}, expected {PACK_FORMAT_VERSION}"
+        )
+    if manifest.schema_hash != compute_schema_hash():
+        result.problems.append("Pack was compiled with different schemas")
+
+    data_path = settings.data_path
+    present = [rel for rel in manifest.files if (data_path / rel).is_file()]
+    result.missing = sorted(set(manifest.files) - set(present))
+    _, files = compute_content_hash(data_path, present)
+    result.changed = sorted(rel for rel, file_hash in files.items() if manifest.files[rel] != file_hash)
+    result.added = sorted(set(graph_sources(dependency_graph(data_path))) - set(manifest.files))
+    return result
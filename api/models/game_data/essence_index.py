@@ -0,0 +1,221 @@
+"""
+Essence query engine.
+
+Every essence of a class gets a small integer ID, and each filterable value
+(gear slot, modified skill, effect type and effect tag) maps to a bitset of the
+IDs that have it. A query intersects the bitsets of the requested values with
+``&`` and only touches the essences in the result, instead of filtering every
+essence of the class on every call.
+
+The posting lists come from the prebuilt ``classes/<class>/indexes/by_*.json``
+files when those are consistent with the essences in ``essences.json``, and
+are rebuilt from the essence fields otherwise.
+"""
+
+import logging
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from api.core import codec
+
+from .names import normalize_name
+from .schemas.essences import ClassEssences, EssenceData
+
+logger = logging.getLogger(__name__)
+
+CLASSES_DIR = "classes"
+
+# Query dimension -> (index file, section in the file)
+PREBUILT_INDEXES = {
+    "slot": ("by_slot.json", "slots"),
+    "skill": ("by_skill.json", "skills"),
+    "effect_type": ("by_effect.json", "effects"),
+    "effect_tag": ("by_effect.json", "tags"),
+}
+
+
+def read_essence_indexes(data_path: Path, class_name: str) -> Dict[str, Dict[str, List[str]]]:
+    """Read the prebuilt essence indexes of a class.
+
+    Args:
+        data_path: Root of the indexed data directory
+        class_name: Name of the class
+
+    Returns:
+        Dict[str, Dict[str, List[str]]]: Posting lists of essence keys by value,
+            keyed by query dimension; dimensions without an index file are left out
+    """
+    indexes_dir = data_path / CLASSES_DIR / class_name.lower() / "indexes"
+    files: Dict[str, dict] = {}
+    indexes = {}
+    for dimension, (file_name, section) in PREBUILT_INDEXES.items():
+        if file_name not in files:
+            path = indexes_dir / file_name
+            if not path.is_file():
+                continue
+            files[file_name] = codec.load_file(path)
+        if section in files[file_name]:
+            indexes[dimension] = files[file_name][section]
+    return indexes
+
+
+def list_classes(data_path: Path) -> List[str]:
+    """Get the classes that have essence data.
+
+    Args:
+        data_path: Root of the indexed data directory
+
+    Returns:
+        List[str]: Lowercase class names, sorted
+    """
+    classes_dir = data_path / CLASSES_DIR
+    if not classes_dir.is_dir():
+        return []
+    return sorted(path.parent.name for path in classes_dir.glob("*/essences.json"))
+
+
+def class_source_files(data_path: Path) -> List[str]:
+    """Get the essence files and prebuilt indexes of every class.
+
+    Args:
+        data_path: Root of the indexed data directory
+
+    Returns:
+        List[str]: Source paths relative to the data directory
+    """
+    files = []
+    for class_name in list_classes(data_path):
+        files.append(f"{CLASSES_DIR}/{class_name}/essences.json")
+        for file_name in sorted({file_name for file_name, _ in PREBUILT_INDEXES.values()}):
+            if (data_path / CLASSES_DIR / class_name / "indexes" / file_name).is_file():
+                files.append(f"{CLASSES_DIR}/{class_name}/indexes/{file_name}")
+    return files
+
+
+def _iter_bits(mask: int) -> Iterator[int]:
+    """Yield the positions of the set bits of a mask in ascending order."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class EssenceQueryEngine:
+    """Answers multi-key essence queries by intersecting bitsets."""
+
+    DIMENSIONS = tuple(PREBUILT_INDEXES)
+
+    def __init__(
+            self,
+            essences: ClassEssences,
+            prebuilt: Optional[Dict[str, Dict[str, List[str]]]] = None
+        ) -> None:
+        """Build the engine for one class.
+
+        Args:
+            essences: Validated essences of the class
+            prebuilt: Prebuilt posting lists as returned by read_essence_indexes()
+        """
+        self._keys: List[str] = sorted(essences.essences)
+        self._essences: Dict[str, EssenceData] = essences.essences
+        self._ids: Dict[str, int] = {key: i for i, key in enumerate(self._keys)}
+        self._all = (1 << len(self._keys)) - 1
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self.rebuilt: List[str] = []
+
+        prebuilt = prebuilt or {}
+        for dimension in self.DIMENSIONS:
+            postings = self._from_prebuilt(prebuilt.get(dimension), dimension)
+            if postings is None:
+                postings = self._from_fields(dimension)
+                self.rebuilt.append(dimension)
+            self._postings[dimension] = postings
+
+        if self.rebuilt:
+            logger.debug(f"Rebuilt essence indexes from essence fields: {', '.join(self.rebuilt)}")
+
+    def _values(self, essence: EssenceData, dimension: str) -> List[str]:
+        """Get the values an essence has in a query dimension."""
+        if dimension == "slot":
+            return [essence.gear_slot]
+        if dimension == "skill":
+            return [essence.modifies_skill]
+        if dimension == "effect_type":
+            return [essence.effect_type] if essence.effect_type else []
+        return list(essence.effect_tags or [])
+
+    def _from_fields(self, dimension: str) -> Dict[str, int]:
+        """Build the bitsets of a dimension from the essence fields."""
+        postings: Dict[str, int] = {}
+        for key, essence in self._essences.items():
+            bit = 1 << self._ids[key]
+            for value in self._values(essence, dimension):
+                value = normalize_name(value)
+                postings[value] = postings.get(value, 0) | bit
+        return postings
+
+    def _from_prebuilt(
+            self,
+            index: Optional[Dict[str, List[str]]],
+            dimension: str
+        ) -> Optional[Dict[str, int]]:
+        """Convert a prebuilt index to bitsets if it matches the essence data.
+
+        Returns:
+            Optional[Dict[str, int]]: The bitsets, or None if the index is
+                missing, lists unknown essences or, for slots and skills, does
+                not cover every essence
+        """
+        if index is None:
+            return None
+        listed = {key for keys in index.values() for key in keys}
+        if listed != set(self._ids) and dimension in ("slot", "skill"):
+            # Every essence has a slot and a skill, so these must cover all of them
+            return None
+        if not listed <= set(self._ids):
+            return None
+
+        postings: Dict[str, int] = {}
+        for value, keys in index.items():
+            value = normalize_name(value)
+            for key in keys:
+                postings[value] = postings.get(value, 0) | (1 << self._ids[key])
+        return postings
+
+    def values(self, dimension: str) -> List[str]:
+        """Get the normalized values of a query dimension."""
+        return sorted(self._postings[dimension])
+
+    def query(
+            self,
+            slot: Optional[str] = None,
+            skill: Optional[str] = None,
+            effect_type: Optional[str] = None,
+            effect_tag: Optional[str] = None
+        ) -> Dict[str, EssenceData]:
+        """Find the essences matching every given filter.
+
+        Filter values match regardless of case and punctuation.
+
+        Args:
+            slot: Gear slot, e.g. "Main Hand"
+            skill: Modified skill, e.g. "Whirlwind"
+            effect_type: Effect type, e.g. "damage"
+            effect_tag: Effect tag, e.g. "crowd_control"
+
+        Returns:
+            Dict[str, EssenceData]: Matching essences keyed by essence key, in
+                key order
+        """
+        mask = self._all
+        filters = zip(self.DIMENSIONS, (slot, skill, effect_type, effect_tag))
+        for dimension, value in filters:
+            if value is not None:
+                mask &= self._postings[dimension].get(normalize_name(value), 0)
+                if not mask:
+                    break
+        return {self._keys[i]: self._essences[self._keys[i]] for i in _iter_bits(mask)}
+
+    def __len__(self) -> int:
+        """Number of indexed essences."""
+        return len(self._keys)
@@ -0,0 +1,105 @@
+"""
+In-memory gem catalog for listing and filtering gems.
+
+The catalog keeps every gem of the registry in one list sorted by star rating
+and name, plus posting lists of positions in that list per star rating and per
+skill type from the gem skill map. A filtered query intersects the posting
+lists once and remembers the result, so repeated and paginated queries are a
+list slice. The GameDataManager builds one catalog per data generation.
+"""
+
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from .names import NameIndex
+from .schemas import Gem, GemRegistry, GemSkillMap
+
+
+class GemCatalog:
+    """Sorted gems with precomputed star rating and skill type filters."""
+
+    def __init__(
+            self,
+            gems: GemRegistry,
+            skillmap: Optional[GemSkillMap] = None,
+            names: Optional[NameIndex] = None
+        ) -> None:
+        """Build the catalog.
+
+        Args:
+            gems: Gem registry
+            skillmap: Gem skill map; without it no gem has a skill type
+            names: Gem name index used to resolve names in the skill map
+        """
+        self._gems: List[Gem] = sorted(
+            gems.root.values(), key=lambda gem: (int(gem.stars), gem.name)
+        )
+        positions = {gem.name: i for i, gem in enumerate(self._gems)}
+
+        self._by_stars: Dict[str, FrozenSet[int]] = {}
+        for i, gem in enumerate(self._gems):
+            self._by_stars[gem.stars] = self._by_stars.get(gem.stars, frozenset()) | {i}
+
+        self._by_skill: Dict[str, FrozenSet[int]] = {}
+        skill_types = skillmap.gems_by_skill.model_dump() if skillmap else {}
+        for skill_type, gem_names in skill_types.items():
+            matches = set()
+            for name in gem_names:
+                key = (names.resolve(name) if names else None) or name
+                if key in positions:
+                    matches.add(positions[key])
+            self._by_skill[skill_type] = frozenset(matches)
+
+        self._results: Dict[Tuple[Optional[Tuple[str, ...]], Optional[str]], List[Gem]] = {
+            (None, None): self._gems
+        }
+
+    @property
+    def skill_types(self) -> List[str]:
+        """Skill types gems can be filtered by."""
+        return list(self._by_skill)
+
+    def _matching_skill_types(self, skill_type: str) -> Tuple[str, ...]:
+        """Get the skill types whose name contains the requested one."""
+        skill_type = skill_type.lower().replace(" ", "_")
+        return tuple(name for name in self._by_skill if skill_type in name.lower())
+
+    def query(
+            self,
+            skill_type: Optional[str] = None,
+            stars: Optional[int] = None,
+            offset: int = 0,
+            limit: Optional[int] = None
+        ) -> List[Gem]:
+        """Find gems by skill type and star rating.
+
+        Args:
+            skill_type: Skill type, matching every skill type whose name
+                contains it, e.g. "attack" also matches "primary_attack"
+            stars: Star rating
+            offset: Number of matching gems to skip
+            limit: Maximum number of gems to return
+
+        Returns:
+            List[Gem]: Matching gems sorted by star rating and name
+        """
+        skills = self._matching_skill_types(skill_type) if skill_type else None
+        star_key = str(stars) if stars else None
+        key = (skills, star_key)
+
+        results = self._results.get(key)
+        if results is None:
+            positions = frozenset(range(len(self._gems)))
+            if skills is not None:
+                positions = frozenset().union(*(self._by_skill[name] for name in skills))
+            if star_key is not None:
+                positions &= self._by_stars.get(star_key, frozenset())
+            results = [self._gems[i] for i in sorted(positions)]
+            # Keys are bounded by the skill type and star combinations
+            self._results[key] = results
+
+        end = offset + limit if limit is not None else None
+        return results[offset:end]
+
+    def __len__(self) -> int:
+        """Number of gems in the catalog."""
+        return len(self._gems)
@@ -0,0 +1,144 @@
+"""
+Inverted gem index over the gem metadata files.
+
+Stat boosts, synergy categories, gem pairs, conditions and effect details are
+stored per topic under ``gems/metadata/``, each listing the gems it applies to.
+The index inverts them into one GemProfile per gem, so per-gem endpoints are a
+single dict lookup instead of a walk over every stat type and synergy group.
+The GameDataManager builds it once per data generation.
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from api.core import codec
+
+from .names import NameIndex
+from .schemas import GemProfile, GemRegistry
+
+logger = logging.getLogger(__name__)
+
+GEM_METADATA_DIR = "gems/metadata"
+STAT_BOOSTS_DIR = f"{GEM_METADATA_DIR}/stat_boosts"
+SYNERGY_CATEGORIES_FILE = f"{GEM_METADATA_DIR}/synergies/categories.json"
+GEM_PAIRS_FILE = f"{GEM_METADATA_DIR}/synergies/gem_pairs.json"
+CONDITIONS_FILE = f"{GEM_METADATA_DIR}/conditions.json"
+EFFECT_DETAILS_FILE = f"{GEM_METADATA_DIR}/effect_details.json"
+
+
+def _read_section(data_path: Path, rel_path: str, section: str) -> Dict[str, Any]:
+    """Read one top-level section of a metadata file, empty if the file is missing."""
+    path = data_path / rel_path
+    if not path.is_file():
+        logger.debug(f"Gem metadata file not found: {path}")
+        return {}
+    return codec.load_file(path).get(section, {})
+
+
+def gem_metadata_files(data_path: Path) -> List[str]:
+    """Get the gem metadata files the index is built from.
+
+    Args:
+        data_path: Root of the indexed data directory
+
+    Returns:
+        List[str]: Existing metadata paths relative to the data directory
+    """
+    files = [
+        str(path.relative_to(data_path))
+        for path in sorted((data_path / STAT_BOOSTS_DIR).glob("*.json"))
+    ]
+    for rel_path in (SYNERGY_CATEGORIES_FILE, GEM_PAIRS_FILE, CONDITIONS_FILE, EFFECT_DETAILS_FILE):
+        if (data_path / rel_path).is_file():
+            files.append(rel_path)
+    return files
+
+
+def read_gem_metadata(data_path: Path) -> Dict[str, Dict[str, Any]]:
+    """Read the gem metadata files the index is built from.
+
+    Args:
+        data_path: Root of the indexed data directory
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Raw metadata keyed by source ("stat_boosts",
+            "categories", "pairs", "conditions" and "effect_details")
+    """
+    stat_boosts = {}
+    stats_dir = data_path / STAT_BOOSTS_DIR
+    if stats_dir.is_dir():
+        for path in sorted(stats_dir.glob("*.json")):
+            stat_boosts[path.stem] = codec.load_file(path).get("gems", [])
+
+    return {
+        "stat_boosts": stat_boosts,
+        "categories": _read_section(data_path, SYNERGY_CATEGORIES_FILE, "categories"),
+        "pairs": _read_section(data_path, GEM_PAIRS_FILE, "pairs"),
+        "conditions": _read_section(data_path, CONDITIONS_FILE, "conditions"),
+        "effect_details": _read_section(data_path, EFFECT_DETAILS_FILE, "effect_details"),
+    }
+
+
+def build_gem_index(
+        metadata: Dict[str, Dict[str, Any]],
+        names: NameIndex,
+        gems: Optional[GemRegistry] = None
+    ) -> Dict[str, GemProfile]:
+    """Invert the gem metadata into one profile per gem.
+
+    Gem names in the metadata files are resolved through the gem name index,
+    so spelling differences between files end up in the same profile.
+
+    Args:
+        metadata: Raw metadata as returned by read_gem_metadata()
+        names: Name index of the gem registry
+        gems: Gem registry; every registered gem gets a profile
+
+    Returns:
+        Dict[str, GemProfile]: Profiles keyed by canonical gem name
+    """
+    profiles: Dict[str, Dict[str, Any]] = {}
+
+    def profile(name: str) -> Dict[str, Any]:
+        key = names.resolve(name) or name
+        if key not in profiles:
+            profiles[key] = {
+                "name": key,
+                "stats": {},
+                "synergies": {},
+                "pairs": {},
+                "conditions": [],
+                "effect_details": {},
+            }
+        return profiles[key]
+
+    for name in gems or ():
+        profile(name)
+
+    for stat_type, entries in metadata["stat_boosts"].items():
+        for entry in entries:
+            profile(entry["name"])["stats"][stat_type] = entry
+
+    for category, group in metadata["categories"].items():
+        for name in group.get("gems", []):
+            profile(name)["synergies"][category] = group
+
+    for name, partners in metadata["pairs"].items():
+        gem = profile(name)
+        for partner, pair in partners.items():
+            other = profile(partner)
+            gem["pairs"][other["name"]] = pair
+            other["pairs"].setdefault(gem["name"], pair)
+
+    for name, conditions in metadata["conditions"].items():
+        profile(name)["conditions"].extend(conditions)
+
+    for category, details in metadata["effect_details"].items():
+        for name, detail in details.items():
+            profile(name)["effect_details"][category] = detail
+
+    return {
+        key: GemProfile(gem=gems.get(key) if gems is not None else None, **data)
+        for key, data in profiles.items()
+    }
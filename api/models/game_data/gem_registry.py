@@ -0,0 +1,144 @@
+"""
+Gem registry loader for the per-gem data files.
+
+Gem data lives as one JSON file per gem under ``gems/core/{1,2,5}star/``, listed
+by name in ``gems/index.json``. The loader reads the index, parses the gem files
+in parallel and keeps the merged GemRegistry in memory. On later loads only the
+files whose modification time or size changed are parsed again, so editing one
+gem does not force a full reparse.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from api.core import codec
+
+from .schemas import Gem, GemRegistry
+
+logger = logging.getLogger(__name__)
+
+GEMS_DIR = "gems"
+INDEX_FILE = f"{GEMS_DIR}/index.json"
+
+
+def load_gem_file(path: Path) -> Gem:
+    """Read and validate a single gem file.
+
+    Kept at module level so it can run in a process pool.
+
+    Args:
+        path: Path to the gem file
+
+    Returns:
+        Gem: The validated gem
+    """
+    data = codec.load_file(path)
+    data.pop("metadata", None)
+    return Gem.model_validate(data)
+
+
+class _GemEntry(NamedTuple):
+    """A parsed gem file and the file signature it was parsed from."""
+
+    rel_path: str
+    signature: Tuple[int, int]
+    gem: Gem
+
+
+class GemRegistryLoader:
+    """Loads and incrementally refreshes the gem registry."""
+
+    def __init__(self, data_path: Path) -> None:
+        """Initialize the gem registry loader.
+
+        Args:
+            data_path: Root of the indexed data directory
+        """
+        self.data_path = data_path
+        self._entries: Dict[str, _GemEntry] = {}
+        self._registry: Optional[GemRegistry] = None
+        self._stats: Dict[str, int] = {"parsed": 0, "reused": 0}
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Number of gem files parsed and reused by the last load."""
+        return dict(self._stats)
+
+    def read_index(self) -> Dict[str, str]:
+        """Read the gem index.
+
+        Returns:
+            Dict[str, str]: Gem file paths relative to the data directory,
+                keyed by gem name
+
+        Raises:
+            FileNotFoundError: If the index does not exist
+        """
+        index = codec.load_file(self.data_path / INDEX_FILE)["index"]
+        return {name: f"{GEMS_DIR}/{rel_path}" for name, rel_path in index.items()}
+
+    def source_files(self) -> List[str]:
+        """Get the index and every gem file it lists.
+
+        Returns:
+            List[str]: Source paths relative to the data directory
+        """
+        return [INDEX_FILE] + list(self.read_index().values())
+
+    def _signatures(self, index: Dict[str, str]) -> Dict[str, Tuple[int, int]]:
+        """Get the modification time and size of every indexed gem file."""
+        signatures = {}
+        for name, rel_path in index.items():
+            stat = (self.data_path / rel_path).stat()
+            signatures[name] = (stat.st_mtime_ns, stat.st_size)
+        return signatures
+
+    async def load(self, executor: Optional[Executor] = None) -> GemRegistry:
+        """Load the gem registry, reparsing only gem files that changed.
+
+        Args:
+            executor: Executor to parse gem files in, the loop's default
+                executor if not given
+
+        Returns:
+            GemRegistry: The merged registry of every indexed gem
+
+        Raises:
+            FileNotFoundError: If the index or a gem file does not exist
+            ValueError: If a gem file fails to validate
+        """
+        index = await asyncio.to_thread(self.read_index)
+        signatures = await asyncio.to_thread(self._signatures, index)
+
+        changed = [
+            name for name, rel_path in index.items()
+            if name not in self._entries
+            or self._entries[name].rel_path != rel_path
+            or self._entries[name].signature != signatures[name]
+        ]
+        removed = set(self._entries) - set(index)
+
+        self._stats = {"parsed": len(changed), "reused": len(index) - len(changed)}
+        if self._registry is not None and not changed and not removed:
+            return self._registry
+
+        loop = asyncio.get_running_loop()
+        gems = await asyncio.gather(*(
+            loop.run_in_executor(executor, load_gem_file, self.data_path / index[name])
+            for name in changed
+        ))
+
+        for name in removed:
+            del self._entries[name]
+        for name, gem in zip(changed, gems):
+            self._entries[name] = _GemEntry(index[name], signatures[name], gem)
+
+        self._registry = GemRegistry({name: self._entries[name].gem for name in index})
+        logger.info(
+            f"Loaded gem registry: {len(changed)} parsed, "
+            f"{len(index) - len(changed)} reused, {len(removed)} removed"
+        )
+        return self._registry
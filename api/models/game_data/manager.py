@@ -5,19 +5,26 @@ This module provides the core functionality for loading and managing game data,
 with support for caching and version-aware loading.
 """
 
-import json
+import asyncio
+import contextlib
+import functools
 import logging
+import time
+import weakref
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, TypeVar, Type, Union, List, Optional
+from typing import Any, Awaitable, Callable, Dict, Iterable, TypeVar, Type, Tuple, Union, List, Optional
 
 from pydantic import BaseModel
 
+from api.core import codec
 from api.core.config import Settings, get_settings
 from .schemas import (
     BuildTypes,
     GameConstraints,
     SetBonusRegistry,  # Renamed from EquipmentSets
+    GemProfile,
     GemRegistry,
     GemSkillMap,
     GameStats,
@@ -26,11 +33,83 @@ from .schemas import (
     GameDataCache,
 )
 from .schemas.essences import ClassEssences, EssenceData
+from .schemas.stats import DEFAULT_STAT_GROUP, STAT_GROUPS, StatCategory
+from .schemas.synergies import SynergyGroup
+from .essence_index import (
+    EssenceQueryEngine,
+    class_source_files,
+    list_classes,
+    read_essence_indexes,
+)
+from .gem_catalog import GemCatalog
+from .gem_index import build_gem_index, gem_metadata_files, read_gem_metadata
+from .gem_registry import INDEX_FILE as GEM_INDEX_FILE, GemRegistryLoader
+from .pack import (
+    DataPackManifest,
+    compute_content_hash,
+    compute_schema_hash,
+    load_data_pack,
+    open_data_pack,
+)
+from .names import NameIndex
+from .pinning import current_pin
+from .watcher import DataWatcher
 
 T = TypeVar("T", bound=BaseModel)
 logger = logging.getLogger(__name__)
 
 
+def category_files(data_path: Path, rel_path: str) -> List[str]:
+    """Get the files a category is read from.
+
+    A category path is a JSON file, one top-level section of a JSON file
+    ("file.json:section"), or a directory ("dir/") whose JSON files each hold
+    one entry of the category, keyed by file name.
+
+    Args:
+        data_path: Root of the indexed data directory
+        rel_path: Category path relative to data_path
+
+    Returns:
+        List[str]: Paths of the files relative to data_path
+    """
+    if rel_path.endswith("/"):
+        return [str(path.relative_to(data_path)) for path in sorted((data_path / rel_path).glob("*.json"))]
+    return [rel_path.split(":", 1)[0]]
+
+
+def load_category_file(data_path: Path, model_cls: Type[T], rel_path: str) -> T:
+    """Read and validate one category.
+
+    Kept at module level so it can run in a process pool.
+
+    Args:
+        data_path: Root of the indexed data directory
+        model_cls: The model class to validate the data with
+        rel_path: Category path relative to data_path, see category_files()
+
+    Returns:
+        The validated data
+
+    Raises:
+        ValueError: If the data is invalid or the section is missing
+    """
+    if rel_path.endswith("/"):
+        data = {}
+        for file_path in category_files(data_path, rel_path):
+            entry = codec.load_file(data_path / file_path)
+            entry.pop("metadata", None)
+            data[Path(file_path).stem] = entry
+    else:
+        file_path, _, section = rel_path.partition(":")
+        data = codec.load_file(data_path / file_path)
+        if section:
+            if section not in data:
+                raise ValueError(f"{file_path} has no {section} section")
+            data = data[section]
+    return model_cls.model_validate(data)
+
+
 class GameDataManager:
     """Manages access to indexed game data with caching and version awareness."""
 
@@ -38,11 +117,11 @@ class GameDataManager:
         "build_types": (BuildTypes, "build_types.json"),
         "constraints": (GameConstraints, "constraints.json"),
         "sets": (SetBonusRegistry, "sets.json"),  # Renamed from equipment_sets
-        "gems/data": (GemRegistry, "gems/gems.json"),
-        "gems/skillmap": (GemSkillMap, "gems/gem_skillmap.json"),
-        "gems/stat_boosts": (GameStats, "gems/stat_boosts.json"),
-        "gems/synergies": (GameSynergies, "gems/synergies.json"),
-        "synergies": (GameSynergies, "synergies.json"),  # Root level synergies
+        "gems/data": (GemRegistry, GEM_INDEX_FILE),  # Per-gem files listed in the index
+        "gems/skillmap": (GemSkillMap, "gems/metadata/gem_skillmap.json"),
+        "gems/stat_boosts": (GameStats, "gems/metadata/stat_boosts/"),  # One file per stat
+        "gems/synergies": (GameSynergies, "gems/metadata/synergies/categories.json:categories"),
+        "synergies": (GameSynergies, "synergies.json:synergies"),  # Root level synergies
     }
 
     # Static gear slots (right side of character)
@@ -86,7 +165,199 @@ class GameDataManager:
             data={},
             last_loaded=None
         )
-        self._essence_cache: Dict[str, ClassEssences] = {}
+        # Bumped by the data watcher when the data changes on disk; the cache is
+        # reloaded on the next access once it no longer matches _loaded_generation
+        self._generation = 0
+        self._loaded_generation: Optional[int] = None
+        self._watcher: Optional[DataWatcher] = None
+        
+        # Published generations still referenced by the current pointer or by
+        # requests that pinned them; entries disappear once they are released
+        self._live_generations: "weakref.WeakValueDictionary[int, GameDataCache]" = (
+            weakref.WeakValueDictionary()
+        )
+        
+        self._load_executor: Optional[Executor] = None
+        self._load_timings: Dict[str, Any] = {}
+        self._gem_loader = GemRegistryLoader(self.settings.data_path)
+        
+        # In-flight loads of single entries of a generation, keyed by
+        # (id(generation), key), so concurrent first hits share one load
+        self._entry_tasks: Dict[Tuple[int, str], asyncio.Task] = {}
+        
+        # Single-flight reload: concurrent callers share the in-flight task
+        self._reload_task: Optional[asyncio.Task] = None
+        self._reload_stats: Dict[str, int] = {
+            "started": 0,
+            "completed": 0,
+            "failed": 0,
+            "coalesced": 0,
+        }
+
+    @property
+    def generation(self) -> int:
+        """Current data generation."""
+        return self._generation
+
+    @property
+    def current(self) -> GameDataCache:
+        """The most recently published data generation."""
+        return self._cache
+
+    def live_generations(self) -> List[int]:
+        """Get the data generations that are still referenced.
+
+        Returns:
+            List[int]: Generation numbers that have not been freed yet
+        """
+        return sorted(cache.generation for cache in self._live_generations.values())
+
+    def mark_stale(self) -> None:
+        """Flag the cached data for reload.
+
+        If data is already loaded, the new generation is built in the background
+        while requests keep being served from the current one.
+        """
+        self._generation += 1
+        logger.debug(f"Data generation bumped to {self._generation}")
+        if self._cache.last_loaded is not None:
+            try:
+                self._schedule_refresh()
+            except RuntimeError:
+                # No running event loop; the next get_data() schedules it
+                pass
+
+    @property
+    def reload_stats(self) -> Dict[str, int]:
+        """Counters for started, completed, failed and coalesced reloads."""
+        return dict(self._reload_stats)
+
+    def _schedule_refresh(self) -> asyncio.Task:
+        """Start a reload unless one is already in flight.
+
+        Returns:
+            asyncio.Task: The in-flight reload task
+        """
+        task = self._reload_task
+        if task is not None and not task.done():
+            self._reload_stats["coalesced"] += 1
+            return task
+
+        self._reload_stats["started"] += 1
+        task = asyncio.get_running_loop().create_task(
+            self._run_reload(), name="game-data-reload"
+        )
+        task.add_done_callback(self._log_reload_failure)
+        self._reload_task = task
+        return task
+
+    @staticmethod
+    def _log_reload_failure(task: asyncio.Task) -> None:
+        """Log reload errors, including for background reloads nobody awaits."""
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Error reloading game data: {task.exception()}")
+
+    async def refresh(self) -> GameDataCache:
+        """Reload the data now if it is stale and wait for the new generation.
+
+        Returns:
+            GameDataCache: The published generation
+        """
+        if self._should_reload():
+            await asyncio.shield(self._schedule_refresh())
+        return self._cache
+
+    def start_watching(self) -> DataWatcher:
+        """Start the background data watcher.
+
+        Must be called from a running event loop, typically in the app lifespan.
+
+        Returns:
+            DataWatcher: The started watcher
+        """
+        if self._watcher is None:
+            self._watcher = DataWatcher(
+                self,
+                poll_interval=self.settings.DATA_WATCH_POLL_INTERVAL
+            )
+        self._watcher.start()
+        return self._watcher
+
+    async def stop_watching(self) -> None:
+        """Stop the background data watcher if it is running."""
+        if self._watcher is not None:
+            await self._watcher.stop()
+
+    async def close(self) -> None:
+        """Stop the data watcher, cancel a pending reload and release the load executor."""
+        await self.stop_watching()
+        task = self._reload_task
+        if task is not None and not task.done():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        if self._load_executor is not None:
+            self._load_executor.shutdown(wait=False, cancel_futures=True)
+            self._load_executor = None
+
+    @property
+    def load_timings(self) -> Dict[str, Any]:
+        """Timings of the last data load.
+
+        Contains the load source ("json" or "pack"), the total time and the
+        per-category read and validate time, all in milliseconds.
+        """
+        return dict(self._load_timings)
+
+    async def warm(self, categories: Optional[Iterable[str]] = None) -> None:
+        """Preload categories so the first requests do not pay for them.
+
+        In lazy mode only the given categories are loaded; in eager mode the
+        whole generation is loaded by the first of them.
+
+        Args:
+            categories: Categories to load, all categories if not given
+
+        Raises:
+            ValueError: If a category is not supported or fails to load
+        """
+        categories = list(self.CATEGORY_LOADERS if categories is None else categories)
+        unknown = [category for category in categories if category not in self.CATEGORY_LOADERS]
+        if unknown:
+            raise ValueError(f"Unsupported categories: {', '.join(unknown)}")
+        
+        logger.info(f"Warming game data categories: {', '.join(categories)}")
+        await asyncio.gather(*(self.get_data(category) for category in categories))
+
+    async def preload(self) -> List[str]:
+        """Load every category and build every derived index of the current generation.
+
+        Used by the preforking server to load everything once in the parent
+        process, so the workers inherit it instead of loading it again. Entries
+        that fail to load are logged and skipped; requests for them fail just
+        as they would without preloading.
+
+        Returns:
+            List[str]: Keys of the entries loaded into the generation
+
+        Raises:
+            ValueError: If the generation itself fails to load
+        """
+        cache = await self._pinned_cache()
+        classes = await asyncio.to_thread(list_classes, self.settings.data_path)
+        name_kinds = ["gems", "sets", "synergies", "gems/synergies"]
+        name_kinds += [f"essences/{class_name}" for class_name in classes]
+
+        loads = [self._category_data(cache, category) for category in self.CATEGORY_LOADERS]
+        loads += [self.get_essence_engine(class_name) for class_name in classes]
+        loads += [self._name_index(cache, kind) for kind in name_kinds]
+        loads += [self._gem_index(cache), self.get_gem_catalog()]
+        for result in await asyncio.gather(*loads, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.warning(f"Skipped preloading an entry: {result}")
+
+        logger.info(f"Preloaded {len(cache.data)} game data entries")
+        return sorted(cache.data)
 
     def _load_metadata(self) -> GameDataMetadata:
         """Load metadata from the indexed data directory.
@@ -96,10 +367,7 @@ class GameDataManager:
         """
         metadata_path = self.settings.data_path / "metadata.json"
         logger.debug(f"Loading metadata from: {metadata_path}")
-        with metadata_path.open() as f:
-            metadata = json.load(f)
-            logger.debug(f"Loaded metadata: {metadata}")
-            return GameDataMetadata.model_validate(metadata)
+        return GameDataMetadata.model_validate(codec.load_file(metadata_path))
 
     def _load_json_file(self, rel_path: str) -> Dict:
         """Load a JSON file from the data directory.
@@ -116,14 +384,11 @@ class GameDataManager:
         file_path = self.settings.data_path / rel_path
         logger.debug(f"Loading JSON file: {file_path}")
         try:
-            with open(file_path) as f:
-                data = json.load(f)
-                logger.debug(f"Loaded JSON data: {data}")
-                return data
+            return codec.load_file(file_path)
         except FileNotFoundError:
             logger.error(f"JSON file not found: {file_path}")
             raise FileNotFoundError(f"JSON file not found: {file_path}")
-        except json.JSONDecodeError as e:
+        except ValueError as e:
             logger.error(f"Invalid JSON in file {file_path}: {str(e)}")
             raise ValueError(f"Invalid JSON in file {file_path}: {str(e)}")
 
@@ -146,44 +411,92 @@ class GameDataManager:
             raise ValueError(f"Unsupported category: {category}")
         
         try:
-            if self._should_reload():
-                logger.info("Data needs to be reloaded")
-                await self._reload_data()
-            return self._cache.data.get(category)
+            return await self._category_data(await self._pinned_cache(), category)
         except Exception as e:
             logger.error(f"Error getting data for category {category}: {e}")
             raise
 
+    async def _category_data(self, cache: GameDataCache, category: str) -> Any:
+        """Get a category from a generation, loading it first in lazy or shared mode."""
+        if category not in cache.data and (self.settings.GAME_DATA_LAZY or cache.pack is not None):
+            return await self._load_entry(
+                cache,
+                category,
+                lambda: self._load_category_timed(category, *self.CATEGORY_LOADERS[category])
+            )
+        return cache.data.get(category)
+
+    async def pinned_cache(self) -> GameDataCache:
+        """Get the data generation pinned by the current request.
+
+        Returns:
+            GameDataCache: The generation the request reads from
+        """
+        return await self._pinned_cache()
+
+    async def _pinned_cache(self) -> GameDataCache:
+        """Get the data generation for the current request.
+
+        The first lookup inside a pinned request fixes its generation, so every
+        later lookup in the same request sees the same data even if a reload
+        publishes a newer generation in the meantime.
+
+        Returns:
+            GameDataCache: The generation to read from
+        """
+        pin = current_pin()
+        pinned = pin.get(self) if pin is not None else None
+        if pinned is not None:
+            return pinned
+
+        if self._cache.last_loaded is None:
+            logger.info("Data needs to be loaded")
+            await self._reload_data()
+        elif self._should_reload():
+            logger.info("Data is stale, reloading in the background")
+            self._schedule_refresh()
+
+        cache = self._cache
+        if pin is not None:
+            pin.set(self, cache)
+        return cache
+
     def _should_reload(self) -> bool:
-        """Check if data needs to be reloaded."""
-        if not self._cache or not self._cache.data:
-            logger.debug("Cache has never been loaded")
-            return True
-        
-        # Check if cache is stale
-        if not self._cache.last_loaded:
+        """Check if data needs to be reloaded.
+
+        This is a pure in-memory check. Changes on disk are detected by the
+        background DataWatcher, which bumps the generation via mark_stale().
+        """
+        if self._cache.last_loaded is None:
             logger.debug("Cache has never been loaded")
             return True
         
-        # Check if metadata has changed
-        try:
-            metadata = self._load_metadata()
-            if metadata.last_updated > self._cache.metadata.last_updated:
-                logger.info("Metadata has changed, reloading data")
-                return True
-        except Exception as e:
-            logger.error(f"Error checking metadata: {e}")
-            return True
-        
-        return False
+        return self._loaded_generation != self._generation
+
+    def _get_load_executor(self) -> Executor:
+        """Get the executor used to read and validate categories in parallel.
+
+        Returns:
+            Executor: A thread pool, or a process pool if DATA_LOAD_EXECUTOR is
+                "process"
+        """
+        if self._load_executor is None:
+            workers = self.settings.DATA_LOAD_WORKERS or len(self.CATEGORY_LOADERS)
+            if self.settings.DATA_LOAD_EXECUTOR == "process":
+                self._load_executor = ProcessPoolExecutor(max_workers=workers)
+            else:
+                self._load_executor = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix="game-data-load"
+                )
+        return self._load_executor
 
-    async def _load_category(
+    async def _load_category_timed(
             self,
             category: str,
             model_cls: Type[T],
             file_path: str
-        ) -> T:
-        """Load a category of game data.
+        ) -> Tuple[T, float]:
+        """Load a category in the load executor and measure how long it took.
 
         Args:
             category: The category name
@@ -191,65 +504,313 @@ class GameDataManager:
             file_path: Relative path to the data file
 
         Returns:
-            The loaded and validated data
+            Tuple of the validated data and the load time in milliseconds
         """
-        logger.debug(f"Loading category: {category}")
-        logger.debug(f"Loading category with model {model_cls.__name__} from {file_path}")
-        
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
         try:
-            data = self._load_json_file(file_path)
-            logger.debug(f"Loaded JSON data: {data}")
-            
-            logger.debug(f"Validating data with model {model_cls.__name__}")
-            validated_data = model_cls.model_validate(data)
-            logger.debug(f"Successfully validated data for {model_cls.__name__}")
-            
-            return validated_data
-            
+            if model_cls is GemRegistry:
+                # Only the gem files that changed since the last load are parsed
+                data = await self._gem_loader.load(self._get_load_executor())
+            else:
+                data = await loop.run_in_executor(
+                    self._get_load_executor(),
+                    load_category_file,
+                    self.settings.data_path,
+                    model_cls,
+                    file_path
+                )
         except Exception as e:
             logger.error(f"Error loading category {category}: {e}")
             raise ValueError(f"Failed to load category {category}: {e}") from e
+        return data, (time.perf_counter() - start) * 1000
 
-    async def _reload_data(self) -> None:
-        """Reload all game data into the cache."""
-        logger.info("Reloading all game data")
+    def source_files(self) -> List[str]:
+        """Get the data files that the cached categories and indexes are built from.
+
+        Returns:
+            List[str]: Source paths relative to the data directory
+        """
+        return (
+            ["metadata.json"]
+            + [
+                file_path
+                for _, path in self.CATEGORY_LOADERS.values()
+                for file_path in category_files(self.settings.data_path, path)
+            ]
+            + self._gem_loader.source_files()
+            + gem_metadata_files(self.settings.data_path)
+            + class_source_files(self.settings.data_path)
+        )
+
+    async def _load_entry(
+            self,
+            cache: GameDataCache,
+            key: str,
+            load: Callable[[], Awaitable[Tuple[T, float]]]
+        ) -> T:
+        """Load a single entry into a generation on first access.
+
+        Concurrent first hits for the same entry of the same generation await a
+        single shared load. The result is stored in the generation, so it lives
+        exactly as long as the generation does. Entries are lazily loaded
+        categories, class essences and indexes derived from them. Entries of a
+        mapped data pack are taken from the pack instead of being built.
+
+        Args:
+            cache: Generation to load the entry into
+            key: Key of the entry in the generation's data
+            load: Coroutine function returning the entry and its load time in
+                milliseconds
+
+        Returns:
+            The loaded entry
+        """
+        if key in cache.data:
+            return cache.data[key]
+        if cache.pack is not None and key in cache.pack:
+            load = functools.partial(self._load_pack_entry, cache, key)
+
+        task_key = (id(cache), key)
+        task = self._entry_tasks.get(task_key)
+        if task is None:
+            logger.debug(f"Loading {key} into generation {cache.generation}")
+            task = asyncio.get_running_loop().create_task(
+                self._run_entry_load(cache, key, load),
+                name=f"game-data-load-{key}"
+            )
+            task.add_done_callback(lambda _: self._entry_tasks.pop(task_key, None))
+            self._entry_tasks[task_key] = task
+        return await asyncio.shield(task)
+
+    async def _load_pack_entry(self, cache: GameDataCache, key: str) -> Tuple[Any, float]:
+        """Load an entry from a generation's mapped data pack.
+
+        The entries stored in the same pack segment are added to the generation
+        along with it.
+        """
+        start = time.perf_counter()
+        entries = await asyncio.to_thread(cache.pack.load, key)
+        for other, value in entries.items():
+            if other != key:
+                cache.data.setdefault(other, value)
+        return entries[key], (time.perf_counter() - start) * 1000
+
+    async def _run_entry_load(
+            self,
+            cache: GameDataCache,
+            key: str,
+            load: Callable[[], Awaitable[Tuple[T, float]]]
+        ) -> T:
+        """Load and store one entry of a generation."""
+        data, elapsed_ms = await load()
+        cache.data[key] = data
+        if self._cache is cache:
+            self._load_timings.setdefault("categories", {})[key] = round(elapsed_ms, 3)
+        return data
+
+    async def _load_all_categories(self) -> Dict[str, BaseModel]:
+        """Load and validate every category from the JSON sources in parallel.
+
+        Categories are read and validated concurrently in the load executor, so
+        the wall time approaches that of the largest file rather than the sum.
+        Per-category timings are recorded in load_timings.
+
+        Returns:
+            Dict[str, BaseModel]: Validated data keyed by category
+        """
+        start = time.perf_counter()
+        categories = list(self.CATEGORY_LOADERS)
+        results = await asyncio.gather(*(
+            self._load_category_timed(category, *self.CATEGORY_LOADERS[category])
+            for category in categories
+        ))
+        
         new_data = {}
+        timings = {}
+        for category, (data, elapsed_ms) in zip(categories, results):
+            new_data[category] = data
+            timings[category] = round(elapsed_ms, 3)
         
-        # Load all categories
-        for category, (model, path) in self.CATEGORY_LOADERS.items():
-            logger.debug(f"Loading category: {category}")
-            new_data[category] = await self._load_category(category, model, path)
+        self._load_timings = {
+            "source": "json",
+            "total_ms": round((time.perf_counter() - start) * 1000, 3),
+            "categories": timings,
+        }
+        logger.info(f"Loaded {len(new_data)} categories in {self._load_timings['total_ms']}ms: {timings}")
+        return new_data
+
+    async def _build_cache(self, generation: int) -> GameDataCache:
+        """Build a complete, immutable data generation.
+
+        Uses the compiled data pack when its content and schema hashes match the
+        current sources, trusting its already validated models, otherwise parses
+        and validates the JSON sources. GAME_DATA_VALIDATE forces the latter.
+        In shared mode the pack is memory-mapped and its entries are unpickled
+        on first access; in lazy mode the generation starts empty and each
+        category is loaded from its JSON source on first access instead. All
+        blocking work runs off the event loop.
+
+        Args:
+            generation: Generation number the cache is built for
+
+        Returns:
+            GameDataCache: The new generation
+        """
+        if self.settings.GAME_DATA_SHARED and not self.settings.GAME_DATA_VALIDATE:
+            cache = await self._map_data_pack(generation)
+            if cache is not None:
+                return cache
         
-        # Create a new cache instance with updated data
-        self._cache = GameDataCache(
-            metadata=self._load_metadata(),
+        if self.settings.GAME_DATA_LAZY:
+            # Categories are loaded into the generation on first access
+            self._load_timings = {"source": "lazy", "total_ms": 0.0, "categories": {}}
+            return GameDataCache(
+                metadata=await asyncio.to_thread(self._load_metadata),
+                data={},
+                last_loaded=datetime.now(),
+                generation=generation
+            )
+        
+        start = time.perf_counter()
+        content_hash, _ = await asyncio.to_thread(
+            compute_content_hash, self.settings.data_path, self.source_files()
+        )
+        
+        new_data = None
+        if self.settings.GAME_DATA_VALIDATE:
+            logger.info("Full validation enabled, ignoring data pack")
+        else:
+            new_data = await asyncio.to_thread(
+                load_data_pack, self.settings.data_pack_path, content_hash, compute_schema_hash()
+            )
+        if new_data is not None and set(self.CATEGORY_LOADERS) <= set(new_data):
+            logger.info(f"Loaded game data from data pack {content_hash[:12]}")
+            self._load_timings = {
+                "source": "pack",
+                "total_ms": round((time.perf_counter() - start) * 1000, 3),
+                "categories": {},
+            }
+        else:
+            logger.info("No matching data pack, loading JSON sources")
+            new_data = await self._load_all_categories()
+        
+        return GameDataCache(
+            metadata=await asyncio.to_thread(self._load_metadata),
             data=new_data,
-            last_loaded=datetime.now()
+            last_loaded=datetime.now(),
+            content_hash=content_hash,
+            generation=generation
+        )
+
+    async def _map_data_pack(self, generation: int) -> Optional[GameDataCache]:
+        """Build a generation backed by the memory-mapped data pack.
+
+        Every worker maps the same pack file read-only, so its pages are shared
+        between them, and each worker only unpickles the entries it uses.
+
+        Args:
+            generation: Generation number the cache is built for
+
+        Returns:
+            Optional[GameDataCache]: The generation, or None if there is no pack
+                matching the current sources
+        """
+        start = time.perf_counter()
+        content_hash, _ = await asyncio.to_thread(
+            compute_content_hash, self.settings.data_path, self.source_files()
         )
-        logger.info("Finished reloading data")
+        pack = await asyncio.to_thread(
+            open_data_pack, self.settings.data_pack_path, content_hash, compute_schema_hash()
+        )
+        if pack is None:
+            logger.info("No matching data pack to map, loading game data without it")
+            return None
+        
+        logger.info(f"Mapped data pack {content_hash[:12]} with {len(pack.keys())} entries")
+        self._load_timings = {
+            "source": "shared",
+            "total_ms": round((time.perf_counter() - start) * 1000, 3),
+            "categories": {},
+        }
+        return GameDataCache(
+            metadata=await asyncio.to_thread(self._load_metadata),
+            data={},
+            last_loaded=datetime.now(),
+            content_hash=content_hash,
+            generation=generation,
+            pack=pack
+        )
+
+    async def _reload_data(self) -> None:
+        """Reload all game data into a new generation.
+
+        Only one reload runs at a time. Callers arriving while a reload is in
+        flight await the same task instead of parsing the data again, and are
+        counted in reload_stats["coalesced"]. The shared task is shielded so a
+        cancelled request does not cancel the load for everyone else.
+        """
+        await asyncio.shield(self._schedule_refresh())
+
+    async def _run_reload(self) -> None:
+        """Build a new generation off the event loop and publish it.
+
+        The generation is published with a single reference swap, so concurrent
+        requests see either the old or the new data and never a mix of both.
+        """
+        logger.info("Reloading all game data")
+        generation = self._generation
+        try:
+            cache = await self._build_cache(generation)
+        except Exception:
+            self._reload_stats["failed"] += 1
+            raise
+        
+        # Publish the new generation
+        self._cache = cache
+        self._loaded_generation = generation
+        self._live_generations[id(cache)] = cache
+        self._reload_stats["completed"] += 1
+        logger.info(f"Finished reloading data, published generation {generation}")
+
+    async def compile_data_pack(self) -> DataPackManifest:
+        """Validate all data and write it as a compiled data pack.
+
+        Only the artifacts whose source files changed since the previous pack
+        are rebuilt, see api.models.game_data.compiler.
+
+        Returns:
+            DataPackManifest: Manifest of the written pack
+
+        Raises:
+            ValueError: If the data has errors
+        """
+        # The compiler builds on the manager's category loaders
+        from .compiler import compile_data
+
+        logger.info(f"Compiling data pack from {self.settings.data_path}")
+        result = await asyncio.to_thread(compile_data, self.settings)
+        if result.manifest is None:
+            raise ValueError(
+                "Cannot compile data pack: " + "; ".join(str(issue) for issue in result.errors)
+            )
+        return result.manifest
 
     async def get_stat_categories(self) -> List[str]:
         """Get available stat categories.
 
         Returns:
-            List[str]: List of available stat categories
+            List[str]: List of available stat categories, e.g. "offensive"
         """
         logger.debug("Getting stat categories")
-        try:
-            data = await self.get_data("gems/stat_boosts")
-            if not data:
-                logger.warning("No stat boost data available")
-                return []
-            return list(data.categories.keys())
-        except Exception as e:
-            logger.error(f"Error getting stat categories: {e}")
-            raise
+        return list(dict.fromkeys([*STAT_GROUPS.values(), DEFAULT_STAT_GROUP]))
 
     async def get_stat_boosts(self) -> Dict[str, dict]:
         """Get stat boost data with categories.
 
         Returns:
-            Dict[str, dict]: Stat boost data with categories
+            Dict[str, dict]: Description, category and source kinds of each
+                stat, keyed by stat name
         """
         logger.debug("Getting stat boosts")
         try:
@@ -257,7 +818,16 @@ class GameDataManager:
             if not data:
                 logger.warning("No stat boost data available")
                 return {}
-            return data.categories
+            fields = type(data).model_fields
+            return {
+                name: {
+                    "description": stat.description or (fields[name].description if name in fields else name),
+                    "category": STAT_GROUPS.get(name, DEFAULT_STAT_GROUP),
+                    "sources": [kind for kind in ("gems", "essences", "skills") if getattr(stat, kind)]
+                }
+                for name, stat in data
+                if isinstance(stat, StatCategory)
+            }
         except Exception as e:
             logger.error(f"Error getting stat boosts: {e}")
             raise
@@ -274,16 +844,35 @@ class GameDataManager:
             if not data:
                 logger.warning("No equipment set data available")
                 return {}
-            return data.sets
+            return data
         except Exception as e:
             logger.error(f"Error getting equipment sets: {e}")
             raise
 
+    async def get_synergies(self) -> Dict[str, SynergyGroup]:
+        """Get the root level synergy groups.
+
+        Returns:
+            Dict[str, SynergyGroup]: Synergy groups keyed by synergy name
+        """
+        logger.debug("Getting synergies")
+        try:
+            data = await self.get_data("synergies")
+            if not data:
+                logger.warning("No synergy data available")
+                return {}
+            return {name: group for name, group in data if group is not None}
+        except Exception as e:
+            logger.error(f"Error getting synergies: {e}")
+            raise
+
     async def get_class_essences(
             self,
             class_name: str,
             slot: Optional[str] = None,
-            skill: Optional[str] = None
+            skill: Optional[str] = None,
+            effect_type: Optional[str] = None,
+            effect_tag: Optional[str] = None
         ) -> Dict[str, EssenceData]:
         """Get essences for a specific class.
 
@@ -291,6 +880,8 @@ class GameDataManager:
             class_name: Name of the class
             slot: Optional gear slot to filter by
             skill: Optional skill name to filter by
+            effect_type: Optional effect type to filter by
+            effect_tag: Optional effect tag to filter by
 
         Returns:
             Dict[str, EssenceData]: Dictionary of essence data
@@ -300,28 +891,218 @@ class GameDataManager:
         """
         logger.debug(f"Getting essences for class: {class_name}")
         try:
-            # Check if we have the essences in cache
-            if class_name not in self._essence_cache:
-                logger.debug(f"Loading essences for class: {class_name}")
-                file_path = f"essences/{class_name.lower()}.json"
-                essences = ClassEssences.model_validate(self._load_json_file(file_path))
-                self._essence_cache[class_name] = essences
-
-            essences = self._essence_cache[class_name]
-            
-            # Filter by slot if specified
-            if slot:
-                logger.debug(f"Filtering essences by slot: {slot}")
-                essences = {k: v for k, v in essences.essences.items() if v.slot == slot}
-            else:
-                essences = essences.essences
-
-            # Filter by skill if specified
-            if skill:
-                logger.debug(f"Filtering essences by skill: {skill}")
-                essences = {k: v for k, v in essences.items() if v.skill == skill}
-
-            return essences
+            engine = await self.get_essence_engine(class_name)
+            return engine.query(
+                slot=slot,
+                skill=skill,
+                effect_type=effect_type,
+                effect_tag=effect_tag
+            )
         except Exception as e:
             logger.error(f"Error getting essences for class {class_name}: {e}")
             raise
+
+    async def get_essence_engine(self, class_name: str) -> EssenceQueryEngine:
+        """Get the essence query engine of a class.
+
+        The engine is built once per data generation.
+
+        Args:
+            class_name: Name of the class
+
+        Returns:
+            EssenceQueryEngine: Engine answering slot, skill, effect type and
+                effect tag queries
+
+        Raises:
+            ValueError: If the class is not found or essence data is invalid
+        """
+        cache = await self._pinned_cache()
+        class_key = class_name.lower()
+
+        async def build() -> Tuple[EssenceQueryEngine, float]:
+            class_dir = self.settings.data_path / "classes" / class_key
+            if not await asyncio.to_thread(class_dir.is_dir):
+                raise ValueError(f"No essences found for class {class_name}")
+            essences = await self._class_essences(cache, class_key)
+            start = time.perf_counter()
+            prebuilt = await asyncio.to_thread(
+                read_essence_indexes, self.settings.data_path, class_key
+            )
+            engine = EssenceQueryEngine(essences, prebuilt)
+            return engine, (time.perf_counter() - start) * 1000
+
+        return await self._load_entry(cache, f"essences/{class_key}/engine", build)
+
+    async def get_class_file(self, class_name: str, file_name: str) -> Dict[str, Any]:
+        """Get one of a class's plain JSON data files.
+
+        Used for the class files without a schema, such as base_skills.json
+        and constraints.json. The file is read once per data generation.
+
+        Args:
+            class_name: Name of the class
+            file_name: Name of the file in the class directory, without the
+                .json extension
+
+        Returns:
+            Dict[str, Any]: Contents of the file
+
+        Raises:
+            FileNotFoundError: If the class has no such file
+        """
+        class_key = class_name.lower()
+        path = self.settings.data_path / "classes" / class_key / f"{file_name}.json"
+
+        async def build() -> Dict[str, Any]:
+            return await asyncio.to_thread(codec.load_file, path)
+
+        return await self.get_derived(f"classes/{class_key}/{file_name}", build)
+
+    async def _class_essences(self, cache: GameDataCache, class_name: str) -> ClassEssences:
+        """Get a class's essences, loading them into the generation on first access."""
+        class_key = class_name.lower()
+        key = f"essences/{class_key}"
+        return await self._load_entry(
+            cache,
+            key,
+            lambda: self._load_category_timed(
+                key, ClassEssences, f"classes/{class_key}/essences.json"
+            )
+        )
+
+    async def get_name_index(self, kind: str) -> NameIndex:
+        """Get the name index for a kind of game data name.
+
+        The index is built once per data generation from the data it names.
+
+        Args:
+            kind: "gems", "sets", "synergies", "gems/synergies" or
+                "essences/<class>"
+
+        Returns:
+            NameIndex: Index of the canonical names of that kind
+
+        Raises:
+            ValueError: If the kind is not supported
+        """
+        return await self._name_index(await self._pinned_cache(), kind)
+
+    async def _name_index(self, cache: GameDataCache, kind: str) -> NameIndex:
+        """Get a generation's name index, building it on first access."""
+        async def build() -> Tuple[NameIndex, float]:
+            start = time.perf_counter()
+            index = NameIndex(await self._canonical_names(cache, kind))
+            logger.debug(f"Built {kind} name index with {len(index)} names")
+            return index, (time.perf_counter() - start) * 1000
+
+        return await self._load_entry(cache, f"names/{kind}", build)
+
+    async def resolve_name(self, kind: str, name: str) -> Optional[str]:
+        """Resolve a user-supplied name to its canonical key.
+
+        Args:
+            kind: Kind of name, see get_name_index()
+            name: Name in any case, punctuation or slug form
+
+        Returns:
+            Optional[str]: The canonical key, or None if the name is unknown
+        """
+        return (await self.get_name_index(kind)).resolve(name)
+
+    async def get_gem_profile(self, gem_name: str) -> Optional[GemProfile]:
+        """Get everything known about a gem in a single lookup.
+
+        Args:
+            gem_name: Name of the gem in any case, punctuation or slug form
+
+        Returns:
+            Optional[GemProfile]: Stats, synergies, pairs, conditions and effect
+                details of the gem, or None if the gem is unknown
+        """
+        cache = await self._pinned_cache()
+        gem_key = (await self._name_index(cache, "gems")).resolve(gem_name)
+        return (await self._gem_index(cache)).get(gem_key or gem_name)
+
+    async def get_gem_catalog(self) -> GemCatalog:
+        """Get the gem catalog of the pinned generation.
+
+        The catalog is built once per data generation.
+
+        Returns:
+            GemCatalog: Sorted gems with star rating and skill type filters
+        """
+        cache = await self._pinned_cache()
+
+        async def build() -> Tuple[GemCatalog, float]:
+            gems = await self._category_data(cache, "gems/data")
+            skillmap = await self._category_data(cache, "gems/skillmap")
+            names = await self._name_index(cache, "gems")
+            start = time.perf_counter()
+            catalog = GemCatalog(gems, skillmap, names)
+            logger.debug(f"Built gem catalog with {len(catalog)} gems")
+            return catalog, (time.perf_counter() - start) * 1000
+
+        return await self._load_entry(cache, "gems/catalog", build)
+
+    async def get_derived(self, key: str, build: Callable[[], Awaitable[T]]) -> T:
+        """Get an entry derived from the pinned generation's data.
+
+        Like the gem catalog, the entry is built once per data generation and
+        lives as long as the generation does. build() should read its inputs
+        through this manager, so it sees the same generation.
+
+        Args:
+            key: Key of the entry, prefixed with the name of its owner
+            build: Coroutine function building the entry
+
+        Returns:
+            The entry
+        """
+        cache = await self._pinned_cache()
+
+        async def load() -> Tuple[T, float]:
+            start = time.perf_counter()
+            value = await build()
+            return value, (time.perf_counter() - start) * 1000
+
+        return await self._load_entry(cache, key, load)
+
+    async def _gem_index(self, cache: GameDataCache) -> Dict[str, GemProfile]:
+        """Get a generation's inverted gem index, building it on first access."""
+        async def build() -> Tuple[Dict[str, GemProfile], float]:
+            gems = await self._category_data(cache, "gems/data")
+            names = await self._name_index(cache, "gems")
+            start = time.perf_counter()
+            metadata = await asyncio.to_thread(read_gem_metadata, self.settings.data_path)
+            index = build_gem_index(metadata, names, gems)
+            logger.debug(f"Built gem index with {len(index)} gems")
+            return index, (time.perf_counter() - start) * 1000
+
+        return await self._load_entry(cache, "gems/index", build)
+
+    async def _canonical_names(
+            self,
+            cache: GameDataCache,
+            kind: str
+        ) -> List[Tuple[str, str]]:
+        """Collect the (name, canonical key) pairs of a kind of name."""
+        if kind == "gems":
+            gems = await self._category_data(cache, "gems/data")
+            return [(name, name) for name in gems or {}]
+        if kind == "sets":
+            sets = await self._category_data(cache, "sets")
+            return [(name, name) for name in (sets.registry if sets else {})]
+        if kind in ("synergies", "gems/synergies"):
+            synergies = await self._category_data(cache, kind)
+            return [
+                (name, name) for name, group in (synergies or [])
+                if group is not None
+            ]
+        if kind.startswith("essences/"):
+            essences = await self._class_essences(cache, kind.split("/", 1)[1])
+            return [
+                (essence.essence_name, key)
+                for key, essence in essences.essences.items()
+            ]
+        raise ValueError(f"Unsupported name kind: {kind}")
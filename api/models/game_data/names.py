@@ -0,0 +1,88 @@
+"""
+Canonical name lookup for game data.
+
+Routes receive gem, set, essence and synergy names straight from the URL, in
+whatever case and punctuation the client used. A NameIndex maps normalized
+forms of every known name, including slug forms such as ``mothers_lament``, to
+the canonical key, so a name is resolved with a single dict lookup instead of a
+scan over all keys. The GameDataManager builds one index per kind of name and
+data generation.
+"""
+
+import re
+import unicodedata
+from typing import Dict, Iterable, Optional, Tuple
+
+_APOSTROPHES = re.compile(r"['‘’`]")
+_SEPARATORS = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a name for lookup.
+
+    Case-folds the name, strips accents and apostrophes and collapses every
+    other run of punctuation or whitespace into a single underscore, so
+    "Mother's Lament", "mothers-lament" and "MOTHERS_LAMENT" all normalize to
+    "mothers_lament".
+
+    Args:
+        name: Name to normalize
+
+    Returns:
+        str: The normalized name
+    """
+    name = unicodedata.normalize("NFKD", name.casefold())
+    name = "".join(c for c in name if not unicodedata.combining(c))
+    name = _APOSTROPHES.sub("", name)
+    return _SEPARATORS.sub("_", name).strip("_")
+
+
+class NameIndex:
+    """Maps normalized names and aliases to canonical keys."""
+
+    __slots__ = ("_keys",)
+
+    def __init__(self, names: Iterable[Tuple[str, str]] = ()) -> None:
+        """Initialize the name index.
+
+        Args:
+            names: (name, canonical key) pairs; a key is always indexed under
+                its own name as well
+        """
+        self._keys: Dict[str, str] = {}
+        names = list(names)
+        # Index every key before any alias so aliases cannot shadow keys
+        for _, key in names:
+            self.add(key, key)
+        for name, key in names:
+            self.add(name, key)
+
+    def add(self, name: str, key: str) -> None:
+        """Index a name under a canonical key.
+
+        The first key registered for a normalized name wins.
+
+        Args:
+            name: Name or alias to index
+            key: Canonical key the name resolves to
+        """
+        self._keys.setdefault(normalize_name(name), key)
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Resolve a name to its canonical key.
+
+        Args:
+            name: Name in any case, punctuation or slug form
+
+        Returns:
+            Optional[str]: The canonical key, or None if the name is unknown
+        """
+        return self._keys.get(normalize_name(name))
+
+    def __contains__(self, name: str) -> bool:
+        """Check if a name resolves to a key."""
+        return self.resolve(name) is not None
+
+    def __len__(self) -> int:
+        """Number of indexed names."""
+        return len(self._keys)
@@ -0,0 +1,359 @@
+"""
+Compiled game data pack.
+
+A data pack is a single binary snapshot of every validated game data category
+and derived index, written next to a JSON manifest that records the content hash of the source
+files it was compiled from. The GameDataManager loads the pack directly when the
+hash still matches the files in the indexed data directory, and only falls back
+to parsing and validating the JSON sources when it does not.
+
+The pack holds the model objects themselves, so loading it runs no validators:
+the data was validated when the pack was compiled and is trusted from then on.
+To keep that safe, the manifest also records a hash of the schema and index
+builder modules the pack was compiled with, and a pack built by different code
+is ignored.
+"""
+
+import hashlib
+import logging
+import mmap
+import pickle
+import struct
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from api.core import codec
+
+from . import schemas
+from .schemas import GameDataMetadata
+
+logger = logging.getLogger(__name__)
+
+PACK_FORMAT_VERSION = 3
+PACK_FILE = "game_data.pack"
+MANIFEST_FILE = "manifest.json"
+PACK_MAGIC = b"DIBOPACK"
+
+# Modules whose code decides what the pickled categories and indexes hold
+PACK_BUILDER_MODULES = (
+    "compiler.py",
+    "essence_index.py",
+    "gem_catalog.py",
+    "gem_index.py",
+    "gem_registry.py",
+    "manager.py",
+    "names.py",
+)
+
+# Magic, format version and table of contents length
+_HEADER = struct.Struct("<8sIQ")
+
+
+class DataPackManifest(BaseModel):
+    """Manifest describing a compiled data pack."""
+
+    format_version: int = Field(description="Data pack format version")
+    content_hash: str = Field(description="Combined hash of all source files")
+    schema_hash: str = Field(description="Hash of the schema modules the pack was validated with")
+    files: Dict[str, str] = Field(description="Per-file SHA-256 hashes keyed by relative path")
+    categories: List[str] = Field(description="Categories stored in the pack")
+    metadata: GameDataMetadata = Field(description="Metadata of the compiled data")
+    created_at: datetime = Field(description="Compile timestamp")
+
+
+def hash_file(path: Path) -> str:
+    """Get the SHA-256 hex digest of a file's contents.
+
+    Args:
+        path: File to hash
+
+    Returns:
+        str: Hex digest of the file contents
+    """
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def compute_content_hash(
+        data_path: Path,
+        rel_paths: Iterable[str]
+    ) -> Tuple[str, Dict[str, str]]:
+    """Hash a set of source files into a single content hash.
+
+    Args:
+        data_path: Root of the indexed data directory
+        rel_paths: Source file paths relative to data_path
+
+    Returns:
+        Tuple of the combined content hash and the per-file hashes
+
+    Raises:
+        FileNotFoundError: If a source file does not exist
+    """
+    files = {rel: hash_file(data_path / rel) for rel in sorted(set(rel_paths))}
+    combined = hashlib.sha256()
+    for rel, file_hash in files.items():
+        combined.update(f"{rel}\0{file_hash}\n".encode())
+    return combined.hexdigest(), files
+
+
+@lru_cache(maxsize=1)
+def compute_schema_hash() -> str:
+    """Hash the source of the game data schema and index builder modules.
+
+    Any change to a model, including its validators, changes the hash, so a
+    pack validated by older schema code is never trusted. The pack also holds
+    the index objects built from the models, so the modules that build them
+    are hashed too: a pack pickled by older index code is neither loaded nor
+    reused by an incremental compile. The sources cannot change once
+    imported, so the hash is computed once per process.
+
+    Returns:
+        str: Hex digest of the schema and builder sources
+    """
+    package_dir = Path(__file__).parent
+    schemas_dir = Path(schemas.__file__).parent
+    paths = sorted(schemas_dir.glob("*.py")) + [package_dir / name for name in PACK_BUILDER_MODULES]
+    combined = hashlib.sha256()
+    for path in paths:
+        combined.update(f"{path.relative_to(package_dir).as_posix()}\0{hash_file(path)}\n".encode())
+    return combined.hexdigest()
+
+
+def write_data_pack(
+        pack_dir: Path,
+        categories: Dict[str, Any],
+        manifest: DataPackManifest,
+        segments: Optional[Iterable[Iterable[str]]] = None
+    ) -> None:
+    """Write a compiled data pack and its manifest.
+
+    Entries are pickled in segments behind a table of contents, so a reader
+    can map the file and unpickle one segment without touching the others.
+    Entries that share objects should go in the same segment, otherwise each
+    segment gets its own copy of them. Entries not listed in any segment are
+    written as a segment of their own.
+
+    The pack is written first and the manifest last, both via a temporary file
+    and rename, so a reader never sees a manifest for a half-written pack. The
+    rename also leaves packs that are still mapped by a reader untouched.
+
+    Args:
+        pack_dir: Directory to write the pack into
+        categories: Validated data keyed by category
+        manifest: Manifest describing the pack
+        segments: Groups of category keys to store together
+    """
+    pack_dir.mkdir(parents=True, exist_ok=True)
+
+    groups = [[key for key in group if key in categories] for group in segments or ()]
+    grouped = {key for group in groups for key in group}
+    groups = [group for group in groups if group]
+    groups += [[key] for key in sorted(categories) if key not in grouped]
+
+    blobs = [
+        pickle.dumps({key: categories[key] for key in group}, protocol=pickle.HIGHEST_PROTOCOL)
+        for group in groups
+    ]
+    toc = {"content_hash": manifest.content_hash, "segments": []}
+    offset = 0
+    for group, blob in zip(groups, blobs):
+        toc["segments"].append({"keys": group, "offset": offset, "length": len(blob)})
+        offset += len(blob)
+    toc_bytes = codec.dumps(toc)
+
+    pack_tmp = pack_dir / f"{PACK_FILE}.tmp"
+    with pack_tmp.open("wb") as f:
+        f.write(_HEADER.pack(PACK_MAGIC, manifest.format_version, len(toc_bytes)))
+        f.write(toc_bytes)
+        for blob in blobs:
+            f.write(blob)
+    pack_tmp.replace(pack_dir / PACK_FILE)
+
+    manifest_tmp = pack_dir / f"{MANIFEST_FILE}.tmp"
+    manifest_tmp.write_text(manifest.model_dump_json(indent=2))
+    manifest_tmp.replace(pack_dir / MANIFEST_FILE)
+    logger.info(f"Wrote data pack {manifest.content_hash[:12]} to {pack_dir} in {len(blobs)} segments")
+
+
+class DataPackReader:
+    """Read-only memory map of a data pack.
+
+    The file is mapped with ``mmap`` instead of read, so every process that
+    opens the same pack shares one copy of its bytes in the page cache.
+    Segments are unpickled on request into the process's own heap: the
+    objects themselves are never shared, since CPython writes reference
+    counts into every object it touches. What a worker saves is the entries
+    it never asks for; a worker that uses every entry ends up holding about
+    as much private memory as one that loaded the whole pack.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Map a data pack file.
+
+        Args:
+            path: Path to the pack file
+
+        Raises:
+            OSError: If the file cannot be opened or mapped
+            ValueError: If the file is not a data pack of this format
+        """
+        with path.open("rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, toc_length = _HEADER.unpack_from(self._map)
+            if magic != PACK_MAGIC or version != PACK_FORMAT_VERSION:
+                raise ValueError(f"{path} is not a format {PACK_FORMAT_VERSION} data pack")
+            toc_end = _HEADER.size + toc_length
+            toc = codec.loads(self._map[_HEADER.size:toc_end])
+        except Exception:
+            self._map.close()
+            raise
+
+        self.content_hash: str = toc["content_hash"]
+        self._spans: List[Tuple[int, int]] = []
+        self._segments: Dict[str, Tuple[int, int]] = {}
+        for segment in toc["segments"]:
+            start = toc_end + segment["offset"]
+            span = (start, start + segment["length"])
+            self._spans.append(span)
+            for key in segment["keys"]:
+                self._segments[key] = span
+
+    def __contains__(self, key: str) -> bool:
+        """Check if the pack has an entry."""
+        return key in self._segments
+
+    def keys(self) -> List[str]:
+        """Get the keys of every entry in the pack."""
+        return list(self._segments)
+
+    def load(self, key: str) -> Dict[str, Any]:
+        """Unpickle the segment holding an entry.
+
+        Args:
+            key: Entry key
+
+        Returns:
+            Dict[str, Any]: The entry and the other entries stored with it
+
+        Raises:
+            KeyError: If the pack has no such entry
+        """
+        return self._load_span(*self._segments[key])
+
+    def load_all(self) -> Dict[str, Any]:
+        """Unpickle every segment of the pack."""
+        entries: Dict[str, Any] = {}
+        for span in self._spans:
+            entries.update(self._load_span(*span))
+        return entries
+
+    def _load_span(self, start: int, end: int) -> Dict[str, Any]:
+        """Unpickle one segment straight from the mapped file."""
+        with memoryview(self._map) as view, view[start:end] as blob:
+            return pickle.loads(blob)
+
+    def close(self) -> None:
+        """Unmap the pack."""
+        self._map.close()
+
+
+def load_manifest(pack_dir: Path) -> Optional[DataPackManifest]:
+    """Load a data pack manifest if one exists.
+
+    Args:
+        pack_dir: Directory containing the pack
+
+    Returns:
+        Optional[DataPackManifest]: The manifest, or None if missing or unreadable
+    """
+    manifest_path = pack_dir / MANIFEST_FILE
+    if not manifest_path.is_file():
+        return None
+    try:
+        return DataPackManifest.model_validate(codec.load_file(manifest_path))
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable data pack manifest {manifest_path}: {e}")
+        return None
+
+
+def open_data_pack(
+        pack_dir: Path,
+        content_hash: str,
+        schema_hash: str
+    ) -> Optional[DataPackReader]:
+    """Map a data pack if it matches the sources and schemas.
+
+    Args:
+        pack_dir: Directory containing the pack
+        content_hash: Content hash of the current source files
+        schema_hash: Hash of the current schema modules
+
+    Returns:
+        Optional[DataPackReader]: The mapped pack, or None if there is no pack
+            or it was compiled from different sources or schemas
+    """
+    manifest = load_manifest(pack_dir)
+    if manifest is None:
+        logger.debug(f"No data pack manifest in {pack_dir}")
+        return None
+    if manifest.format_version != PACK_FORMAT_VERSION:
+        logger.info(
+            f"Data pack format {manifest.format_version} does not match "
+            f"expected {PACK_FORMAT_VERSION}"
+        )
+        return None
+    if manifest.content_hash != content_hash:
+        logger.info("Data pack is stale, source files have changed")
+        return None
+    if manifest.schema_hash != schema_hash:
+        logger.info("Data pack was compiled with different schemas")
+        return None
+
+    try:
+        reader = DataPackReader(pack_dir / PACK_FILE)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Failed to read data pack in {pack_dir}: {e}")
+        return None
+
+    if reader.content_hash != content_hash:
+        logger.warning("Data pack does not match its manifest")
+        reader.close()
+        return None
+    return reader
+
+
+def load_data_pack(
+        pack_dir: Path,
+        content_hash: str,
+        schema_hash: str
+    ) -> Optional[Dict[str, Any]]:
+    """Load every entry of a data pack if it matches the sources and schemas.
+
+    Args:
+        pack_dir: Directory containing the pack
+        content_hash: Content hash of the current source files
+        schema_hash: Hash of the current schema modules
+
+    Returns:
+        Optional[Dict[str, Any]]: Validated data keyed by category, or None if
+            there is no pack or it was compiled from different sources or schemas
+    """
+    reader = open_data_pack(pack_dir, content_hash, schema_hash)
+    if reader is None:
+        return None
+    try:
+        return reader.load_all()
+    except Exception as e:
+        logger.warning(f"Failed to read data pack in {pack_dir}: {e}")
+        return None
+    finally:
+        reader.close()
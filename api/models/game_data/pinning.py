@@ -0,0 +1,78 @@
+"""
+Per-request pinning of game data generations.
+
+Every reload publishes a new immutable GameDataCache generation. A request pins
+the generation it sees first and keeps reading from it for its whole lifetime,
+even if a reload swaps in a newer generation halfway through, so a single
+response is always built from one consistent view of the data. Old generations
+are released as soon as the last request pinning them finishes.
+"""
+
+import contextlib
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .schemas import GameDataCache
+
+
+class GenerationPin:
+    """Holds the generations pinned by the current request, one per manager.
+
+    A request can read through more than one GameDataManager, each with its
+    own generations, so the pins are keyed by the id of the manager.
+    """
+
+    __slots__ = ("caches",)
+
+    def __init__(self) -> None:
+        self.caches: Dict[int, GameDataCache] = {}
+
+    def get(self, manager: object) -> Optional[GameDataCache]:
+        """Get the generation pinned for a manager, if any."""
+        return self.caches.get(id(manager))
+
+    def set(self, manager: object, cache: GameDataCache) -> None:
+        """Pin a manager's generation for the rest of the request."""
+        self.caches[id(manager)] = cache
+
+
+_current_pin: ContextVar[Optional[GenerationPin]] = ContextVar(
+    "game_data_generation_pin", default=None
+)
+
+
+def current_pin() -> Optional[GenerationPin]:
+    """Get the pin of the current request, if any."""
+    return _current_pin.get()
+
+
+@contextlib.contextmanager
+def pinned_generation() -> Iterator[GenerationPin]:
+    """Pin one data generation for the duration of the block.
+
+    Each manager's generation is pinned lazily by its first lookup inside the
+    block, and all of them are released when the block exits.
+    """
+    pin = GenerationPin()
+    token = _current_pin.set(pin)
+    try:
+        yield pin
+    finally:
+        _current_pin.reset(token)
+        pin.caches.clear()
+
+
+class DataGenerationMiddleware:
+    """ASGI middleware that pins one data generation per HTTP request."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with pinned_generation():
+            await self.app(scope, receive, send)
@@ -12,7 +12,8 @@ from .gems import (
     GemEffect,
     GemRankStats,
     GemStatValue,
-    GemCondition
+    GemCondition,
+    GemProfile
 )
 from .equipment import (
     SetMetadata,
@@ -45,6 +46,7 @@ __all__ = [
     "GemRankStats",
     "GemStatValue",
     "GemCondition",
+    "GemProfile",
     "SetMetadata",
     "SetBonuses",
     "SetBonus",
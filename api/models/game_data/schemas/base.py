@@ -36,6 +36,13 @@ class GameDataCache(BaseModel):
     metadata: GameDataMetadata = Field(description="Cache metadata")
     data: Dict[str, Any] = Field(description="Cached data by category")
     last_loaded: Optional[datetime] = Field(None, description="Last load timestamp")
+    content_hash: Optional[str] = Field(None, description="Content hash of the source files")
+    generation: int = Field(0, description="Data generation this cache was built for")
+    pack: Optional[Any] = Field(
+        None,
+        exclude=True,
+        description="Mapped data pack that entries are loaded from on first access"
+    )
     
     model_config = ConfigDict(
         frozen=True,
@@ -48,7 +55,9 @@ class GameDataCache(BaseModel):
                     "data_structure_version": "1.0"
                 },
                 "data": {},
-                "last_loaded": None
+                "last_loaded": None,
+                "content_hash": None,
+                "generation": 0
             }]
         }
     )
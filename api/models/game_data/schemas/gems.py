@@ -36,6 +36,16 @@ class GemEffect(BaseModel):
     cooldown: Optional[float] = Field(default=None, description="Cooldown in seconds")
     trigger: Optional[str] = Field(default=None, description="Trigger for trigger-type effects")
 
+    @field_validator('conditions', mode='before')
+    def expand_condition_names(cls, v: Any) -> Any:
+        """Expand bare condition names (e.g. "on_hit") used by the per-gem files."""
+        if not isinstance(v, list):
+            return v
+        return [
+            {"type": c, "description": c.replace("_", " ")} if isinstance(c, str) else c
+            for c in v
+        ]
+
     model_config = ConfigDict(
         str_to_lower=False,
         str_strip_whitespace=True,
@@ -111,14 +121,22 @@ class Gem(BaseModel):
     name: str = Field(description="Name of the gem")  
     ranks: Dict[str, GemRank] = Field(description="Effects at each rank")
     max_rank: int = Field(description="Maximum rank for this gem")
-    magic_find: str = Field(description="Magic find value")
+    magic_find: Optional[str] = Field(default=None, description="Magic find value")
     max_effect: Optional[str] = Field(default=None, description="Maximum effect description")
     base_effect: str = Field(default="", description="Base effect from rank 1")
 
-    def __init__(self, **data):
-        super().__init__(**data)
+    def model_post_init(self, __context: Any) -> None:
+        """Derive base_effect from the first effect at rank 1."""
         if "1" in self.ranks and self.ranks["1"].effects:
-            self.base_effect = self.ranks["1"].effects[0].description
+            # Set directly, assignment would run the model's validators again
+            self.__dict__["base_effect"] = self.ranks["1"].effects[0].description
+
+    @model_validator(mode='before')
+    def default_max_rank(cls, values: Any) -> Any:
+        """Derive max_rank from the highest rank when the gem file omits it."""
+        if isinstance(values, dict) and values.get("max_rank") is None and values.get("ranks"):
+            values = {**values, "max_rank": max(int(rank) for rank in values["ranks"])}
+        return values
 
     @field_validator('stars')
     def validate_stars(cls, v: Union[str, int]) -> str:
@@ -197,6 +215,33 @@ class GemSkillMap(BaseModel):
     )
 
 
+class GemProfile(BaseModel):
+    """Everything known about a single gem, gathered from the gem metadata files."""
+
+    name: str = Field(description="Canonical name of the gem")
+    gem: Optional[Gem] = Field(default=None, description="Gem definition, if the gem is in the registry")
+    stats: Dict[str, Dict[str, Any]] = Field(
+        default_factory=dict,
+        description="Stat boost entries keyed by stat type"
+    )
+    synergies: Dict[str, Dict[str, Any]] = Field(
+        default_factory=dict,
+        description="Synergy categories the gem belongs to"
+    )
+    pairs: Dict[str, Dict[str, Any]] = Field(
+        default_factory=dict,
+        description="Pair synergies keyed by partner gem"
+    )
+    conditions: List[Dict[str, Any]] = Field(
+        default_factory=list,
+        description="Conditions parsed from the gem's effects"
+    )
+    effect_details: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Effect details keyed by effect detail category"
+    )
+
+
 class GemConfig(GameDataModel):
     """Configuration for a gem in a build."""
     
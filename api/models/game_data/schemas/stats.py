@@ -159,6 +159,10 @@ class GameStats(BaseModel):
         default_factory=StatCategory,
         description="Sources affecting critical hit chance"
     )
+    critical_hit_damage: StatCategory = Field(
+        default_factory=StatCategory,
+        description="Sources affecting critical hit damage"
+    )
     damage_increase: StatCategory = Field(
         default_factory=StatCategory,
         description="Sources affecting damage increase"
@@ -171,6 +175,10 @@ class GameStats(BaseModel):
         default_factory=StatCategory,
         description="Sources affecting movement speed"
     )
+    damage_reduction: StatCategory = Field(
+        default_factory=StatCategory,
+        description="Sources affecting damage reduction"
+    )
     life: StatCategory = Field(
         default_factory=StatCategory,
         description="Sources affecting life/health"
@@ -182,10 +190,25 @@ class GameStats(BaseModel):
         json_schema_extra={
             "examples": [{
                 "critical_hit_chance": {},
+                "critical_hit_damage": {},
                 "damage_increase": {},
+                "damage_reduction": {},
                 "attack_speed": {},
                 "movement_speed": {},
                 "life": {}
             }]
         }
     )
+
+
+# Group of each GameStats stat, as the stats endpoints list them
+STAT_GROUPS: Dict[str, str] = {
+    "critical_hit_chance": "offensive",
+    "critical_hit_damage": "offensive",
+    "damage_increase": "offensive",
+    "attack_speed": "offensive",
+    "damage_reduction": "defensive",
+    "life": "defensive",
+    "movement_speed": "utility",
+}
+DEFAULT_STAT_GROUP = "utility"
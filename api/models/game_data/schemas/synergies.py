@@ -128,6 +128,8 @@ class GameSynergies(BaseModel):
     critical_hit: Optional[SynergyGroup] = Field(None, description="Critical hit synergies")
     movement_speed: Optional[SynergyGroup] = Field(None, description="Movement speed synergies")
     damage_boost: Optional[SynergyGroup] = Field(None, description="Damage boost synergies")
+    control: Optional[SynergyGroup] = Field(None, description="Crowd control synergies")
+    survival: Optional[SynergyGroup] = Field(None, description="Survival synergies")
     
     model_config = ConfigDict(
         json_schema_extra={
@@ -146,7 +148,9 @@ class GameSynergies(BaseModel):
                     }
                 },
                 "movement_speed": None,
-                "damage_boost": None
+                "damage_boost": None,
+                "control": None,
+                "survival": None
             }]
         }
     )
@@ -0,0 +1,128 @@
+"""
+Background change detection for the indexed game data.
+
+The watcher runs as a background task next to the application and flags the
+GameDataManager for reload when ``metadata.json`` reports a newer
+``last_updated`` timestamp. It uses filesystem notifications via ``watchfiles``
+(inotify on Linux) when available and falls back to polling the metadata file's
+modification time otherwise, so request handlers never touch the disk to decide
+whether data is stale.
+"""
+
+import asyncio
+import contextlib
+import logging
+from typing import TYPE_CHECKING, Optional
+
+try:
+    import watchfiles
+except ImportError:  # pragma: no cover - depends on installed extras
+    watchfiles = None
+
+if TYPE_CHECKING:
+    from .manager import GameDataManager
+
+logger = logging.getLogger(__name__)
+
+
+class DataWatcher:
+    """Watches the indexed data directory and bumps the manager's generation."""
+
+    # Seconds to wait for the watch loop to exit before cancelling it
+    STOP_TIMEOUT = 2.0
+
+    def __init__(
+            self,
+            manager: "GameDataManager",
+            poll_interval: float = 2.0,
+            use_notify: bool = True
+        ) -> None:
+        """Initialize the data watcher.
+
+        Args:
+            manager: Manager to flag for reload when data changes
+            poll_interval: Seconds between checks when polling metadata.json
+            use_notify: Use filesystem notifications when watchfiles is installed
+        """
+        self.manager = manager
+        self.poll_interval = poll_interval
+        self.use_notify = use_notify and watchfiles is not None
+        self._task: Optional[asyncio.Task] = None
+        self._stop_event: Optional[asyncio.Event] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the watcher task is active."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start watching in a background task on the running event loop."""
+        if self.running:
+            return
+        self._stop_event = asyncio.Event()
+        runner = self._watch_notify if self.use_notify else self._watch_poll
+        self._task = asyncio.create_task(runner(), name="game-data-watcher")
+        logger.info(
+            f"Watching {self.manager.settings.data_path} for data changes "
+            f"({'inotify' if self.use_notify else 'mtime polling'})"
+        )
+
+    async def stop(self) -> None:
+        """Stop the background task and wait for it to finish."""
+        if self._task is None:
+            return
+        self._stop_event.set()
+        # Let the watch loop see the stop event and return on its own, so the
+        # watchfiles worker thread has exited before the task is gone
+        _, pending = await asyncio.wait({self._task}, timeout=self.STOP_TIMEOUT)
+        if pending:
+            self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        logger.info("Stopped game data watcher")
+
+    async def check(self) -> bool:
+        """Check metadata.json and flag the manager if the data has changed.
+
+        Returns:
+            bool: True if the manager was flagged for reload
+        """
+        try:
+            metadata = await asyncio.to_thread(self.manager._load_metadata)
+        except Exception as e:
+            logger.warning(f"Error reading metadata during data watch: {e}")
+            return False
+
+        loaded = self.manager._cache.metadata
+        if metadata.last_updated > loaded.last_updated:
+            logger.info(
+                f"Metadata changed ({loaded.last_updated} -> {metadata.last_updated}), "
+                "flagging data for reload"
+            )
+            self.manager.mark_stale()
+            return True
+        return False
+
+    async def _watch_notify(self) -> None:
+        """Wait for filesystem notifications under the data directory."""
+        async for _ in watchfiles.awatch(
+            self.manager.settings.data_path,
+            stop_event=self._stop_event
+        ):
+            await self.check()
+
+    async def _watch_poll(self) -> None:
+        """Poll the modification time of metadata.json."""
+        metadata_path = self.manager.settings.data_path / "metadata.json"
+        last_mtime = None
+        while not self._stop_event.is_set():
+            try:
+                mtime = metadata_path.stat().st_mtime_ns
+            except FileNotFoundError:
+                mtime = None
+            if last_mtime is not None and mtime != last_mtime:
+                await self.check()
+            last_mtime = mtime
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._stop_event.wait(), self.poll_interval)
@@ -27,4 +27,18 @@ router.include_router(synergies_router)
 router.include_router(modes_router)
 router.include_router(builds_router)
 
-__all__ = ["router"]
+# Endpoints whose response depends only on the data generation and query
+# parameters, relative to the game router's prefix
+CACHED_ROUTES = [
+    "/gems/",
+    "/gems/stats",
+    "/gems/synergies",
+    "/gems/skills",
+    "/sets",
+    "/constraints",
+    "/stats",
+    "/synergies",
+    "/modes",
+]
+
+__all__ = ["router", "CACHED_ROUTES"]
@@ -1,11 +1,11 @@
 """API routes for class-related operations."""
 
-import json
 from typing import Annotated, List
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel, Field
 import logging
 
+from api.core import codec
 from api.models.game_data.manager import GameDataManager
 from api.models.game_data.schemas.classes import ClassInfo, CharacterClass
 
@@ -60,8 +60,7 @@ async def get_class_details(
             )
             
         # Load class data from JSON files
-        with open(class_dir / "base_skills.json") as f:
-            skills_data = json.load(f)
+        skills_data = codec.load_file(class_dir / "base_skills.json")
             
         # Create class info
         class_data = {
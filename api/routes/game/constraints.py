@@ -41,8 +41,10 @@ async def list_constraints(
                 detail="Constraints data not found"
             )
             
-        return GameConstraints(constraints=constraints)
+        return constraints
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing constraints: {e}")
         raise HTTPException(
@@ -115,15 +115,19 @@ async def list_class_essences(
     data_manager: Annotated[GameDataManager, Depends(get_data_manager)],
     slot: Optional[str] = Query(None, description="Filter by gear slot"),
     skill: Optional[str] = Query(None, description="Filter by modified skill"),
+    effect_type: Optional[str] = Query(None, description="Filter by effect type"),
+    effect_tag: Optional[str] = Query(None, description="Filter by effect tag"),
     page: int = Query(1, gt=0, description="Page number"),
     per_page: int = Query(20, gt=0, le=100, description="Items per page")
 ) -> EssenceListResponse:
     """List available essences for a specific class."""
     try:
-        essences_data = data_manager.get_class_essences(
+        essences_data = await data_manager.get_class_essences(
             class_name=class_name,
             slot=slot,
-            skill=skill
+            skill=skill,
+            effect_type=effect_type,
+            effect_tag=effect_tag
         )
         
         # Calculate pagination
@@ -2,14 +2,13 @@
 API routes for gem-related operations.
 """
 
-import json
 import logging
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 
 from api.models.game_data.manager import GameDataManager
 from api.models.game_data.schemas.gems import (
-    Gem, GemSkillMap
+    Gem, GemProfile, GemSkillMap
 )
 from api.core.config import settings
 
@@ -34,22 +33,6 @@ def transform_gem_data(gem_dict: dict) -> dict:
     }
 
 
-def get_gem_from_progression(gem_name: str, progression_data: dict) -> Optional[dict]:
-    """Get gem data from progression data."""
-    if gem_name not in progression_data:
-        return None
-    
-    prog = progression_data[gem_name]
-    return {
-        "Stars": prog["stars"],
-        "Name": gem_name,
-        "ranks": prog["ranks"],
-        "max_rank": prog["max_rank"],
-        "magic_find": prog["magic_find"],
-        "max_effect": prog["max_effect"]
-    }
-
-
 def convert_stats_to_pascal_case(stats: dict) -> dict:
     """Convert snake_case stat keys to PascalCase."""
     result = {}
@@ -108,13 +91,27 @@ async def list_gems(
         le=5,
         description="Filter gems by star rating"
     ),
+    offset: int = Query(
+        0,
+        ge=0,
+        description="Number of matching gems to skip"
+    ),
+    limit: Optional[int] = Query(
+        None,
+        ge=1,
+        description="Maximum number of gems to return"
+    ),
     data_manager: GameDataManager = Depends(get_data_manager)
 ) -> List[Gem]:
     """List all gems, optionally filtered by skill type and stars.
 
+    Gems are sorted by star rating and name.
+
     Args:
         skill_type: Optional skill type to filter by
         stars: Optional star rating to filter by
+        offset: Number of matching gems to skip
+        limit: Optional maximum number of gems to return
         data_manager: Game data manager instance
 
     Returns:
@@ -122,50 +119,8 @@ async def list_gems(
     """
     try:
         logger.info(f"Getting gem data with filters - skill_type: {skill_type}, stars: {stars}")
-        
-        # Load gems data
-        gems_file = data_manager.data_dir / "gems" / "gems.json"
-        if not gems_file.exists():
-            raise FileNotFoundError(f"Gems data file not found: {gems_file}")
-            
-        with open(gems_file) as f:
-            progression_data = json.load(f)
-            
-        # Load skill mapping
-        skillmap_file = data_manager.data_dir / "gems" / "gem_skillmap.json"
-        if not skillmap_file.exists():
-            raise FileNotFoundError(f"Gem skill mapping file not found: {skillmap_file}")
-            
-        with open(skillmap_file) as f:
-            skillmap_data = json.load(f)
-            
-        # Collect all gems
-        all_gems = []
-        skill_types = skillmap_data.get("gems_by_skill", {})
-        if skill_type:
-            skill_type = skill_type.lower().replace(" ", "_")
-            # Only include gems from the specified skill type
-            for skill_name, skill_gems in skill_types.items():
-                if skill_type in skill_name.lower():
-                    for gem_name in skill_gems:
-                        if gem_name in progression_data:
-                            all_gems.append(get_gem_from_progression(gem_name, progression_data))
-        else:
-            # Include all gems
-            for skill_gems in skill_types.values():
-                for gem_name in skill_gems:
-                    if gem_name in progression_data:
-                        all_gems.append(get_gem_from_progression(gem_name, progression_data))
-        
-        # Apply star filter if specified
-        if stars:
-            all_gems = [
-                gem for gem in all_gems 
-                if gem and str(stars) == gem["Stars"]
-            ]
-        
-        # Convert to Gem models
-        return [Gem.model_validate(gem) for gem in all_gems if gem]
+        catalog = await data_manager.get_gem_catalog()
+        return catalog.query(skill_type=skill_type, stars=stars, offset=offset, limit=limit)
         
     except Exception as e:
         logger.error(f"Error getting gems: {e}")
@@ -190,15 +145,8 @@ async def list_gem_stats(
     try:
         logger.info("Getting all gem stat boosts")
         
-        # Load gem stats data
-        stats_file = data_manager.data_dir / "gems" / "stat_boosts.json"
-        if not stats_file.exists():
-            raise FileNotFoundError(f"Gem stats file not found: {stats_file}")
-            
-        with open(stats_file) as f:
-            stats_data = json.load(f)
-            
-        return convert_stats_to_pascal_case(stats_data)
+        stats_data = await data_manager.get_data("gems/stat_boosts")
+        return convert_stats_to_pascal_case(stats_data.model_dump())
             
     except Exception as e:
         logger.error(f"Error getting gem stats: {e}")
@@ -223,15 +171,8 @@ async def list_gem_synergies(
     try:
         logger.info("Getting all gem synergies")
         
-        # Load gem synergies data
-        synergies_file = data_manager.data_dir / "gems" / "synergies.json"
-        if not synergies_file.exists():
-            raise FileNotFoundError(f"Gem synergies file not found: {synergies_file}")
-            
-        with open(synergies_file) as f:
-            synergies_data = json.load(f)
-            
-        return convert_synergies_to_pascal_case(synergies_data)
+        synergies_data = await data_manager.get_data("gems/synergies")
+        return convert_synergies_to_pascal_case(synergies_data.model_dump(exclude_none=True))
             
     except Exception as e:
         logger.error(f"Error getting gem synergies: {e}")
@@ -256,15 +197,7 @@ async def list_gem_skills(
     try:
         logger.info("Getting all gem skill types")
         
-        # Load skill mapping
-        skillmap_file = data_manager.data_dir / "gems" / "gem_skillmap.json"
-        if not skillmap_file.exists():
-            raise FileNotFoundError(f"Gem skill mapping file not found: {skillmap_file}")
-            
-        with open(skillmap_file) as f:
-            skillmap_data = json.load(f)
-            
-        return GemSkillMap.model_validate(skillmap_data)
+        return await data_manager.get_data("gems/skillmap")
         
     except Exception as e:
         logger.error(f"Error getting gem skill types: {e}")
@@ -294,32 +227,11 @@ async def get_gem(
     try:
         logger.info(f"Getting gem data for: {gem_name}")
         
-        # Load gems data
-        gems_file = data_manager.data_dir / "gems" / "gems.json"
-        if not gems_file.is_file():
-            raise FileNotFoundError(f"Gems data file not found: {gems_file}")
-            
-        with gems_file.open() as f:
-            progression_data = json.load(f)
-            
-        # Load skill mapping
-        skillmap_file = data_manager.data_dir / "gems" / "gem_skillmap.json"
-        if not skillmap_file.is_file():
-            raise FileNotFoundError(f"Gem skill mapping file not found: {skillmap_file}")
-            
-        with skillmap_file.open() as f:
-            skillmap_data = json.load(f)
-            
-        # Search for gem by name
-        # Case-insensitive lookup
-        actual_key = next(
-            (k for k in progression_data.keys() if k.lower() == gem_name.lower()),
-            None
-        )
+        # Resolve the gem name regardless of case, punctuation or slug form
+        actual_key = await data_manager.resolve_name("gems", gem_name)
         if actual_key:
-            gem_data = get_gem_from_progression(actual_key, progression_data)
-            if gem_data:
-                return Gem.model_validate(gem_data)
+            gems = await data_manager.get_data("gems/data")
+            return gems[actual_key]
         
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -356,28 +268,16 @@ async def get_gem_stats(
     try:
         logger.info(f"Getting stats for gem: {gem_name}")
         
-        # Load gem stats data
-        stats_file = data_manager.data_dir / "gems" / "stat_boosts.json"
-        if not stats_file.exists():
-            raise FileNotFoundError(f"Gem stats file not found: {stats_file}")
-            
-        with open(stats_file) as f:
-            stats_data = json.load(f)
-            
-        # Find stats for the gem
+        # Look up the gem's stat boost entries in the inverted gem index
+        profile = await data_manager.get_gem_profile(gem_name)
         gem_stats = {}
-        for stat_type, stat_data in stats_data.items():
-            if not stat_data.get("gems"):
-                continue
+        for stat_type, gem in (profile.stats if profile else {}).items():
+            # Use base_values if available, otherwise use rank_10_values
+            values = gem.get("base_values", [])
+            if not values and "rank_10_values" in gem:
+                values = gem["rank_10_values"]
                 
-            for gem in stat_data["gems"]:
-                if gem["name"].lower() == gem_name.lower():
-                    # Use base_values if available, otherwise use rank_10_values
-                    values = gem.get("base_values", [])
-                    if not values and "rank_10_values" in gem:
-                        values = gem["rank_10_values"]
-                        
-                    gem_stats[stat_type] = values
+            gem_stats[stat_type] = values
                     
         if not gem_stats:
             raise HTTPException(
@@ -417,22 +317,9 @@ async def get_gem_synergies(
     try:
         logger.info(f"Getting synergies for gem: {gem_name}")
         
-        # Load gem synergies data
-        synergies_file = data_manager.data_dir / "gems" / "synergies.json"
-        if not synergies_file.exists():
-            raise FileNotFoundError(f"Gem synergies file not found: {synergies_file}")
-            
-        with open(synergies_file) as f:
-            synergies_data = json.load(f)
-            
-        # Find synergies for the gem
-        gem_synergies = {}
-        for synergy_type, synergy_data in synergies_data.items():
-            if not synergy_data.get("gems"):
-                continue
-                
-            if gem_name.lower() in [g.lower() for g in synergy_data["gems"]]:
-                gem_synergies[synergy_type] = synergy_data
+        # Look up the gem's synergy categories in the inverted gem index
+        profile = await data_manager.get_gem_profile(gem_name)
+        gem_synergies = dict(profile.synergies) if profile else {}
                 
         if not gem_synergies:
             raise HTTPException(
@@ -452,6 +339,45 @@ async def get_gem_synergies(
         )
 
 
+@router.get("/{gem_name}/all", response_model=GemProfile)
+async def get_gem_all(
+    gem_name: str,
+    data_manager: GameDataManager = Depends(get_data_manager)
+) -> GemProfile:
+    """Get a gem together with its stats, synergies, pairs, conditions and effect details.
+
+    Args:
+        gem_name: Name of the gem to retrieve
+        data_manager: Game data manager instance
+
+    Returns:
+        Everything known about the gem
+
+    Raises:
+        HTTPException: If the gem is not found
+    """
+    try:
+        logger.info(f"Getting all data for gem: {gem_name}")
+        
+        profile = await data_manager.get_gem_profile(gem_name)
+        if not profile:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Gem not found: {gem_name}"
+            )
+            
+        return profile
+            
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting all data for gem {gem_name}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+
 @router.get("/{gem_name}/progression")
 async def get_gem_progression(
     gem_name: str,
@@ -472,32 +398,23 @@ async def get_gem_progression(
     try:
         logger.info(f"Getting progression data for gem: {gem_name}")
         
-        # Load gems data
-        gems_file = data_manager.data_dir / "gems" / "gems.json"
-        if not gems_file.exists():
-            raise FileNotFoundError(f"Gems data file not found: {gems_file}")
-            
-        with open(gems_file) as f:
-            progression_data = json.load(f)
-            
         # Find the gem
-        actual_key = next(
-            (k for k in progression_data.keys() if k.lower() == gem_name.lower()),
-            None
-        )
+        actual_key = await data_manager.resolve_name("gems", gem_name)
         if not actual_key:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Gem {gem_name} not found"
             )
             
-        gem_data = progression_data[actual_key]
+        gems = await data_manager.get_data("gems/data")
+        gem = gems[actual_key]
+        max_rank = gem.ranks[str(gem.max_rank)]
         
         return {
-            "Stars": gem_data["stars"],
-            "Ranks": gem_data["ranks"],
-            "MaxRank": 10,
-            "MaxEffect": gem_data["ranks"]["10"]["effects"][0]["description"]
+            "Stars": gem.stars,
+            "Ranks": {rank: data.model_dump() for rank, data in gem.ranks.items()},
+            "MaxRank": gem.max_rank,
+            "MaxEffect": max_rank.effects[0].description if max_rank.effects else gem.max_effect
         }
             
     except HTTPException:
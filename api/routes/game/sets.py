@@ -107,7 +107,8 @@ async def get_active_set_bonuses(
                     detail=f"Invalid piece count for set '{set_name}': must be between 2 and 6"
                 )
                 
-            set_data = sets_data.registry.get(set_name)
+            set_key = await data_manager.resolve_name("sets", set_name)
+            set_data = sets_data.registry.get(set_key) if set_key else None
             if not set_data:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -122,12 +123,13 @@ async def get_active_set_bonuses(
                 
             # Calculate active bonuses
             set_bonuses = []
-            for threshold in sorted(map(int, set_data.bonuses.keys())):
+            bonuses = set_data.bonuses.model_dump(by_alias=True, exclude_none=True)
+            for threshold in sorted(map(int, bonuses.keys())):
                 if pieces >= threshold:
-                    set_bonuses.append(set_data.bonuses[str(threshold)])
+                    set_bonuses.append(bonuses[str(threshold)])
                     
             if set_bonuses:
-                active_bonuses[set_name] = set_bonuses
+                active_bonuses[set_key] = set_bonuses
                 
         return SetBonusesResponse(
             active_bonuses=active_bonuses,
@@ -173,7 +175,7 @@ async def list_sets(
     try:
         # Get all sets data
         sets_data = await data_manager.get_equipment_sets()
-        if not sets_data or "registry" not in sets_data:
+        if not sets_data:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to load equipment sets data"
@@ -181,8 +183,8 @@ async def list_sets(
         
         # Filter by pieces if specified
         filtered_sets = {}
-        for name, data in sets_data["registry"].items():
-            if not pieces or data["pieces"] == pieces:
+        for name, data in sets_data.registry.items():
+            if not pieces or data.pieces == pieces:
                 filtered_sets[name] = data
         
         # Calculate pagination
@@ -195,10 +197,10 @@ async def list_sets(
         sets = [
             SetInfo(
                 name=name,
-                pieces=data["pieces"],
-                description=data["description"],
-                bonuses=data["bonuses"],
-                use_case=data["use_case"]
+                pieces=data.pieces,
+                description=data.description,
+                bonuses=data.bonuses.model_dump(by_alias=True, exclude_none=True),
+                use_case=data.use_case
             )
             for name, data in paginated_sets
         ]
@@ -240,13 +242,14 @@ async def get_set_details(
     try:
         # Get all sets data
         sets_data = await data_manager.get_equipment_sets()
-        if not sets_data or "registry" not in sets_data:
+        if not sets_data:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to load equipment sets data"
             )
         
-        set_data = sets_data["registry"].get(set_name)
+        set_key = await data_manager.resolve_name("sets", set_name)
+        set_data = sets_data.registry.get(set_key) if set_key else None
         if not set_data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -254,11 +257,11 @@ async def get_set_details(
             )
         
         return SetInfo(
-            name=set_name,
-            pieces=set_data["pieces"],
-            description=set_data["description"],
-            bonuses=set_data["bonuses"],
-            use_case=set_data["use_case"]
+            name=set_key,
+            pieces=set_data.pieces,
+            description=set_data.description,
+            bonuses=set_data.bonuses.model_dump(by_alias=True, exclude_none=True),
+            use_case=set_data.use_case
         )
         
     except HTTPException:
@@ -95,6 +95,8 @@ async def get_stat_details(
             **stats_data[stat_name]
         )
             
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting stat details: {e}")
         raise HTTPException(
@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel, Field
 
 from api.models.game_data.manager import GameDataManager
-from api.models.game_data.schemas.synergies import SynergyGroup, GameSynergies
+from api.models.game_data.schemas.synergies import SynergyGroup
 
 
 router = APIRouter(tags=["game"])
@@ -43,7 +43,7 @@ async def list_synergies(
     try:
         logger.info("Getting all synergies")
         synergies_data = await data_manager.get_synergies()
-        return SynergyListResponse(synergies=synergies_data.registry)
+        return SynergyListResponse(synergies=synergies_data)
     except Exception as e:
         logger.error(f"Error loading synergies: {e}")
         raise HTTPException(
@@ -72,12 +72,13 @@ async def get_synergy_details(
     try:
         logger.info(f"Getting synergies for: {synergy_name}")
         synergies_data = await data_manager.get_synergies()
-        if synergy_name not in synergies_data.registry:
+        synergy_key = await data_manager.resolve_name("synergies", synergy_name)
+        if synergy_key not in synergies_data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Synergy not found: {synergy_name}"
             )
-        return synergies_data.registry[synergy_name]
+        return synergies_data[synergy_key]
     except HTTPException:
         raise
     except Exception as e:
@@ -0,0 +1,478 @@
+"""
+Preload-and-fork server.
+
+Installed as ``dibo-server``. The parent process imports the app, loads every
+game data category and derived index and renders the cached catalog responses,
+and only then forks the workers. The workers inherit all of it copy-on-write:
+they serve their first request without loading anything and share the memory
+pages they only read. Startup time and the memory of the workers are measured
+as soon as they are ready and logged.
+
+    dibo-server --workers 4             Serve with 4 preloaded workers
+    dibo-server --workers 4 --measure   Report startup time and memory, then exit
+    dibo-server --no-preload            Load the data in each worker instead
+"""
+
+import argparse
+import asyncio
+import gc
+import logging
+import os
+import select
+import signal
+import sys
+import time
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+import httpx
+import uvicorn
+from fastapi import FastAPI
+
+from .builds.service import BuildService
+from .core.config import Settings, get_settings
+from .models.game_data.manager import GameDataManager
+from .routes.game import CACHED_ROUTES, router as game_router
+
+logger = logging.getLogger(__name__)
+
+
+class ProcessMemory(NamedTuple):
+    """Memory of a process in kB."""
+
+    rss: int
+    pss: int
+    private: int
+
+    def __add__(self, other: "ProcessMemory") -> "ProcessMemory":
+        return ProcessMemory(*(a + b for a, b in zip(self, other)))
+
+
+class PreloadReport(NamedTuple):
+    """What was loaded into the app before the workers were forked."""
+
+    elapsed_ms: float
+    entries: List[str]
+    responses: int
+
+
+class StartupReport(NamedTuple):
+    """Startup time and memory of a pool of workers once they all serve."""
+
+    workers: int
+    preloaded: bool
+    preload: Optional[PreloadReport]
+    ready_ms: float
+    startup_ms: float
+    parent: ProcessMemory
+    worker_memory: Dict[int, ProcessMemory]
+
+    @property
+    def total(self) -> ProcessMemory:
+        """Memory of the parent and all workers together.
+
+        Pages shared between the processes are split between them in the
+        proportional set size, so the total PSS is what the pool really uses.
+        """
+        return sum(self.worker_memory.values(), self.parent)
+
+    def summary(self) -> str:
+        """Describe the report in two lines."""
+        mode = "preloaded" if self.preloaded else "self-loading"
+        loaded = ""
+        if self.preload is not None:
+            loaded = (
+                f", preloaded {len(self.preload.entries)} entries and "
+                f"{self.preload.responses} responses in {self.preload.elapsed_ms:.0f}ms"
+            )
+        private = sum(memory.private for memory in self.worker_memory.values())
+        return (
+            f"Started {self.workers} {mode} workers {self.startup_ms:.0f}ms after process start"
+            f"{loaded}, workers ready {self.ready_ms:.0f}ms after fork\n"
+            f"Memory: {self.total.pss / 1024:.1f}MB PSS in total, "
+            f"{private / 1024:.1f}MB private to the workers, "
+            f"{self.parent.pss / 1024:.1f}MB PSS in the parent"
+        )
+
+
+def process_memory(pid: int) -> ProcessMemory:
+    """Read the memory usage of a process from /proc/<pid>/smaps_rollup.
+
+    Args:
+        pid: Process id
+
+    Returns:
+        ProcessMemory: Resident, proportional and private set sizes in kB, all
+            zero where smaps_rollup is not available
+    """
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as rollup:
+            lines = rollup.read().splitlines()[1:]
+    except OSError:
+        return ProcessMemory(0, 0, 0)
+
+    fields = {}
+    for line in lines:
+        name, _, value = line.partition(":")
+        fields[name] = int(value.split()[0])
+    return ProcessMemory(
+        rss=fields.get("Rss", 0),
+        pss=fields.get("Pss", 0),
+        private=fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)
+    )
+
+
+def process_age_ms() -> float:
+    """Get the time since this process was started.
+
+    Returns:
+        float: Milliseconds since the process started, 0 where /proc is not
+            available
+    """
+    try:
+        with open("/proc/self/stat") as stat:
+            # Fields after the command name, which may contain spaces
+            fields = stat.read().rsplit(")", 1)[1].split()
+    except OSError:
+        return 0.0
+    started = int(fields[19]) / os.sysconf("SC_CLK_TCK")
+    return (time.clock_gettime(time.CLOCK_BOOTTIME) - started) * 1000
+
+
+async def _preload(app: FastAPI, settings: Settings) -> PreloadReport:
+    """Load the game data into the app and fill its response cache."""
+    start = time.perf_counter()
+    data_manager = GameDataManager(settings=settings)
+    app.state.data_manager = data_manager
+    try:
+        entries = await data_manager.preload()
+    except (OSError, ValueError) as e:
+        # Served as without preloading: requests load the data, or fail, themselves
+        logger.error(f"Could not preload the game data: {e}")
+        entries = []
+
+    if entries:
+        # The build scorers derived from the data, as the build routes use them
+        try:
+            build_service = await BuildService.create(data_manager)
+            await build_service.preload()
+        except Exception as e:
+            logger.warning(f"Could not preload the build scorers: {e}")
+        entries = sorted((await data_manager.pinned_cache()).data)
+
+    responses = 0
+    response_cache = getattr(app.state, "response_cache", None)
+    if response_cache is not None and entries:
+        prefix = f"{settings.API_V1_STR}{game_router.prefix}"
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://preload") as client:
+            for path in CACHED_ROUTES:
+                try:
+                    response = await client.get(f"{prefix}{path}")
+                except Exception as e:
+                    logger.warning(f"Could not preload {path}: {e}")
+                    continue
+                if response.status_code != 200:
+                    logger.warning(f"Could not preload {path}: HTTP {response.status_code}")
+        responses = response_cache.stats["entries"]
+
+    # Load executor threads do not survive a fork, each worker starts its own
+    await data_manager.close()
+    app.state.data_preloaded = True
+    return PreloadReport(
+        elapsed_ms=(time.perf_counter() - start) * 1000,
+        entries=entries,
+        responses=responses
+    )
+
+
+def preload_app(app: FastAPI, settings: Optional[Settings] = None) -> PreloadReport:
+    """Load everything the app serves before forking workers from this process.
+
+    Loads every game data entry, renders the responses of the cached catalog
+    routes and freezes the garbage collector, so collections in the workers do
+    not write to the pages of the inherited objects. The app's lifespan then
+    uses the preloaded data manager instead of creating one.
+
+    Data that fails to load is logged and skipped, whether the parent or each
+    worker preloads: the workers still start, and requests for the missing
+    data load it again or fail, as they would without preloading.
+
+    Args:
+        app: The application
+        settings: Settings to load the data with, the default settings if not given
+
+    Returns:
+        PreloadReport: What was loaded and how long it took
+    """
+    report = asyncio.run(_preload(app, settings or get_settings()))
+    gc.collect()
+    gc.freeze()
+    logger.info(
+        f"Preloaded {len(report.entries)} entries and {report.responses} responses "
+        f"in {report.elapsed_ms:.0f}ms"
+    )
+    return report
+
+
+class _WorkerServer(uvicorn.Server):
+    """Uvicorn server that tells the parent process when it is ready to serve."""
+
+    def __init__(self, config: uvicorn.Config, ready_fd: int) -> None:
+        super().__init__(config)
+        self._ready_fd = ready_fd
+
+    async def startup(self, sockets: Optional[list] = None) -> None:
+        await super().startup(sockets=sockets)
+        if not self.should_exit:
+            os.write(self._ready_fd, f"{os.getpid()}\n".encode())
+
+
+class WorkerPool:
+    """Server workers forked from this process, sharing one listening socket.
+
+    Workers that exit are restarted until stop() is called. A restarted worker
+    is forked from the same preloaded parent, so it is ready as fast as the
+    first ones were.
+    """
+
+    def __init__(
+            self,
+            app: FastAPI,
+            config: uvicorn.Config,
+            settings: Settings,
+            preload: bool = True
+        ) -> None:
+        """Bind the listening socket.
+
+        Args:
+            app: The application, preloaded unless preload is False
+            config: Uvicorn configuration of the workers
+            settings: Settings the workers load the data with if not preloaded
+            preload: Whether the app was preloaded; if not, every worker loads
+                the data itself after the fork
+        """
+        self.app = app
+        self.config = config
+        self.settings = settings
+        self.preload = preload
+        self.pids: Set[int] = set()
+        self.stopping = False
+        self.socket = config.bind_socket()
+        self._ready_read, self._ready_write = os.pipe()
+
+    def spawn(self) -> int:
+        """Fork a worker.
+
+        Returns:
+            int: Process id of the worker
+        """
+        pid = os.fork()
+        if pid == 0:
+            self._run_worker()
+        self.pids.add(pid)
+        return pid
+
+    def _run_worker(self) -> None:
+        """Serve in a forked worker until told to stop, then exit the process."""
+        status = 1
+        try:
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                signal.signal(sig, signal.SIG_DFL)
+            os.close(self._ready_read)
+            if not self.preload:
+                preload_app(self.app, self.settings)
+            _WorkerServer(self.config, self._ready_write).run(sockets=[self.socket])
+            status = 0
+        except BaseException:
+            logger.exception(f"Worker {os.getpid()} failed")
+        finally:
+            os._exit(status)
+
+    def wait_ready(self, count: int, timeout: float = 60.0) -> List[int]:
+        """Wait until workers have started serving.
+
+        Args:
+            count: Number of workers to wait for
+            timeout: Seconds to wait at most
+
+        Returns:
+            List[int]: Process ids of the ready workers
+
+        Raises:
+            RuntimeError: If a worker exits before it is ready
+            TimeoutError: If the workers are not ready in time
+        """
+        ready: List[int] = []
+        buffer = b""
+        deadline = time.monotonic() + timeout
+        while len(ready) < count:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"{count - len(ready)} workers not ready after {timeout}s")
+            if not select.select([self._ready_read], [], [], min(remaining, 0.5))[0]:
+                for pid in self.pids - set(ready):
+                    if os.waitpid(pid, os.WNOHANG)[0]:
+                        self.pids.discard(pid)
+                        raise RuntimeError(f"Worker {pid} exited during startup")
+                continue
+            buffer += os.read(self._ready_read, 4096)
+            *lines, buffer = buffer.split(b"\n")
+            ready += [int(line) for line in lines]
+        return ready
+
+    def memory(self) -> Dict[int, ProcessMemory]:
+        """Measure the memory of every worker.
+
+        Returns:
+            Dict[int, ProcessMemory]: Memory keyed by process id
+        """
+        return {pid: process_memory(pid) for pid in sorted(self.pids)}
+
+    def stop(self) -> None:
+        """Ask every worker to shut down gracefully."""
+        self.stopping = True
+        for pid in self.pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def supervise(self) -> None:
+        """Wait for the workers, restarting any that exit until stop() is called.
+
+        Closes the listening socket once every worker has exited.
+        """
+        while self.pids:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            self.pids.discard(pid)
+            if self.stopping:
+                continue
+
+            logger.warning(
+                f"Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}, restarting it"
+            )
+            start = time.perf_counter()
+            self.spawn()
+            try:
+                self.wait_ready(1)
+            except (RuntimeError, TimeoutError) as e:
+                logger.error(f"Restarted worker failed to start: {e}")
+                continue
+            logger.info(f"Worker restarted in {(time.perf_counter() - start) * 1000:.0f}ms")
+
+        self.socket.close()
+        os.close(self._ready_read)
+        os.close(self._ready_write)
+
+
+def launch(
+        workers: int,
+        preload: bool = True,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        settings: Optional[Settings] = None
+    ) -> Tuple[WorkerPool, StartupReport]:
+    """Import the app, preload it, fork the workers and wait until they all serve.
+
+    Args:
+        workers: Number of workers
+        preload: Whether to load the data once before forking, rather than in
+            every worker after it
+        host: Host to listen on, HOST if not given
+        port: Port to listen on, PORT if not given
+        settings: Settings to use, the default settings if not given
+
+    Returns:
+        Tuple of the running worker pool and its startup report
+
+    Raises:
+        OSError: If the listening socket is unavailable
+        RuntimeError: If a worker exits during startup
+        TimeoutError: If the workers do not start in time
+    """
+    from .main import app  # Creating the app reads the settings and sets up logging
+
+    settings = settings or get_settings()
+    preload_report = preload_app(app, settings) if preload else None
+    config = uvicorn.Config(
+        app,
+        host=settings.HOST if host is None else host,
+        port=settings.PORT if port is None else port,
+        log_level=settings.log_level,
+        lifespan="on"
+    )
+    # Import the protocol implementations once, before the fork
+    config.load()
+    pool = WorkerPool(app, config, settings, preload=preload)
+
+    start = time.perf_counter()
+    for _ in range(workers):
+        pool.spawn()
+    try:
+        pool.wait_ready(workers)
+    except (RuntimeError, TimeoutError):
+        pool.stop()
+        pool.supervise()
+        raise
+    report = StartupReport(
+        workers=workers,
+        preloaded=preload,
+        preload=preload_report,
+        ready_ms=(time.perf_counter() - start) * 1000,
+        startup_ms=process_age_ms(),
+        parent=process_memory(os.getpid()),
+        worker_memory=pool.memory()
+    )
+    return pool, report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the dibo-server command.
+
+    Args:
+        argv: Command line arguments, sys.argv if not given
+
+    Returns:
+        int: Exit status, 0 on success
+    """
+    settings = get_settings()
+    parser = argparse.ArgumentParser(
+        prog="dibo-server",
+        description="Serve the API from workers forked after loading the game data"
+    )
+    parser.add_argument("--workers", type=int, default=settings.WORKERS, help="Number of workers")
+    parser.add_argument("--host", default=settings.HOST, help="Host to listen on")
+    parser.add_argument("--port", type=int, default=settings.PORT, help="Port to listen on")
+    parser.add_argument(
+        "--no-preload", action="store_true", help="Load the data in every worker after the fork"
+    )
+    parser.add_argument(
+        "--measure", action="store_true", help="Report startup time and memory, then stop"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        pool, report = launch(
+            args.workers, preload=not args.no_preload, host=args.host, port=args.port, settings=settings
+        )
+    except (OSError, RuntimeError, ValueError) as e:
+        logger.error(f"Server failed to start: {e}")
+        return 1
+
+    for line in report.summary().splitlines():
+        logger.info(line)
+    if args.measure:
+        print(report.summary())
+        pool.stop()
+    else:
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: pool.stop())
+    pool.supervise()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Compare staged build generation with the joint beam search."""
+
+import argparse
+from collections import defaultdict
+from itertools import product
+from pathlib import Path
+from typing import Dict, List, Set
+
+from api.builds.beam_search import BuildSpace, beam_search_builds
+from api.builds.gem_loadout import GemCandidate, GemSlotRules, optimize_gem_loadout
+from api.builds.models import BuildFocus, BuildType
+from api.builds.scoring import (
+    EssenceScorer,
+    GemScoreTable,
+    SetScorer,
+    SkillScorer,
+    aux_gem_score,
+    synergy_skills,
+)
+from api.builds.set_search import set_combinations
+from api.core import codec
+from api.core.config import get_settings
+from scripts.benchmark_gem_scores import best_time, load_inputs
+
+
+def focus_categories(build_types: Dict) -> Dict[BuildFocus, Set[str]]:
+    """Categories matching each focus, from the first word of its terms."""
+    return {
+        focus: {
+            term.split()[0]
+            for build_type in build_types.values()
+            for term in build_type.get(focus.value.lower(), {}).get("terms", [])
+        }
+        for focus in BuildFocus
+    }
+
+
+def main() -> None:
+    """Search the builds of a class for every build type and focus."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--data-dir",
+        type=Path,
+        default=get_settings().data_path,
+        help="Indexed data directory (default: DATA_DIR)"
+    )
+    parser.add_argument("--character-class", default="barbarian", help="Class to search (default: barbarian)")
+    parser.add_argument(
+        "--widths",
+        type=int,
+        nargs="+",
+        default=[1, 4, 16, 64],
+        help="Beam widths to compare (default: 1 4 16 64)"
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Runs per measurement, the fastest one is reported (default: 3)"
+    )
+    args = parser.parse_args()
+
+    synergies, stat_boosts, _ = load_inputs(args.data_dir)
+    table = GemScoreTable.build(synergies, stat_boosts)
+    stars = {
+        gem["name"]: int(gem["stars"])
+        for gem in map(codec.load_file, sorted((args.data_dir / "gems" / "core").rglob("*.json")))
+    }
+    constraints = codec.load_file(args.data_dir / "constraints.json")
+    class_dir = args.data_dir / "classes" / args.character_class
+    registry = codec.load_file(class_dir / "base_skills.json")["registry"]
+    class_constraints = codec.load_file(class_dir / "constraints.json")
+    essences = codec.load_file(class_dir / "essences.json")["essences"]
+    skill_essences: Dict[str, List[str]] = defaultdict(list)
+    for key, essence in essences.items():
+        skill_essences[essence["modifies_skill"]].append(key)
+
+    categories = focus_categories(codec.load_file(args.data_dir / "build_types.json")["build_types"])
+    focus_gems = {
+        focus: {gem for category, data in synergies.items() if category in categories[focus] for gem in data["gems"]}
+        for focus in BuildFocus
+    }
+    skill_scorer = SkillScorer(registry, categories, synergies)
+    essence_scorer = EssenceScorer(essences)
+    set_scorer = SetScorer(codec.load_file(args.data_dir / "sets.json"))
+
+    widths = "".join(f"{f'w={width}':>9}{'ms':>8}" for width in args.widths)
+    print(f"{args.character_class}: {len(stars)} gems, {len(registry)} skills, {len(essences)} essences")
+    print(f"{'build':<16}{'staged':>9}{widths}")
+    for build_type, focus in product(BuildType, BuildFocus):
+        candidates = [
+            GemCandidate(
+                name,
+                gem_stars,
+                table.score(name, build_type, focus) if name in focus_gems[focus] else None,
+                aux_gem_score(table.score(name, build_type, focus), None)
+            )
+            for name, gem_stars in stars.items()
+        ]
+        space = BuildSpace(
+            build_type=build_type,
+            focus=focus,
+            gems=candidates,
+            gem_rules=GemSlotRules.from_constraints(constraints),
+            gem_categories={name: table.categories(name) for name in stars},
+            skill_categories={skill: data.get("categories", []) for skill, data in registry.items()},
+            category_skills=synergy_skills(synergies),
+            weapons=class_constraints["weapon_slots"]["available_weapons"],
+            skills=class_constraints["skill_slots"]["available_skills"],
+            skill_count=5,
+            skill_essences=skill_essences,
+            skill_scorer=skill_scorer,
+            essence_scorer=essence_scorer,
+            set_scorer=set_scorer,
+            set_combinations=set_combinations(constraints)
+        )
+
+        # Staged: the best loadout first, then the best skills and sets for it
+        loadout = optimize_gem_loadout(candidates, space.gem_rules)
+        chosen = {name for slot in loadout.slots for name in slot}
+        staged = beam_search_builds(
+            space._replace(gems=[gem for gem in candidates if gem.name in chosen]),
+            beam_width=1024
+        )
+
+        row = ""
+        for width in args.widths:
+            score = beam_search_builds(space, width).builds[0].score
+            row += f"{score:>9.3f}{best_time(lambda: beam_search_builds(space, width), args.repeat):>8.1f}"
+        print(f"{build_type.value + '/' + focus.value:<16}{staged.builds[0].score:>9.3f}{row}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Benchmark the installed JSON codecs on the files in data/indexed."""
+
+import argparse
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from api.core.codec import CODECS, PREFERENCE
+from api.core.config import get_settings
+
+
+def best_time(func: Callable[[], object], repeat: int) -> float:
+    """Run a function repeatedly and return the fastest run in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    """Time parsing and encoding every data file with every installed codec."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--data-dir",
+        type=Path,
+        default=get_settings().data_path,
+        help="Directory with the JSON files to benchmark (default: DATA_DIR)"
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=20,
+        help="Runs per measurement, the fastest one is reported (default: 20)"
+    )
+    args = parser.parse_args()
+
+    paths = sorted(args.data_dir.rglob("*.json"))
+    payloads: List[bytes] = [path.read_bytes() for path in paths]
+    total_kb = sum(len(payload) for payload in payloads) / 1024
+    print(f"{len(payloads)} files, {total_kb:.0f} KB from {args.data_dir}")
+
+    documents = [CODECS["json"].loads(payload) for payload in payloads]
+    results: Dict[str, Dict[str, float]] = {}
+    for name in PREFERENCE:
+        codec = CODECS.get(name)
+        if codec is None:
+            print(f"{name}: not installed, skipped")
+            continue
+        results[name] = {
+            "loads": best_time(lambda: [codec.loads(p) for p in payloads], args.repeat),
+            "dumps": best_time(lambda: [codec.dumps(d) for d in documents], args.repeat),
+        }
+
+    baseline = results["json"]
+    print(f"{'codec':<10}{'loads ms':>12}{'dumps ms':>12}{'loads x':>10}{'dumps x':>10}")
+    for name, timings in results.items():
+        print(
+            f"{name:<10}{timings['loads']:>12.2f}{timings['dumps']:>12.2f}"
+            f"{baseline['loads'] / timings['loads']:>10.1f}"
+            f"{baseline['dumps'] / timings['dumps']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
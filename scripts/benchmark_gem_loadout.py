@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Compare greedy gem selection with the exact loadout search."""
+
+import argparse
+from itertools import product
+from pathlib import Path
+from typing import List
+
+from api.builds.gem_loadout import GemCandidate, GemSlotRules, optimize_gem_loadout
+from api.builds.models import BuildFocus, BuildType
+from api.builds.scoring import GemScoreTable, aux_gem_score
+from api.core import codec
+from api.core.config import get_settings
+from scripts.benchmark_gem_scores import load_inputs
+
+
+def greedy(candidates: List[GemCandidate], rules: GemSlotRules) -> float:
+    """Score of the loadout picked the old way: best primaries first, each
+    taking the best unused aux gem of its star rating."""
+    used = set()
+    score = 0.0
+    primaries = sorted(
+        (c for c in candidates if c.primary_score is not None and c.stars in rules.star_ratings),
+        key=lambda c: c.primary_score,
+        reverse=True
+    )
+    selected = 0
+    for primary in primaries:
+        if selected == rules.primary_count:
+            break
+        if primary.name in used:
+            continue
+        selected += 1
+        used.add(primary.name)
+        score += primary.primary_score
+        auxes = [c for c in candidates if c.name not in used and c.stars == primary.stars]
+        if auxes:
+            aux = max(auxes, key=lambda c: c.aux_score)
+            used.add(aux.name)
+            score += aux.aux_score
+    return score
+
+
+def main() -> None:
+    """Search the loadout of every build type and focus with both methods."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--data-dir",
+        type=Path,
+        default=get_settings().data_path,
+        help="Indexed data directory (default: DATA_DIR)"
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=None,
+        help="Time budget of the exact search (default: none)"
+    )
+    args = parser.parse_args()
+
+    synergies, stat_boosts, _ = load_inputs(args.data_dir)
+    table = GemScoreTable.build(synergies, stat_boosts)
+    stars = {
+        gem["name"]: int(gem["stars"])
+        for gem in map(codec.load_file, sorted((args.data_dir / "gems" / "core").rglob("*.json")))
+    }
+    constraints = codec.load_file(args.data_dir / "constraints.json")
+    rules = GemSlotRules.from_constraints(constraints)
+    budget = args.budget_ms / 1000 if args.budget_ms is not None else None
+
+    print(f"{len(stars)} gems, {rules.primary_count} primary slots")
+    print(f"{'build':<16}{'greedy':>8}{'exact':>8}{'gap':>7}{'nodes':>8}{'ms':>8}")
+    for build_type, focus in product(BuildType, BuildFocus):
+        candidates = [
+            GemCandidate(
+                name,
+                gem_stars,
+                table.score(name, build_type, focus) if name in table else None,
+                aux_gem_score(table.score(name, build_type, focus), None)
+            )
+            for name, gem_stars in stars.items()
+        ]
+        result = optimize_gem_loadout(candidates, rules, budget)
+        print(
+            f"{build_type.value + '/' + focus.value:<16}{greedy(candidates, rules):>8.3f}"
+            f"{result.score:>8.3f}{result.gap:>7.3f}{result.nodes:>8}{result.elapsed_ms:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
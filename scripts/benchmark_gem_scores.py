@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Benchmark gem scoring per generated build, per call versus the score table."""
+
+import argparse
+import re
+import time
+from itertools import product
+from pathlib import Path
+from typing import Callable, List
+
+from api.builds.models import BuildFocus, BuildType
+from api.builds.scoring import GEM_SCORE_WEIGHTS, GemScoreTable, gem_score, gem_stat_boosts
+from api.core import codec
+from api.core.config import get_settings
+
+PERCENT = re.compile(r"([\d.]+)%")
+
+
+def load_inputs(data_path: Path) -> tuple:
+    """Build synergy and stat boost inputs from the indexed gem files.
+
+    There is no stat boost file any more, so each gem's boost in its synergy
+    categories is the largest percentage of its rank 10 effects.
+    """
+    synergies = codec.load_file(data_path / "synergies.json")["synergies"]
+    rank_10 = {}
+    for path in sorted((data_path / "gems" / "core").rglob("*.json")):
+        gem = codec.load_file(path)
+        effects = gem.get("ranks", {}).get("10", {}).get("effects", [])
+        values = [float(v) for e in effects for v in PERCENT.findall(e.get("description", ""))]
+        rank_10[gem["name"]] = (max(values, default=0.0), any("up to" in e.get("description", "") for e in effects))
+
+    stat_boosts = {
+        category: {
+            name: {"rank_10": rank_10[name][0], "scaling": rank_10[name][1]}
+            for name in data["gems"] if name in rank_10
+        }
+        for category, data in synergies.items()
+    }
+    return synergies, stat_boosts, sorted(rank_10)
+
+
+def best_time(func: Callable[[], object], repeat: int) -> float:
+    """Run a function repeatedly and return the fastest run in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    """Time the gem scoring of one build for every build type and focus."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--data-dir",
+        type=Path,
+        default=get_settings().data_path,
+        help="Indexed data directory (default: DATA_DIR)"
+    )
+    parser.add_argument("--slots", type=int, default=8, help="Primary gem slots per build (default: 8)")
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=50,
+        help="Runs per measurement, the fastest one is reported (default: 50)"
+    )
+    args = parser.parse_args()
+
+    synergies, stat_boosts, all_gems = load_inputs(args.data_dir)
+    boosts = gem_stat_boosts(stat_boosts)
+    focus_gems: List[str] = [name for data in synergies.values() for name in data["gems"]]
+
+    def per_call(gem_name: str, build_type: BuildType, focus: BuildFocus) -> float:
+        # What every call did before: rebuild the weights, scan every category
+        weights = {t: {f: dict(w) for f, w in fw.items()} for t, fw in GEM_SCORE_WEIGHTS.items()}
+        categories = {c for c, data in synergies.items() if gem_name in data["gems"]}
+        return gem_score(gem_name, categories, boosts, weights[build_type][focus])
+
+    def build(score: Callable[[str, BuildType, BuildFocus], float], build_type, focus) -> None:
+        # Sort the focus gems, then rescan every gem for each primary's aux gem
+        sorted(focus_gems, key=lambda g: score(g, build_type, focus), reverse=True)
+        for _ in range(args.slots):
+            max(all_gems, key=lambda g: score(g, build_type, focus))
+
+    table_ms = best_time(lambda: GemScoreTable.build(synergies, stat_boosts), args.repeat)
+    table = GemScoreTable.build(synergies, stat_boosts)
+    calls = len(focus_gems) + args.slots * len(all_gems)
+    print(
+        f"{len(all_gems)} gems, {len(synergies)} synergy categories, {calls} scores per build; "
+        f"table of {len(table)} gems built in {table_ms:.3f} ms once per generation"
+    )
+
+    print(f"{'build':<16}{'per call ms':>14}{'table ms':>12}{'speedup':>10}")
+    for build_type, focus in product(BuildType, BuildFocus):
+        before = best_time(lambda: build(per_call, build_type, focus), args.repeat)
+        after = best_time(lambda: build(table.score, build_type, focus), args.repeat)
+        print(
+            f"{build_type.value + '/' + focus.value:<16}{before:>14.3f}{after:>12.3f}"
+            f"{before / after:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Compare startup time and memory of preloaded and self-loading server workers."""
+
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+from api.server import StartupReport, launch
+
+
+def measure(workers: int, preload: bool) -> StartupReport:
+    """Start a pool of workers on a free port, measure it and stop it."""
+    pool, report = launch(workers, preload=preload, host="127.0.0.1", port=0)
+    pool.stop()
+    pool.supervise()
+    return report
+
+
+def main() -> None:
+    """Start pools of each size in both modes, each from a fresh process."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4, 8],
+        help="Pool sizes to measure (default: 1 2 4 8)"
+    )
+    args = parser.parse_args()
+
+    # A fresh interpreter per run, so no run inherits another one's data
+    context = multiprocessing.get_context("spawn")
+    reports: List[StartupReport] = []
+    for workers in args.workers:
+        for preload in (False, True):
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                reports.append(executor.submit(measure, workers, preload).result())
+
+    print(
+        f"{'workers':>8}{'mode':>14}{'startup ms':>12}{'ready ms':>10}"
+        f"{'total PSS MB':>14}{'private MB':>12}"
+    )
+    for report in reports:
+        private = sum(memory.private for memory in report.worker_memory.values())
+        print(
+            f"{report.workers:>8}{'preloaded' if report.preloaded else 'self-loading':>14}"
+            f"{report.startup_ms:>12.0f}{report.ready_ms:>10.0f}"
+            f"{report.total.pss / 1024:>14.1f}{private / 1024:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Benchmark essence and set scoring per build, per item versus feature matrices."""
+
+import argparse
+from itertools import product
+from pathlib import Path
+from typing import Dict
+
+from api.builds.features import BACKENDS
+from api.builds.models import BuildFocus, BuildType
+from api.builds.scoring import EssenceScorer, SetScorer, essence_score
+from api.core import codec
+from api.core.config import get_settings
+from scripts.benchmark_gem_scores import best_time
+
+
+def load_essences(data_path: Path, copies: int) -> Dict[str, dict]:
+    """Load every class's essences, repeated to stand in for more classes."""
+    essences = {}
+    for path in sorted((data_path / "classes").glob("*/essences.json")):
+        for key, essence in codec.load_file(path)["essences"].items():
+            for copy in range(copies):
+                essences[f"{path.parent.name}/{key}/{copy}"] = essence
+    return essences
+
+
+def main() -> None:
+    """Time scoring every essence and set for every build type and focus."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--data-dir",
+        type=Path,
+        default=get_settings().data_path,
+        help="Indexed data directory (default: DATA_DIR)"
+    )
+    parser.add_argument(
+        "--copies",
+        type=int,
+        default=10,
+        help="Times each essence is repeated (default: 10)"
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=20,
+        help="Runs per measurement, the fastest one is reported (default: 20)"
+    )
+    args = parser.parse_args()
+
+    essences = load_essences(args.data_dir, args.copies)
+    sets = codec.load_file(args.data_dir / "sets.json")
+    builds = list(product(BuildType, BuildFocus))
+    synergy_skills = {"Whirlwind", "Hammer of the Ancients"}
+
+    def per_item() -> None:
+        for build_type, focus in builds:
+            for essence in essences.values():
+                essence_score(essence, build_type, focus, synergy_skills)
+
+    print(f"{len(essences)} essences, {len(builds)} builds")
+    print(f"{'scorer':<20}{'build ms':>10}{'score ms':>10}")
+    print(f"{'per item':<20}{'':>10}{best_time(per_item, args.repeat):>10.3f}")
+    for backend in BACKENDS:
+        build_ms = best_time(lambda: EssenceScorer(essences, backend), args.repeat)
+        scorer = EssenceScorer(essences, backend)
+        score_ms = best_time(
+            lambda: [scorer.scores(build_type, focus, synergy_skills) for build_type, focus in builds],
+            args.repeat
+        )
+        print(f"{'essences/' + backend:<20}{build_ms:>10.3f}{score_ms:>10.3f}")
+
+        set_scorer = SetScorer(sets, backend)
+        set_ms = best_time(
+            lambda: [set_scorer.scores(build_type, focus) for build_type, focus in builds],
+            args.repeat
+        )
+        print(f"{'sets/' + backend:<20}{'':>10}{set_ms:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
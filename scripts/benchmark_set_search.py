@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Benchmark the set combination search as the set registry grows."""
+
+import argparse
+from itertools import permutations
+from pathlib import Path
+from typing import Dict, Mapping
+
+from api.builds.models import BuildFocus, BuildType
+from api.builds.scoring import SetScorer
+from api.builds.set_search import DEFAULT_COMBINATIONS, best_set_combination
+from api.core import codec
+from api.core.config import get_settings
+from scripts.benchmark_gem_scores import best_time
+
+
+def top_two(bonus_values: Mapping[str, Mapping[int, float]]) -> float:
+    """Value of the old choice: 6 pieces of the best set, 2 of the next."""
+    ranked = sorted(bonus_values, key=lambda name: bonus_values[name].get(6, 0.0), reverse=True)
+    return bonus_values[ranked[0]].get(6, 0.0) + bonus_values[ranked[1]].get(2, 0.0)
+
+
+def exhaustive(bonus_values: Mapping[str, Mapping[int, float]]) -> float:
+    """Value of the best combination, trying every assignment of sets to parts."""
+    return max(
+        sum(bonus_values[name][size] for name, size in zip(sets, combination))
+        for combination in DEFAULT_COMBINATIONS
+        for sets in permutations(bonus_values, len(combination))
+        if all(size in bonus_values[name] for name, size in zip(sets, combination))
+    )
+
+
+def main() -> None:
+    """Time the search over copies of the indexed sets."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--data-dir",
+        type=Path,
+        default=get_settings().data_path,
+        help="Indexed data directory (default: DATA_DIR)"
+    )
+    parser.add_argument(
+        "--copies",
+        type=int,
+        nargs="+",
+        default=[1, 2, 10, 100],
+        help="Registry sizes as copies of the indexed sets (default: 1 2 10 100)"
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Runs per measurement, the fastest one is reported (default: 5)"
+    )
+    args = parser.parse_args()
+
+    registry = codec.load_file(args.data_dir / "sets.json")["registry"]
+    print(f"{'sets':>6}{'6+2 top two':>13}{'best':>8}{'search ms':>11}{'exhaustive ms':>15}")
+    for copies in args.copies:
+        sets: Dict[str, dict] = {
+            f"{name} {copy}": data for copy in range(copies) for name, data in registry.items()
+        }
+        scorer = SetScorer(sets)
+        # Copies score alike; vary them so ties do not flatter any method
+        bonus_values = {
+            name: {pieces: value * (1 - 0.001 * i) for pieces, value in values.items()}
+            for i, (name, values) in enumerate(
+                scorer.bonus_values(BuildType.RAID, BuildFocus.DPS, (2, 4, 6)).items()
+            )
+        }
+        combination = best_set_combination(bonus_values)
+        search_ms = best_time(lambda: best_set_combination(bonus_values), args.repeat)
+        exhaustive_ms = best_time(lambda: exhaustive(bonus_values), 1) if len(sets) <= 26 else float("nan")
+        print(
+            f"{len(sets):>6}{top_two(bonus_values):>13.3f}{combination.score:>8.3f}"
+            f"{search_ms:>11.3f}{exhaustive_ms:>15.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
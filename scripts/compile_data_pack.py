@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+"""Compile data/indexed into a validated binary data pack.
+
+Same as ``dibo-data compile``.
+"""
+
+import sys
+
+from api.models.game_data.cli import main
+
+
+if __name__ == "__main__":
+    sys.exit(main(["--verbose", "compile", *sys.argv[1:]]))
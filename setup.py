@@ -22,6 +22,14 @@ setup(
         "email-validator>=2.1.0",
     ],
     extras_require={
+        "compression": [
+            "brotli>=1.1.0",
+        ],
+        "speedups": [
+            "orjson>=3.9.0",
+            "msgspec>=0.18.0",
+            "numpy>=1.24.0",
+        ],
         "dev": [
             "pytest>=7.4.3",
             "pytest-asyncio>=0.23.2",
@@ -35,6 +43,8 @@ setup(
     entry_points={
         "console_scripts": [
             "api=api.main:main",
+            "dibo-data=api.models.game_data.cli:main",
+            "dibo-server=api.server:main",
         ],
     },
 )
@@ -0,0 +1,132 @@
+"""Tests for the joint build search."""
+
+import pytest
+
+from api.builds.beam_search import BuildSpace, SkillChoice, beam_search_builds
+from api.builds.gem_loadout import GemCandidate, GemSlot, GemSlotRules, optimize_gem_loadout
+from api.builds.models import BuildFocus, BuildType
+from api.builds.scoring import EssenceScorer, SetScorer, SkillScorer, synergy_skills
+from api.builds.set_search import SetChoice
+
+REGISTRY = {
+    "Lacerate": {"base_type": "damage"},
+    "Whirlwind": {"base_type": "damage", "second_base_type": "aoe"},
+    "Shout": {"base_type": "support"},
+    "Charge": {"base_type": "mobility"},
+}
+SYNERGIES = {
+    "control": {"gems": ["Lightning Core"], "skills": ["Shout"]},
+    "fury": {"gems": ["Berserker's Eye"], "skills": []},
+}
+ESSENCES = {
+    "shout_1": {
+        "essence_name": "Rallying Cry",
+        "modifies_skill": "Shout",
+        "effect": "Deals damage",
+        "effect_type": "damage",
+        "effect_tags": [],
+    },
+    "whirlwind_1": {
+        "essence_name": "Dust Devils",
+        "modifies_skill": "Whirlwind",
+        "effect": "Cooldown reduced by 2 seconds",
+        "effect_type": "utility",
+        "effect_tags": ["utility"],
+    },
+}
+SETS = {
+    "War Rags": {
+        "bonus_2pc": {"damage": 10},
+        "bonus_4pc": {"damage": 20},
+        "bonus_6pc": {"damage": 30},
+        "skill_synergies": {"Shout": {"damage": 40}},
+    },
+    "Old Set": {"bonus_2pc": {"damage": 15}, "bonus_4pc": {"damage": 15}, "bonus_6pc": {"damage": 15}},
+}
+GEMS = [
+    GemCandidate("Berserker's Eye", 5, 0.5, 0.1),
+    GemCandidate("Lightning Core", 5, 0.4, 0.1),
+    GemCandidate("Chained Death", 5, None, 0.3),
+]
+
+
+@pytest.fixture
+def space() -> BuildSpace:
+    """One primary gem slot, a weapon skill and two other skills."""
+    return BuildSpace(
+        build_type=BuildType.RAID,
+        focus=BuildFocus.DPS,
+        gems=GEMS,
+        gem_rules=GemSlotRules(primary_count=1),
+        gem_categories={"Lightning Core": ["control"], "Berserker's Eye": ["fury"]},
+        skill_categories={},
+        category_skills=synergy_skills(SYNERGIES),
+        weapons=["Lacerate"],
+        skills=["Whirlwind", "Shout", "Charge"],
+        skill_count=3,
+        skill_essences={"Shout": ["shout_1"], "Whirlwind": ["whirlwind_1"]},
+        skill_scorer=SkillScorer(REGISTRY, {BuildFocus.DPS: set()}, SYNERGIES),
+        essence_scorer=EssenceScorer(ESSENCES),
+        set_scorer=SetScorer(SETS),
+        set_combinations=[(6, 2), (4, 4)],
+    )
+
+
+def test_search_picks_gems_for_the_skills_they_enable(space: BuildSpace):
+    """Test that a weaker gem wins when the skill it synergizes with makes up for it."""
+    staged = optimize_gem_loadout(space.gems, space.gem_rules)
+    assert staged.slots == [GemSlot("Berserker's Eye", "Chained Death")]
+
+    result = beam_search_builds(space, beam_width=8)
+
+    assert result.complete
+    best = result.builds[0]
+    assert best.gems == [GemSlot("Lightning Core", "Chained Death")]
+    assert best.skills == [
+        SkillChoice("Lacerate", None),
+        SkillChoice("Whirlwind", "whirlwind_1"),
+        SkillChoice("Shout", "shout_1"),
+    ]
+    assert best.sets == [SetChoice("War Rags", 6), SetChoice("Old Set", 2)]
+
+
+def test_aux_gems_leave_later_primary_gems(space: BuildSpace):
+    """Test that an aux gem is not taken from a primary gem slot still to be filled."""
+    gems = [GemCandidate("Berserker's Eye", 1, 1.0, 0.1), GemCandidate("Lightning Core", 1, 0.9, 0.9)]
+    space = space._replace(gems=gems, gem_rules=GemSlotRules(2, None, 0, True))
+    staged = optimize_gem_loadout(gems, space.gem_rules)
+
+    best = beam_search_builds(space, beam_width=1).builds[0]
+
+    assert best.gems == [GemSlot("Berserker's Eye", None), GemSlot("Lightning Core", None)]
+    assert best.gems == staged.slots and staged.score == pytest.approx(1.9)
+
+
+def test_search_returns_distinct_builds_best_first(space: BuildSpace):
+    """Test that the top builds are different builds in score order."""
+    builds = beam_search_builds(space, beam_width=8, top_k=3).builds
+
+    assert len(builds) == 3
+    assert [build.score for build in builds] == sorted((build.score for build in builds), reverse=True)
+    assert len({(tuple(build.gems), tuple(build.skills)) for build in builds}) == 3
+    assert beam_search_builds(space, beam_width=1).builds[0].score <= builds[0].score
+
+
+def test_time_budget_completes_builds_greedily(space: BuildSpace):
+    """Test that a search out of time still returns complete builds."""
+    result = beam_search_builds(space, beam_width=8, top_k=3, time_budget=0.0)
+
+    assert not result.complete
+    for build in result.builds:
+        assert len(build.gems) == 1
+        assert len(build.skills) == 3
+        assert sum(choice.pieces for choice in build.sets) == 8
+
+
+def test_search_fills_what_it_can(space: BuildSpace):
+    """Test that missing primary gems and skills leave their slots empty."""
+    space = space._replace(gems=GEMS[2:], skills=["Charge"])
+    build = beam_search_builds(space, beam_width=4).builds[0]
+
+    assert build.gems == []
+    assert build.skills == [SkillChoice("Lacerate", None), SkillChoice("Charge", None)]
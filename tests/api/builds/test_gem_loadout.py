@@ -0,0 +1,152 @@
+"""Tests for the gem loadout search."""
+
+import random
+from itertools import product
+
+import pytest
+
+from api.builds.gem_loadout import GemCandidate, GemSlotRules, optimize_gem_loadout
+from api.builds.models import BuildFocus, BuildType
+from api.builds.service import BuildService
+from api.core.config import Settings
+from api.models.game_data.manager import GameDataManager
+
+RULES = GemSlotRules(primary_count=2, star_ratings=frozenset({1, 2, 5}))
+
+
+def brute_force(candidates, rules: GemSlotRules) -> float:
+    """Best loadout score, trying every role for every gem."""
+    target = rules.primary_count
+    best = None
+    for roles in product(("none", "primary", "aux"), repeat=len(candidates)):
+        primaries = [c for c, role in zip(candidates, roles) if role == "primary"]
+        auxes = [c for c, role in zip(candidates, roles) if role == "aux"]
+        if len(primaries) != target or any(
+            c.primary_score is None or c.stars not in rules.star_ratings for c in primaries
+        ):
+            continue
+        if any(
+            sum(a.stars == stars for a in auxes) > sum(p.stars == stars for p in primaries)
+            for stars in {a.stars for a in auxes}
+        ):
+            continue
+        score = sum(c.primary_score for c in primaries) + sum(c.aux_score for c in auxes)
+        best = score if best is None else max(best, score)
+    return best
+
+
+def test_loadout_pairs_aux_gems_by_star_rating():
+    """Test that every gem is used once and aux gems match their primary's stars."""
+    candidates = [
+        GemCandidate("Berserker's Eye", 5, 0.9, 0.95),
+        GemCandidate("Lightning Core", 5, 0.8, 0.3),
+        GemCandidate("Chained Death", 2, 0.7, 0.2),
+        GemCandidate("Zod Stone", 2, None, 0.9),
+        GemCandidate("Blood-Soaked Jade", 5, None, 0.4),
+        GemCandidate("Fervent Fang", 1, None, 1.0),
+    ]
+    result = optimize_gem_loadout(candidates, RULES)
+
+    assert result.complete and result.gap == 0.0
+    # The best primary gem is worth more as an aux gem
+    assert result.score == pytest.approx(0.8 + 0.95 + 0.7 + 0.9)
+    assert {(slot.primary, slot.aux) for slot in result.slots} == {
+        ("Lightning Core", "Berserker's Eye"),
+        ("Chained Death", "Zod Stone"),
+    }
+
+
+def test_loadout_is_optimal():
+    """Test that the search finds the best loadout on small random inputs."""
+    rng = random.Random(7)
+    for _ in range(50):
+        candidates = [
+            GemCandidate(
+                f"gem {i}",
+                rng.choice([1, 2, 5]),
+                rng.choice([None, rng.random()]),
+                rng.random()
+            )
+            for i in range(rng.randint(1, 7))
+        ]
+        rules = GemSlotRules(primary_count=rng.randint(1, 3), star_ratings=frozenset({1, 2, 5}))
+        result = optimize_gem_loadout(candidates, rules)
+        expected = brute_force(candidates, rules)
+        if expected is None:
+            assert result.slots == []
+        else:
+            assert result.score == pytest.approx(expected)
+
+
+def test_loadout_fills_every_primary_slot():
+    """Test that too few possible primary gems give no loadout rather than a partial one."""
+    candidates = [
+        GemCandidate("Berserker's Eye", 5, 0.9, 0.95),
+        GemCandidate("Lightning Core", 5, None, 0.3),
+    ]
+    result = optimize_gem_loadout(candidates, RULES)
+
+    assert result.complete
+    assert result.slots == [] and result.score == 0.0
+
+
+def test_time_budget_reports_optimality_gap():
+    """Test that a cut short search returns its best loadout and a bound on the optimum."""
+    rng = random.Random(3)
+    candidates = [
+        GemCandidate(f"gem {i}", rng.choice([1, 2, 5]), rng.random(), rng.random())
+        for i in range(150)
+    ]
+    rules = GemSlotRules(primary_count=8, star_ratings=frozenset({1, 2, 5}))
+    result = optimize_gem_loadout(candidates, rules, time_budget=0.0)
+
+    assert not result.complete
+    assert result.upper_bound >= result.score
+    assert result.gap == pytest.approx(result.upper_bound - result.score)
+    if result.slots:
+        assert len(result.slots) == 8
+
+
+def test_rules_read_game_constraints():
+    """Test that the gem slot constraints become search rules."""
+    rules = GemSlotRules.from_constraints({"gem_slots": {
+        "total_required": 8,
+        "primary": {"required": 8, "unique": True, "star_ratings": [1, 2, 5]},
+        "auxiliary": {"required": 0, "must_match_primary_stars": True, "unique": True}
+    }})
+
+    assert rules == GemSlotRules(8, frozenset({1, 2, 5}), 0, True)
+
+
+@pytest.mark.asyncio
+async def test_service_scores_catalog_gems_as_candidates(game_data_settings: Settings):
+    """Test that focus gems can be primary gems and every catalog gem an aux gem."""
+    service = BuildService(settings=game_data_settings)
+    try:
+        catalog = await service.data_manager.get_gem_catalog()
+        focus_gems = [gem.name for gem in catalog.query(stars=5, limit=2)]
+        service.synergies = {"survival": {"gems": focus_gems}}
+        service.stat_boosts = await service.data_manager.get_data("gems/stat_boosts")
+
+        candidates = await service._gem_candidates(BuildType.RAID, BuildFocus.SURVIVAL)
+
+        assert len(candidates) == len(catalog)
+        assert [c.name for c in candidates if c.primary_score is not None] == focus_gems
+        assert all(c.stars in (1, 2, 5) for c in candidates)
+    finally:
+        await service.data_manager.close()
+
+
+@pytest.mark.asyncio
+async def test_service_fills_every_slot_from_game_data(game_data_settings: Settings):
+    """Test that the shipped synergies give every build type and focus a full loadout."""
+    data_manager = GameDataManager(settings=game_data_settings)
+    try:
+        service = await BuildService.create(data_manager)
+        rules = GemSlotRules.from_constraints(service.constraints)
+
+        for build_type, focus in product(BuildType, BuildFocus):
+            gems = await service._select_gems(build_type, focus)
+            assert len(gems) == rules.primary_count, (build_type, focus)
+    finally:
+        await data_manager.close()
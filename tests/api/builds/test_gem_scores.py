@@ -0,0 +1,64 @@
+"""Tests for the precomputed gem score table."""
+
+import pytest
+
+from api.builds.models import BuildFocus, BuildType
+from api.builds.scoring import GemScoreTable
+from api.builds.service import BuildService
+from api.core.config import Settings
+from api.models.game_data.schemas.stats import GameStats, StatCategory, StatSource, StatValue
+from api.models.game_data.schemas.synergies import GameSynergies, SynergyGroup
+
+SYNERGIES = {
+    "metadata": {"version": "1.0"},
+    "critical_hit": {"gems": ["Berserker's Eye", "Lightning Core"]},
+    "movement_speed": {"gems": ["Lightning Core"]},
+}
+STAT_BOOSTS = {
+    "critical_hit": {"Berserker's Eye": {"rank_10": 50.0, "scaling": True}},
+    "movement_speed": {"Lightning Core": {"rank_10": 250.0}},
+}
+
+
+def test_table_scores_every_build_type_and_focus():
+    """Test that looked up scores weigh each category's rank 10 value."""
+    table = GemScoreTable.build(SYNERGIES, STAT_BOOSTS)
+
+    assert len(table) == 2
+    assert table.score("Berserker's Eye", BuildType.RAID, BuildFocus.DPS) == pytest.approx(0.7)
+    assert table.score("Berserker's Eye", BuildType.PVP, BuildFocus.DPS) == pytest.approx(0.63)
+    # Unweighted critical hit counts half, the capped movement speed boost in full
+    assert table.score("Lightning Core", BuildType.PVP, BuildFocus.BUFF) == pytest.approx(1.0 / 1.5)
+    assert table.score("Chained Death", BuildType.FARM, BuildFocus.DPS) == 0.0
+    assert table.categories("Lightning Core") == {"critical_hit", "movement_speed"}
+
+
+def test_table_reads_game_data_models():
+    """Test that the validated synergy and stat models score like their JSON form."""
+    synergies = GameSynergies(movement_speed=SynergyGroup(gems=["Lightning Core"]))
+    stats = GameStats(movement_speed=StatCategory(gems=[
+        StatSource(name="Lightning Core", rank_10_values=[StatValue(value=40.0, scaling=True)])
+    ]))
+    table = GemScoreTable.build(synergies, stats)
+
+    assert table.score("Lightning Core", BuildType.RAID, BuildFocus.BUFF) == pytest.approx(0.54)
+    assert table.score("Lightning Core", BuildType.RAID, BuildFocus.BUFF) == GemScoreTable.build(
+        {"movement_speed": {"gems": ["Lightning Core"]}},
+        {"movement_speed": {"Lightning Core": {"rank_10": 40.0, "scaling": True}}}
+    ).score("Lightning Core", BuildType.RAID, BuildFocus.BUFF)
+
+
+@pytest.mark.asyncio
+async def test_table_is_built_once_per_generation(game_data_settings: Settings):
+    """Test that the service reuses the table until the game data changes."""
+    service = BuildService(settings=game_data_settings)
+    try:
+        table = await service._gem_score_table()
+        assert await service._gem_score_table() is table
+
+        service.data_manager.mark_stale()
+        await service.data_manager.refresh()
+
+        assert await service._gem_score_table() is not table
+    finally:
+        await service.data_manager.close()
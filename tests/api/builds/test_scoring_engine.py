@@ -0,0 +1,157 @@
+"""Tests for the feature matrix scoring engine."""
+
+from itertools import product
+
+import pytest
+
+from api.builds.features import BACKENDS, FeatureMatrix, tolist
+from api.builds.models import BuildFocus, BuildType
+from api.builds.scoring import EssenceScorer, SetScorer, SkillScorer, essence_score
+from api.builds.service import BuildService
+from api.core.config import Settings
+from api.models.game_data.manager import GameDataManager
+
+BUILDS = list(product(BuildType, BuildFocus))
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_matrix_multiplies_named_features(backend: str):
+    """Test that rows missing a feature count it as 0.0."""
+    matrix = FeatureMatrix([{"a": 1.0, "b": 2.0}, {"b": 3.0}, {}], backend)
+
+    assert matrix.columns == ["a", "b"]
+    assert tolist(matrix.dot(matrix.weights({"a": 10.0}, default=1.0))) == [12.0, 3.0, 0.0]
+
+
+def test_matrix_rejects_unknown_backend():
+    """Test that an unavailable backend is an error, not a silent fallback."""
+    with pytest.raises(ValueError):
+        FeatureMatrix([{"a": 1.0}], "fortran")
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_skill_scores_weigh_types_categories_and_gem_synergies(backend: str):
+    """Test that skill scores are weighted features over the weights that applied."""
+    registry = {
+        "Whirlwind": {"base_type": "damage", "second_base_type": "aoe"},
+        "Charge": {"base_type": "mobility", "categories": ["area"]},
+        "Shout": {"base_type": "support"},
+    }
+    synergies = {"control": {"gems": ["Lightning Core"], "skills": ["Shout"]}}
+    scorer = SkillScorer(registry, {BuildFocus.DPS: {"area"}}, synergies, backend)
+
+    scores = scorer.scores(BuildType.RAID, BuildFocus.DPS)
+    assert scores["Whirlwind"] == pytest.approx((1.0 + 0.45) / 1.5)
+    assert scores["Charge"] == pytest.approx((0.3 + 0.3) / 1.3)
+    assert scores["Shout"] == 0.0
+
+    scores = scorer.scores(BuildType.RAID, BuildFocus.DPS, {"control": 2})
+    assert scores["Shout"] == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_essence_scores_match_single_essence_rules(backend: str):
+    """Test that batch scores equal the per-essence rules for every build."""
+    effects = ["Deals damage", "Damage increased by 20%", "Cooldown reduced by 2 seconds"]
+    tags = [[], ["attack_speed"], ["utility"], ["pvp"], ["pve"], ["farm"]]
+    essences = {
+        f"essence_{i}": {
+            "essence_name": f"Essence {i}",
+            "modifies_skill": "Whirlwind" if i % 2 else "Charge",
+            "effect": effect,
+            "effect_type": effect_type,
+            "effect_tags": effect_tags,
+        }
+        for i, (effect_type, effect, effect_tags) in enumerate(
+            product(["damage", "control", "buff", "utility"], effects, tags)
+        )
+    }
+    scorer = EssenceScorer(essences, backend)
+
+    for build_type, focus in BUILDS:
+        scores = scorer.scores(build_type, focus, {"Whirlwind"})
+        for key, essence in essences.items():
+            assert scores[key] == pytest.approx(essence_score(essence, build_type, focus, {"Whirlwind"}))
+
+    raid_scores = scorer.scores(BuildType.RAID, BuildFocus.DPS)
+    assert raid_scores["essence_0"] == pytest.approx(1.0)
+    assert raid_scores["essence_18"] == pytest.approx(0.1)
+    assert raid_scores["essence_54"] == 0.0
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_set_scores_read_bonus_descriptions_and_synergies(backend: str):
+    """Test that set scores weigh bonus stats per focus and selected item synergies."""
+    sets = {
+        "registry": {
+            "War Rags": {
+                "pieces": 6,
+                "description": "Primary attacks",
+                "bonuses": {
+                    "2": "Increases Primary Attack damage by 15%.",
+                    "4": "Increases Primary Attack Speed by 30%.",
+                    "6": "Gain bonus damage after dashing."
+                },
+                "use_case": "PvE"
+            },
+            "Mountebank": {
+                "pieces": 6,
+                "description": "Shields",
+                "bonuses": {"2": "Gain a shield equal to 13% of your maximum Life."},
+                "use_case": "PvP"
+            },
+        }
+    }
+    scorer = SetScorer(sets, backend)
+
+    assert scorer.scores(BuildType.RAID, BuildFocus.DPS) == pytest.approx(
+        {"War Rags": (15 * 0.4 + 30 * 0.3) / 100, "Mountebank": 0.0}
+    )
+    assert scorer.scores(BuildType.RAID, BuildFocus.SURVIVAL)["Mountebank"] == pytest.approx(0.052)
+
+    legacy = SetScorer({"Old Set": {
+        "bonus_2pc": {"damage": 10},
+        "skill_synergies": {"Whirlwind": {"damage": 20, "defense": 40}},
+        "gem_synergies": {"Lightning Core": {"effect_bonus": 50}},
+    }}, backend)
+    assert legacy.scores(
+        BuildType.PVP, BuildFocus.DPS, skills={"Whirlwind"}, gems={"Lightning Core"}
+    )["Old Set"] == pytest.approx((4 + 10 + 15) / 100)
+
+
+@pytest.mark.asyncio
+async def test_scorers_are_built_once_per_generation(game_data_settings: Settings):
+    """Test that the service reuses a class's essence scorer until the game data changes."""
+    service = BuildService(settings=game_data_settings)
+    try:
+        scorer = await service._essence_scorer("barbarian")
+        assert len(scorer.matrix) == len(await service.data_manager.get_class_essences("barbarian"))
+        assert await service._essence_scorer("barbarian") is scorer
+        assert await service._set_scorer() is await service._set_scorer()
+
+        service.data_manager.mark_stale()
+        await service.data_manager.refresh()
+
+        assert await service._essence_scorer("barbarian") is not scorer
+    finally:
+        await service.data_manager.close()
+
+
+@pytest.mark.asyncio
+async def test_services_share_their_data_manager(game_data_settings: Settings):
+    """Test that services created per request reuse the entries of one data manager."""
+    data_manager = GameDataManager(settings=game_data_settings)
+    try:
+        first = await BuildService.create(data_manager)
+        second = await BuildService.create(data_manager)
+
+        assert first.data_manager is second.data_manager is data_manager
+        assert first.class_data is second.class_data
+        assert await first._essence_scorer("barbarian") is await second._essence_scorer("barbarian")
+
+        data_manager.mark_stale()
+        await data_manager.refresh()
+
+        assert (await BuildService.create(data_manager)).class_data is not first.class_data
+    finally:
+        await data_manager.close()
@@ -0,0 +1,87 @@
+"""Tests for the equipment set combination search."""
+
+from itertools import permutations
+
+import pytest
+
+from api.builds.models import BuildFocus, BuildType
+from api.builds.scoring import SetScorer
+from api.builds.set_search import (
+    DEFAULT_COMBINATIONS,
+    SetChoice,
+    best_set_combination,
+    set_combinations,
+)
+
+
+def brute_force(bonus_values, combinations) -> float:
+    """Best total value, trying every assignment of sets to parts."""
+    best = None
+    for combination in combinations:
+        for sets in permutations(bonus_values, len(combination)):
+            if all(size in bonus_values[name] for name, size in zip(sets, combination)):
+                score = sum(bonus_values[name][size] for name, size in zip(sets, combination))
+                best = score if best is None else max(best, score)
+    return best
+
+
+def test_search_prefers_the_best_split():
+    """Test that a split other than 6+2 wins when its bonuses are worth more."""
+    bonus_values = {
+        "Grace of the Flagellant": {2: 0.2, 4: 0.3, 6: 0.35},
+        "War Rags of Shal'baas": {2: 0.25, 4: 0.4, 6: 0.45},
+        "Banquet of Eyes": {2: 0.3, 4: 0.35, 6: 0.4},
+        "Seeds of Sown Gold": {2: 0.05, 4: 0.05, 6: 0.05},
+    }
+    combination = best_set_combination(bonus_values)
+
+    assert combination.score == pytest.approx(0.4 + 0.3 + 0.2)
+    assert combination.choices == [
+        SetChoice("War Rags of Shal'baas", 4),
+        SetChoice("Banquet of Eyes", 2),
+        SetChoice("Grace of the Flagellant", 2),
+    ]
+
+
+def test_search_is_optimal_for_every_combination():
+    """Test that the search matches trying every assignment."""
+    bonus_values = {
+        f"set {i}": {size: ((i * 7 + size * 3) % 11) / 10 for size in (2, 4, 6) if size <= 2 + 2 * (i % 3)}
+        for i in range(7)
+    }
+    for combinations in ([(6, 2)], [(4, 4)], [(4, 2, 2)], [(2, 2, 2, 2)], DEFAULT_COMBINATIONS):
+        combination = best_set_combination(bonus_values, combinations)
+        assert combination.score == pytest.approx(brute_force(bonus_values, combinations))
+        assert sorted(choice.pieces for choice in combination.choices) in [
+            sorted(parts) for parts in combinations
+        ]
+        assert len({choice.set_name for choice in combination.choices}) == len(combination.choices)
+
+
+def test_search_without_enough_sets():
+    """Test that no combination is returned when the slots cannot be filled."""
+    assert best_set_combination({"Angmet's Conflagration": {2: 0.5}}) is None
+    assert set_combinations({"set_slots": {"valid_combinations": [[2, 6]]}}) == [(6, 2)]
+
+
+def test_bonus_values_add_reached_thresholds():
+    """Test that a piece count is worth the bonuses of every threshold it reaches."""
+    scorer = SetScorer({"War Rags": {
+        "pieces": 6,
+        "bonuses": {
+            "2": "Increases Primary Attack damage by 15%.",
+            "4": "Increases Primary Attack Speed by 30%.",
+            "6": "Critical Hit Chance increased by 10%."
+        },
+        "skill_synergies": {"Whirlwind": {"damage": 20}},
+    }})
+
+    values = scorer.bonus_values(BuildType.RAID, BuildFocus.DPS, (2, 4, 6), skills={"Whirlwind"})
+    assert values["War Rags"] == pytest.approx({
+        2: (6 + 10) / 100,
+        4: (6 + 9 + 10) / 100,
+        6: (6 + 9 + 3 + 10) / 100,
+    })
+    assert values["War Rags"][6] == pytest.approx(
+        scorer.scores(BuildType.RAID, BuildFocus.DPS, skills={"Whirlwind"})["War Rags"]
+    )
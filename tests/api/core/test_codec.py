@@ -0,0 +1,53 @@
+"""Tests for the JSON codec layer."""
+
+import json
+
+import pytest
+
+from api.core import codec
+from api.core.codec import CODECS, CodecJSONResponse
+
+
+@pytest.fixture
+def restore_codec():
+    """Restore the selected codec after a test changes it."""
+    current = codec.get_codec()
+    yield
+    codec.set_codec(current.name)
+
+
+@pytest.mark.parametrize("name", sorted(CODECS))
+def test_codecs_agree_with_stdlib(name: str):
+    """Test that every installed codec round-trips data like the standard library."""
+    document = {"name": "Mother's Lament", "ranks": {"1": [1.5, 2]}, "tags": ["é", None, True]}
+    text = json.dumps(document)
+
+    assert CODECS[name].loads(text) == document
+    assert CODECS[name].loads(text.encode()) == document
+    assert json.loads(CODECS[name].dumps(document)) == document
+    with pytest.raises(ValueError):
+        CODECS[name].loads(b"{not json")
+
+
+def test_set_codec_falls_back_to_stdlib(restore_codec):
+    """Test that the standard library codec can always be selected."""
+    assert codec.set_codec("json").name == "json"
+    assert codec.dumps({"a": [1, "b"]}) == b'{"a":[1,"b"]}'
+    assert codec.get_codec("auto").name == next(n for n in codec.PREFERENCE if n in CODECS)
+
+    with pytest.raises(ValueError, match="Unknown JSON codec"):
+        codec.set_codec("yaml")
+
+
+def test_load_file_and_response(tmp_path):
+    """Test file parsing and response rendering with the selected codec."""
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps({"gems": ["Chained Death"]}))
+
+    assert codec.load_file(path) == {"gems": ["Chained Death"]}
+    with pytest.raises(FileNotFoundError):
+        codec.load_file(tmp_path / "missing.json")
+
+    response = CodecJSONResponse({"stars": 5})
+    assert json.loads(response.body) == {"stars": 5}
+    assert response.headers["content-type"] == "application/json"
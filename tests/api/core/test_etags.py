@@ -0,0 +1,103 @@
+"""Tests for the ETag middleware."""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.core.cache import ETagMiddleware, data_version
+
+
+class StubDataManager:
+    """Data manager stand-in with a settable content hash."""
+
+    def __init__(self) -> None:
+        self.content_hash = "a" * 64
+
+    async def pinned_cache(self) -> SimpleNamespace:
+        return SimpleNamespace(
+            content_hash=self.content_hash,
+            metadata=SimpleNamespace(version="1.0", last_updated=datetime(2025, 1, 3))
+        )
+
+
+def make_app() -> tuple:
+    """Build an app with a tagged game route and an excluded builds route."""
+    app = FastAPI()
+    app.state.data_manager = StubDataManager()
+    calls = {"gems": 0}
+
+    @app.get("/game/gems")
+    async def gems(stars: int = 0):
+        calls["gems"] += 1
+        return {"stars": stars}
+
+    @app.get("/game/builds/{gist_id}")
+    async def build(gist_id: str):
+        return {"id": gist_id}
+
+    app.add_middleware(ETagMiddleware, prefix="/game/", exclude=["/game/builds"], app_version="1")
+    return app, calls
+
+
+def test_matching_etag_short_circuits_to_304():
+    """Test that If-None-Match with the current ETag skips the route."""
+    app, calls = make_app()
+    client = TestClient(app)
+
+    etag = client.get("/game/gems?stars=5").headers["etag"]
+    not_modified = client.get("/game/gems?stars=5", headers={"If-None-Match": f'"other", W/{etag}'})
+
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+    assert not_modified.content == b""
+    assert calls["gems"] == 1
+
+
+def test_etag_changes_with_data_and_parameters():
+    """Test that the ETag covers the data version and the query parameters."""
+    app, calls = make_app()
+    client = TestClient(app)
+
+    etag = client.get("/game/gems?stars=5").headers["etag"]
+    assert client.get("/game/gems?stars=1").headers["etag"] != etag
+
+    app.state.data_manager.content_hash = "b" * 64
+    stale = client.get("/game/gems?stars=5", headers={"If-None-Match": etag})
+
+    assert stale.status_code == 200
+    assert stale.headers["etag"] != etag
+    assert calls["gems"] == 3
+
+
+def test_builds_and_errors_are_not_tagged():
+    """Test that excluded paths and error responses carry no ETag."""
+    app, _ = make_app()
+    client = TestClient(app)
+
+    assert "etag" not in client.get("/game/builds/abc").headers
+    assert "etag" not in client.get("/game/gems?stars=x").headers
+
+
+def test_data_version_falls_back_to_metadata():
+    """Test that generations loaded without a content hash use the metadata timestamp."""
+    cache = SimpleNamespace(
+        content_hash=None,
+        metadata=SimpleNamespace(version="1.0", last_updated=datetime(2025, 1, 3))
+    )
+
+    assert data_version(cache) == "1.0@2025-01-03T00:00:00"
+
+
+def test_compressed_variants_get_their_own_etag():
+    """Test that a compressed response has a distinct ETag that still revalidates."""
+    app, _ = make_app()
+    client = TestClient(app, headers={"Accept-Encoding": "identity"})
+    raw_etag = client.get("/game/gems").headers["etag"]
+    gzip_etag = ETagMiddleware.encoded_etag(raw_etag.encode(), b"gzip").decode()
+
+    assert gzip_etag == raw_etag[:-1] + '-gzip"'
+    not_modified = client.get("/game/gems", headers={"If-None-Match": gzip_etag})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == gzip_etag
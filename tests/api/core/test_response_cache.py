@@ -0,0 +1,184 @@
+"""Tests for the response cache middleware."""
+
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+import gzip
+
+from api import main
+from api.routes.game import CACHED_ROUTES
+from api.core.cache import (
+    CachedResponse, ResponseCache, ResponseCacheMiddleware, choose_encoding
+)
+
+
+class StubDataManager:
+    """Data manager stand-in with a settable generation."""
+
+    def __init__(self) -> None:
+        self.generation = 0
+
+    async def pinned_cache(self) -> SimpleNamespace:
+        return SimpleNamespace(generation=self.generation)
+
+
+def make_app(cache: ResponseCache) -> tuple:
+    """Build an app with one cached and one uncached route counting their calls."""
+    app = FastAPI()
+    app.state.data_manager = StubDataManager()
+    calls = {"cached": 0, "uncached": 0}
+
+    @app.get("/cached")
+    async def cached(fail: bool = False):
+        calls["cached"] += 1
+        if fail:
+            return JSONResponse({"detail": "boom"}, status_code=500)
+        return {"calls": calls["cached"]}
+
+    @app.get("/large")
+    async def large():
+        calls["cached"] += 1
+        return {"gems": ["Berserker's Eye"] * 200}
+
+    @app.get("/uncached")
+    async def uncached():
+        calls["uncached"] += 1
+        return {"calls": calls["uncached"]}
+
+    app.add_middleware(ResponseCacheMiddleware, cache=cache, paths=["/cached", "/large"])
+    return app, calls
+
+
+def test_cached_route_runs_once_per_generation():
+    """Test that repeated requests replay the stored bytes until the generation changes."""
+    cache = ResponseCache()
+    app, calls = make_app(cache)
+    client = TestClient(app)
+
+    first = client.get("/cached?b=2&a=1")
+    second = client.get("/cached?a=1&b=2")
+
+    assert first.headers["x-cache"] == "MISS"
+    assert second.headers["x-cache"] == "HIT"
+    assert second.content == first.content
+    assert second.headers["content-type"] == "application/json"
+    assert calls["cached"] == 1
+
+    app.state.data_manager.generation = 1
+    third = client.get("/cached?a=1&b=2")
+
+    assert third.headers["x-cache"] == "MISS"
+    assert third.json() == {"calls": 2}
+    assert cache.stats == {
+        "hits": 1, "misses": 2, "evictions": 0, "invalidations": 1, "entries": 1
+    }
+
+
+def test_errors_and_other_routes_are_not_cached():
+    """Test that only successful responses of the configured paths are stored."""
+    cache = ResponseCache()
+    app, calls = make_app(cache)
+    client = TestClient(app)
+
+    assert client.get("/cached?fail=true").status_code == 500
+    assert client.get("/cached?fail=true").headers["x-cache"] == "MISS"
+    client.get("/uncached")
+    assert "x-cache" not in client.get("/uncached").headers
+
+    assert calls == {"cached": 2, "uncached": 2}
+    assert cache.stats["entries"] == 0
+
+
+def test_cache_evicts_least_recently_used():
+    """Test that the cache stays within its size bound."""
+    cache = ResponseCache(max_entries=2)
+    response = CachedResponse(200, [], b"{}", {})
+    keys = [ResponseCache.make_key(f"/{name}", b"", 0) for name in "abc"]
+
+    cache.put(keys[0], response)
+    cache.put(keys[1], response)
+    cache.get(keys[0])
+    cache.put(keys[2], response)
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is response
+    assert cache.stats["evictions"] == 1
+
+    # Responses for an older generation than the newest one seen are not stored
+    cache.put(ResponseCache.make_key("/a", b"", 1), response)
+    cache.put(keys[0], response)
+    assert cache.stats["entries"] == 1
+
+
+def test_compressed_variants_follow_accept_encoding():
+    """Test that large responses are compressed once and served per Accept-Encoding."""
+    cache = ResponseCache()
+    app, calls = make_app(cache)
+    client = TestClient(app)
+
+    compressed = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    raw = client.get("/large", headers={"Accept-Encoding": "identity"})
+
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["vary"] == "Accept-Encoding"
+    assert "content-encoding" not in raw.headers
+    assert raw.headers["x-cache"] == "HIT"
+    assert int(raw.headers["content-length"]) == len(raw.content)
+    assert compressed.json() == raw.json()
+    assert calls["cached"] == 1
+
+    entry = cache.get(ResponseCache.make_key("/large", b"", 0))
+    assert gzip.decompress(entry.variants["gzip"]) == entry.body
+    assert len(entry.variants["gzip"]) < len(entry.body)
+
+    small = client.get("/cached", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+
+
+def test_choose_encoding_honors_quality_values():
+    """Test Accept-Encoding negotiation against the available variants."""
+    available = {"gzip": b""}
+
+    assert choose_encoding(b"gzip, deflate", available) == "gzip"
+    assert choose_encoding(b"*", available) == "gzip"
+    assert choose_encoding(b"gzip;q=0", available) is None
+    assert choose_encoding(b"deflate", available) is None
+    assert choose_encoding(None, available) is None
+    assert choose_encoding(b"gzip", {}) is None
+
+
+def test_cors_headers_follow_each_request_origin(monkeypatch: pytest.MonkeyPatch):
+    """Test that a cached response gets the CORS headers of the request it is replayed to."""
+    settings = main.settings.model_copy(update={
+        "BACKEND_CORS_ORIGINS": "http://localhost:3000,http://localhost:8000",
+        "DATA_WATCH_ENABLED": False,
+    })
+    monkeypatch.setattr(main, "settings", settings)
+    url = f"{settings.API_V1_STR}/game/modes"
+
+    with TestClient(main.create_app()) as client:
+        first = client.get(url, headers={"Origin": "http://localhost:3000"})
+        second = client.get(url, headers={"Origin": "http://localhost:8000"})
+        third = client.get(url)
+
+    assert first.headers["access-control-allow-origin"] == "http://localhost:3000"
+    assert second.headers["x-cache"] == "HIT"
+    assert second.headers["access-control-allow-origin"] == "http://localhost:8000"
+    assert third.headers["x-cache"] == "HIT"
+    assert "access-control-allow-origin" not in third.headers
+
+
+def test_cached_routes_serve_the_game_data(monkeypatch: pytest.MonkeyPatch):
+    """Test that every cached game route answers from the data manager."""
+    monkeypatch.setattr(main, "settings", main.settings.model_copy(update={"DATA_WATCH_ENABLED": False}))
+    prefix = f"{main.settings.API_V1_STR}/game"
+
+    with TestClient(main.create_app()) as client:
+        for path in CACHED_ROUTES:
+            response = client.get(prefix + path)
+            assert response.status_code == 200, path
+            assert response.json(), path
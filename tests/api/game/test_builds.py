@@ -20,6 +20,8 @@ def test_generate_build_basic(client: TestClient):
     assert isinstance(data, dict)
     assert "class_type" in data
     assert data["class_type"] == "barbarian"
+    assert len(data["build"]["gems"]) == 8
+    assert len(data["build"]["skills"]) == 5
 
 
 def test_generate_build_invalid_class(client: TestClient):
@@ -114,3 +116,29 @@ def test_generate_build_with_inventory(client: TestClient):
     assert "class_type" in data
     assert data["class_type"] == "barbarian"
     # Additional inventory-specific assertions can be added here
+
+
+def test_optimize_builds(client: TestClient):
+    """Test that the joint build search returns complete builds, best first."""
+    response = client.post(
+        "/api/v1/game/builds/optimize",
+        params={
+            "build_type": "raid",
+            "focus": "dps",
+            "character_class": "barbarian",
+            "beam_width": 8,
+            "top_k": 2
+        }
+    )
+    assert response.status_code == 200
+    builds = response.json()
+    assert 0 < len(builds) <= 2
+
+    build = builds[0]
+    assert len(build["gems"]) == 8
+    assert len({gem["name"] for gem in build["gems"]}) == 8
+    assert len(build["skills"]) == 5
+    assert build["skills"][0]["name"] in ("Frenzy", "Lacerate")
+    assert [piece["slot"] for piece in build["equipment"]] == [
+        "Neck", "Waist", "Hands", "Feet", "Ring 1", "Ring 2", "Bracer 1", "Bracer 2"
+    ]
@@ -1,4 +1,6 @@
-"""Tests for stat schema models."""
+"""Tests for stat schema models and the stats endpoints."""
+
+from fastapi.testclient import TestClient
 
 from api.models.game_data.schemas.stats import (
     StatInfo,
@@ -196,3 +198,25 @@ def test_game_stats():
     assert isinstance(stats.attack_speed, StatCategory)
     assert isinstance(stats.movement_speed, StatCategory)
     assert isinstance(stats.life, StatCategory)
+
+
+def test_list_stats(client: TestClient):
+    """Test that the stats are listed by category."""
+    response = client.get("/api/v1/game/stats")
+    assert response.status_code == 200
+    stats = response.json()["stats"]
+    assert "attack_speed" in stats["offensive"]
+    assert "life" in stats["defensive"]
+    assert "movement_speed" in stats["utility"]
+
+
+def test_get_stat_details(client: TestClient):
+    """Test stat details and a missing stat."""
+    response = client.get("/api/v1/game/stats/attack_speed")
+    assert response.status_code == 200
+    stat = response.json()
+    assert stat["category"] == "offensive"
+    assert stat["description"] == "Increases attack speed"
+    assert "gems" in stat["sources"]
+
+    assert client.get("/api/v1/game/stats/not_a_stat").status_code == 404
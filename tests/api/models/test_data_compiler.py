@@ -0,0 +1,145 @@
+"""Tests for the game data compiler and the dibo-data command."""
+
+import json
+
+import pytest
+
+from api.core.config import Settings
+from api.models.game_data import compiler
+from api.models.game_data.cli import main
+from api.models.game_data.compiler import (
+    check_data,
+    compile_data,
+    dependency_graph,
+    graph_sources,
+    verify_data_pack,
+)
+from api.models.game_data.manager import GameDataManager
+
+GEM_FILE = "gems/core/1star/chained_death.json"
+
+
+def test_check_data_reports_index_inconsistencies(game_data_settings: Settings):
+    """Test that gem index problems are errors and count mismatches are warnings."""
+    data_path = game_data_settings.data_path
+    assert check_data(game_data_settings).errors == []
+
+    gem_file = data_path / GEM_FILE
+    gem = json.loads(gem_file.read_text())
+    gem["name"] = "Chained Life"
+    gem_file.write_text(json.dumps(gem))
+    (data_path / "gems/core/1star/stray.json").write_text(json.dumps(gem))
+    (data_path / "constraints.json").write_text("{not json")
+
+    issues = {(issue.path, issue.severity) for issue in check_data(game_data_settings).issues}
+
+    assert (GEM_FILE, "error") in issues
+    assert ("gems/core/1star/stray.json", "error") in issues
+    assert ("constraints.json", "error") in issues
+    assert ("classes/index.json", "warning") in issues
+
+
+def test_graph_covers_runtime_sources(game_data_settings: Settings):
+    """Test that the compiler hashes the same files the runtime checks the pack against."""
+    manager = GameDataManager(settings=game_data_settings)
+    graph = dependency_graph(game_data_settings.data_path)
+
+    assert graph_sources(graph) == sorted(set(manager.source_files()))
+
+
+@pytest.mark.asyncio
+async def test_gem_metadata_categories_read_metadata_files(game_data_settings: Settings):
+    """Test that gem stat boosts and synergies are read from the gems/metadata files."""
+    manager = GameDataManager(settings=game_data_settings)
+    try:
+        stat_boosts = await manager.get_data("gems/stat_boosts")
+        synergies = await manager.get_data("gems/synergies")
+    finally:
+        await manager.close()
+
+    assert "Blessing of the Worthy" in {source.name for source in stat_boosts.life.gems}
+    assert "Berserker's Eye" in synergies.damage_boost.gems
+    assert "gems/metadata/stat_boosts/life.json" in manager.source_files()
+    assert "gems/metadata/synergies/categories.json" in manager.source_files()
+
+
+@pytest.mark.asyncio
+async def test_compile_then_verify(game_data_settings: Settings):
+    """Test that a compiled pack verifies and serves until a source file changes."""
+    result = compile_data(game_data_settings)
+    assert result.manifest is not None
+    assert "classes/barbarian/essences.json" in result.manifest.files
+    assert verify_data_pack(game_data_settings).up_to_date
+
+    manager = GameDataManager(settings=game_data_settings)
+    engine = await manager.get_essence_engine("barbarian")
+    catalog = await manager.get_gem_catalog()
+    assert len(engine) > 0 and len(catalog) > 0
+    assert manager.load_timings["source"] == "pack"
+    await manager.close()
+
+    gem_file = game_data_settings.data_path / GEM_FILE
+    gem_file.write_text(gem_file.read_text() + "\n")
+    verify = verify_data_pack(game_data_settings)
+
+    assert not verify.up_to_date
+    assert verify.changed == [GEM_FILE]
+
+
+@pytest.mark.asyncio
+async def test_incremental_compile_rebuilds_dependents_only(game_data_settings: Settings, monkeypatch):
+    """Test that a changed gem file is the only one validated again."""
+    full = compile_data(game_data_settings)
+    assert full.reused == []
+
+    parsed = []
+    load_gem_file = compiler.load_gem_file
+    monkeypatch.setattr(compiler, "load_gem_file", lambda path: parsed.append(path) or load_gem_file(path))
+
+    unchanged = compile_data(game_data_settings)
+    assert unchanged.changed == [] and unchanged.rebuilt == [] and parsed == []
+
+    gem_file = game_data_settings.data_path / GEM_FILE
+    gem = json.loads(gem_file.read_text())
+    gem["magic_find"] = "2%"
+    gem_file.write_text(json.dumps(gem))
+    result = compile_data(game_data_settings)
+
+    assert result.changed == [GEM_FILE]
+    assert parsed == [gem_file]
+    assert set(result.rebuilt) == {"gems/files", "gems/data", "names/gems", "gems/index", "gems/catalog"}
+    assert "essences/barbarian/engine" in result.reused
+    assert verify_data_pack(game_data_settings).up_to_date
+
+    manager = GameDataManager(settings=game_data_settings)
+    gems = await manager.get_data("gems/data")
+    assert gems["Chained Death"].magic_find == "2%"
+    assert manager.load_timings["source"] == "pack"
+    await manager.close()
+
+
+def test_compile_refuses_blocking_issues(game_data_settings: Settings):
+    """Test that errors, and warnings in strict mode, stop the pack from being written."""
+    strict = compile_data(game_data_settings, strict=True)
+    assert strict.manifest is None
+    assert strict.issues and not strict.errors
+
+    (game_data_settings.data_path / "sets.json").unlink()
+    result = compile_data(game_data_settings)
+
+    assert result.manifest is None
+    assert [issue.path for issue in result.errors] == ["sets.json"]
+    assert verify_data_pack(game_data_settings).problems == ["No data pack manifest"]
+
+
+def test_cli_exit_status(game_data_settings: Settings, monkeypatch, capsys):
+    """Test that dibo-data reports failures through its exit status."""
+    monkeypatch.setattr("api.models.game_data.cli.get_settings", lambda: game_data_settings)
+
+    assert main(["check"]) == 0
+    assert main(["check", "--strict"]) == 1
+    assert main(["verify"]) == 1
+    assert main(["compile"]) == 0
+    assert main(["verify"]) == 0
+    assert main(["compile", "--full"]) == 0
+    assert "is up to date" in capsys.readouterr().out
@@ -0,0 +1,98 @@
+"""Tests for generation-pinned game data reloads."""
+
+import gc
+import json
+
+import pytest
+
+from api.core.config import Settings
+from api.models.game_data.manager import GameDataManager
+from api.models.game_data.pinning import pinned_generation
+
+
+def set_total_gem_slots(settings: Settings, total: int) -> None:
+    """Change the gem slot total and bump the metadata timestamp."""
+    constraints_file = settings.data_path / "constraints.json"
+    constraints = json.loads(constraints_file.read_text())
+    constraints["gem_slots"]["total_required"] = total
+    constraints_file.write_text(json.dumps(constraints))
+
+    metadata_file = settings.data_path / "metadata.json"
+    metadata = json.loads(metadata_file.read_text())
+    metadata["last_updated"] = "2030-01-01T00:00:00"
+    metadata_file.write_text(json.dumps(metadata))
+
+
+@pytest.mark.asyncio
+async def test_pinned_request_keeps_its_generation(game_data_settings: Settings):
+    """Test that a request keeps reading the generation it started with."""
+    manager = GameDataManager(settings=game_data_settings)
+    await manager.get_data("constraints")
+
+    with pinned_generation() as pin:
+        before = await manager.get_data("constraints")
+        assert pin.get(manager).generation == 0
+
+        set_total_gem_slots(game_data_settings, 6)
+        manager.mark_stale()
+        await manager.refresh()
+        assert manager.current.generation == 1
+
+        during = await manager.get_data("constraints")
+        assert during is before
+        assert during.gem_slots["total_required"] == 8
+
+    after = await manager.get_data("constraints")
+    assert after.gem_slots["total_required"] == 6
+
+
+@pytest.mark.asyncio
+async def test_each_manager_keeps_its_own_pin(game_data_settings: Settings):
+    """Test that two managers read in one request each see their own generation."""
+    first = GameDataManager(settings=game_data_settings)
+    await first.get_data("constraints")
+    set_total_gem_slots(game_data_settings, 6)
+    second = GameDataManager(settings=game_data_settings)
+
+    with pinned_generation() as pin:
+        old = await first.get_data("constraints")
+        new = await second.get_data("constraints")
+
+        assert old.gem_slots["total_required"] == 8
+        assert new.gem_slots["total_required"] == 6
+        assert pin.get(first) is not pin.get(second)
+        assert await first.get_data("constraints") is old
+
+
+@pytest.mark.asyncio
+async def test_stale_lookup_serves_current_generation(game_data_settings: Settings):
+    """Test that stale data is served while the reload runs in the background."""
+    manager = GameDataManager(settings=game_data_settings)
+    await manager.get_data("constraints")
+
+    set_total_gem_slots(game_data_settings, 6)
+    manager._generation += 1
+
+    stale = await manager.get_data("constraints")
+    assert stale.gem_slots["total_required"] == 8
+
+    await manager.refresh()
+    fresh = await manager.get_data("constraints")
+    assert fresh.gem_slots["total_required"] == 6
+
+
+@pytest.mark.asyncio
+async def test_released_generations_are_freed(game_data_settings: Settings):
+    """Test that old generations are freed once no request pins them."""
+    manager = GameDataManager(settings=game_data_settings)
+    await manager.get_data("constraints")
+
+    with pinned_generation():
+        await manager.get_data("constraints")
+        manager.mark_stale()
+        await manager.refresh()
+        gc.collect()
+        assert manager.live_generations() == [0, 1]
+
+    gc.collect()
+    assert manager.live_generations() == [1]
@@ -0,0 +1,96 @@
+"""Tests for lazy per-category game data loading."""
+
+import asyncio
+
+import pytest
+
+from api.core.config import Settings
+from api.models.game_data import manager as manager_module
+from api.models.game_data.manager import GameDataManager
+
+
+@pytest.fixture
+def lazy_settings(game_data_settings: Settings) -> Settings:
+    """Settings with lazy game data loading enabled."""
+    return game_data_settings.model_copy(update={"GAME_DATA_LAZY": True})
+
+
+@pytest.fixture
+def loaded_files(monkeypatch: pytest.MonkeyPatch) -> list:
+    """Record every category file read by the manager."""
+    loaded = []
+    load_category_file = manager_module.load_category_file
+
+    def recording_load(data_path, model_cls, rel_path):
+        loaded.append(rel_path)
+        return load_category_file(data_path, model_cls, rel_path)
+
+    monkeypatch.setattr(manager_module, "load_category_file", recording_load)
+    return loaded
+
+
+@pytest.mark.asyncio
+async def test_lazy_mode_loads_only_requested_category(lazy_settings: Settings, loaded_files: list):
+    """Test that concurrent first hits load only their category, once."""
+    manager = GameDataManager(settings=lazy_settings)
+    try:
+        results = await asyncio.gather(*(manager.get_data("constraints") for _ in range(5)))
+
+        assert loaded_files == ["constraints.json"]
+        assert all(result is results[0] for result in results)
+        assert results[0].gem_slots["total_required"] == 8
+        assert set(manager.load_timings["categories"]) == {"constraints"}
+    finally:
+        await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_warm_preloads_chosen_categories(lazy_settings: Settings, loaded_files: list):
+    """Test that warm() loads the given categories and nothing else."""
+    manager = GameDataManager(settings=lazy_settings)
+    try:
+        await manager.warm(["constraints", "sets"])
+
+        assert sorted(loaded_files) == ["constraints.json", "sets.json"]
+        assert set(manager.current.data) == {"constraints", "sets"}
+
+        with pytest.raises(ValueError):
+            await manager.warm(["unknown"])
+    finally:
+        await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_class_essences_are_cached_per_generation(lazy_settings: Settings):
+    """Test that essences are reused within a generation and reloaded after it."""
+    manager = GameDataManager(settings=lazy_settings)
+    try:
+        first = await manager.get_essence_engine("barbarian")
+        assert len(first)
+        assert await manager.get_essence_engine("barbarian") is first
+
+        manager.mark_stale()
+        await manager.refresh()
+
+        assert await manager.get_essence_engine("barbarian") is not first
+    finally:
+        await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_preload_loads_every_entry(lazy_settings: Settings, loaded_files: list):
+    """Test that preload() loads every category and builds every derived index."""
+    manager = GameDataManager(settings=lazy_settings)
+    try:
+        entries = await manager.preload()
+
+        assert set(GameDataManager.CATEGORY_LOADERS) <= set(entries)
+        assert {"gems/catalog", "gems/index", "names/gems", "essences/barbarian/engine"} <= set(entries)
+        assert entries == sorted(manager.current.data)
+
+        loaded = len(loaded_files)
+        await manager.get_gem_catalog()
+        await manager.get_essence_engine("barbarian")
+        assert len(loaded_files) == loaded
+    finally:
+        await manager.close()
@@ -0,0 +1,133 @@
+"""Tests for the compiled game data pack."""
+
+import json
+
+import pytest
+
+from api.core.config import Settings
+from api.models.game_data import pack
+from api.models.game_data.manager import GameDataManager
+from api.models.game_data.pack import (
+    MANIFEST_FILE, PACK_FILE, DataPackReader, compute_schema_hash, load_data_pack, load_manifest
+)
+from api.models.game_data.schemas.gems import GemRegistry
+
+
+@pytest.mark.asyncio
+async def test_compile_data_pack(game_data_settings: Settings):
+    """Test that compiling writes a pack and a manifest of source hashes."""
+    manager = GameDataManager(settings=game_data_settings)
+    manifest = await manager.compile_data_pack()
+
+    pack_dir = game_data_settings.data_pack_path
+    assert (pack_dir / PACK_FILE).is_file()
+    assert (pack_dir / MANIFEST_FILE).is_file()
+    assert load_manifest(pack_dir) == manifest
+    assert set(manifest.categories) == set(GameDataManager.CATEGORY_LOADERS) | {
+        "gems/files", "gems/index", "gems/catalog", "names/gems",
+        "essences/barbarian", "essences/barbarian/engine"
+    }
+    assert "metadata.json" in manifest.files
+
+
+@pytest.mark.asyncio
+async def test_reload_uses_matching_pack(game_data_settings: Settings):
+    """Test that a matching pack is loaded without parsing the JSON sources."""
+    manifest = await GameDataManager(settings=game_data_settings).compile_data_pack()
+
+    manager = GameDataManager(settings=game_data_settings)
+
+    async def fail_json_load():
+        raise AssertionError("JSON sources should not be loaded")
+
+    manager._load_all_categories = fail_json_load
+    constraints = await manager.get_data("constraints")
+
+    assert constraints.gem_slots["total_required"] == 8
+    assert manager._cache.content_hash == manifest.content_hash
+
+
+@pytest.mark.asyncio
+async def test_reload_falls_back_when_pack_is_stale(game_data_settings: Settings):
+    """Test that changed sources bypass the pack and load the JSON files."""
+    manifest = await GameDataManager(settings=game_data_settings).compile_data_pack()
+
+    constraints_file = game_data_settings.data_path / "constraints.json"
+    constraints = json.loads(constraints_file.read_text())
+    constraints["gem_slots"]["total_required"] = 6
+    constraints_file.write_text(json.dumps(constraints))
+
+    manager = GameDataManager(settings=game_data_settings)
+    data = await manager.get_data("constraints")
+
+    assert data.gem_slots["total_required"] == 6
+    assert manager._cache.content_hash != manifest.content_hash
+
+
+@pytest.mark.asyncio
+async def test_pack_is_trusted_without_validation(game_data_settings: Settings, monkeypatch):
+    """Test that pack models are used as compiled, without validating them again."""
+    await GameDataManager(settings=game_data_settings).compile_data_pack()
+
+    def fail_validate(*args, **kwargs):
+        raise AssertionError("Trusted pack data should not be validated")
+
+    monkeypatch.setattr(GemRegistry, "model_validate", fail_validate)
+    gems = await GameDataManager(settings=game_data_settings).get_data("gems/data")
+
+    assert len(gems.root) > 0
+
+
+@pytest.mark.asyncio
+async def test_pack_requires_matching_schemas(game_data_settings: Settings):
+    """Test that a pack compiled with other schemas or with validation forced is bypassed."""
+    await GameDataManager(settings=game_data_settings).compile_data_pack()
+    pack_dir = game_data_settings.data_pack_path
+    content_hash = load_manifest(pack_dir).content_hash
+
+    assert load_data_pack(pack_dir, content_hash, compute_schema_hash()) is not None
+    assert load_data_pack(pack_dir, content_hash, "0" * 64) is None
+
+    settings = game_data_settings.model_copy(update={"GAME_DATA_VALIDATE": True})
+    manager = GameDataManager(settings=settings)
+    await manager.get_data("constraints")
+
+    assert manager.load_timings["source"] == "json"
+
+
+def test_schema_hash_covers_index_builders(monkeypatch):
+    """Test that a change to the code building the pickled indexes changes the hash."""
+    hash_file = pack.hash_file
+    before = compute_schema_hash.__wrapped__()
+
+    monkeypatch.setattr(
+        pack, "hash_file",
+        lambda path: "changed" if path.name == "gem_catalog.py" else hash_file(path)
+    )
+
+    assert "gem_catalog.py" in pack.PACK_BUILDER_MODULES
+    assert compute_schema_hash.__wrapped__() != before
+
+
+@pytest.mark.asyncio
+async def test_shared_mode_maps_pack(game_data_settings: Settings):
+    """Test that shared mode loads pack segments on first access only."""
+    await GameDataManager(settings=game_data_settings).compile_data_pack()
+    settings = game_data_settings.model_copy(update={"GAME_DATA_SHARED": True})
+    manager = GameDataManager(settings=settings)
+
+    constraints = await manager.get_data("constraints")
+    cache = manager._cache
+
+    assert constraints.gem_slots["total_required"] == 8
+    assert manager.load_timings["source"] == "shared"
+    assert isinstance(cache.pack, DataPackReader)
+    assert "gems/data" not in cache.data
+
+    catalog = await manager.get_gem_catalog()
+    gems = await manager.get_data("gems/data")
+
+    # Stored in one segment, so the catalog shares the registry's gems
+    assert set(cache.data) >= {"gems/data", "gems/catalog", "gems/index", "names/gems"}
+    assert catalog.query(limit=1)[0] is gems[catalog.query(limit=1)[0].name]
+    await manager.close()
@@ -0,0 +1,68 @@
+"""Tests for single-flight game data reloads."""
+
+import asyncio
+
+import pytest
+
+from api.core.config import Settings
+from api.models.game_data.manager import GameDataManager
+
+
+@pytest.mark.asyncio
+async def test_concurrent_cold_lookups_share_one_reload(game_data_settings: Settings):
+    """Test that concurrent callers on a cold cache trigger a single load."""
+    manager = GameDataManager(settings=game_data_settings)
+    builds = 0
+    build_cache = manager._build_cache
+
+    async def counting_build(generation: int):
+        nonlocal builds
+        builds += 1
+        return await build_cache(generation)
+
+    manager._build_cache = counting_build
+    results = await asyncio.gather(*(manager.get_data("constraints") for _ in range(10)))
+
+    assert builds == 1
+    assert all(result is results[0] for result in results)
+    assert manager.reload_stats == {
+        "started": 1,
+        "completed": 1,
+        "failed": 0,
+        "coalesced": 9,
+    }
+
+
+@pytest.mark.asyncio
+async def test_failed_reload_is_shared_and_counted(game_data_settings: Settings):
+    """Test that every coalesced caller sees the failure of the shared load."""
+    manager = GameDataManager(settings=game_data_settings)
+
+    async def failing_build(generation: int):
+        raise ValueError("broken data")
+
+    manager._build_cache = failing_build
+    results = await asyncio.gather(
+        *(manager.get_data("constraints") for _ in range(3)),
+        return_exceptions=True
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert manager.reload_stats["started"] == 1
+    assert manager.reload_stats["failed"] == 1
+    assert manager.reload_stats["coalesced"] == 2
+
+
+@pytest.mark.asyncio
+async def test_categories_load_in_parallel_with_timings(game_data_settings: Settings):
+    """Test that a JSON load records per-category timings for every category."""
+    manager = GameDataManager(settings=game_data_settings)
+    try:
+        await manager.refresh()
+
+        timings = manager.load_timings
+        assert timings["source"] == "json"
+        assert set(timings["categories"]) == set(manager.CATEGORY_LOADERS)
+        assert timings["total_ms"] > 0
+    finally:
+        await manager.close()
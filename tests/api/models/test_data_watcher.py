@@ -0,0 +1,73 @@
+"""Tests for background game data change detection."""
+
+import asyncio
+import json
+
+import pytest
+
+from api.core.config import Settings
+from api.models.game_data.manager import GameDataManager
+from api.models.game_data.watcher import DataWatcher
+
+
+def bump_metadata(settings: Settings, last_updated: str) -> None:
+    """Write a new last_updated timestamp to metadata.json."""
+    metadata_file = settings.data_path / "metadata.json"
+    metadata = json.loads(metadata_file.read_text())
+    metadata["last_updated"] = last_updated
+    metadata_file.write_text(json.dumps(metadata))
+
+
+@pytest.mark.asyncio
+async def test_get_data_does_not_read_metadata(game_data_settings: Settings):
+    """Test that cached lookups stay in memory once data is loaded."""
+    manager = GameDataManager(settings=game_data_settings)
+    await manager.get_data("constraints")
+
+    def fail_metadata_read():
+        raise AssertionError("metadata.json should not be read on the hot path")
+
+    manager._load_metadata = fail_metadata_read
+    assert await manager.get_data("sets") is not None
+    assert not manager._should_reload()
+
+
+@pytest.mark.asyncio
+async def test_watcher_check_bumps_generation(game_data_settings: Settings):
+    """Test that a newer metadata timestamp flags the data for reload."""
+    manager = GameDataManager(settings=game_data_settings)
+    await manager.get_data("constraints")
+    watcher = DataWatcher(manager)
+
+    assert not await watcher.check()
+    assert manager.generation == 0
+
+    bump_metadata(game_data_settings, "2030-01-01T00:00:00")
+    assert await watcher.check()
+    assert manager.generation == 1
+    assert manager._should_reload()
+
+    await manager.refresh()
+    assert not manager._should_reload()
+    assert manager._cache.metadata.last_updated.year == 2030
+
+
+@pytest.mark.asyncio
+async def test_polling_watcher_detects_change(game_data_settings: Settings):
+    """Test that the mtime polling fallback notices metadata changes."""
+    manager = GameDataManager(settings=game_data_settings)
+    await manager.get_data("constraints")
+    watcher = DataWatcher(manager, poll_interval=0.01, use_notify=False)
+    watcher.start()
+    try:
+        await asyncio.sleep(0.05)
+        bump_metadata(game_data_settings, "2030-01-01T00:00:00")
+        for _ in range(100):
+            if manager.generation:
+                break
+            await asyncio.sleep(0.01)
+        assert manager.generation == 1
+    finally:
+        await watcher.stop()
+        await manager.close()
+    assert not watcher.running
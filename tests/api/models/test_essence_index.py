@@ -0,0 +1,83 @@
+"""Tests for the essence query engine."""
+
+import pytest
+
+from api.core.config import Settings
+from api.models.game_data.essence_index import EssenceQueryEngine
+from api.models.game_data.manager import GameDataManager
+from api.models.game_data.schemas.essences import ClassEssences
+
+
+def make_essences() -> ClassEssences:
+    """Build a small essence set covering every query dimension."""
+    def essence(name, slot, skill, effect_type, tags):
+        return {
+            "essence_name": name,
+            "gear_slot": slot,
+            "modifies_skill": skill,
+            "effect": f"{name} effect",
+            "effect_type": effect_type,
+            "effect_tags": tags,
+        }
+
+    return ClassEssences.model_validate({
+        "metadata": {
+            "version": "1.0",
+            "last_updated": "2025-01-25",
+            "class": "barbarian",
+            "total_essences": 3,
+            "skills": {},
+        },
+        "essences": {
+            "pot_metal": essence("Pot Metal", "Helm", "Demoralize", "shield", ["armor"]),
+            "spartusk": essence("Spartusk", "Helm", "Demoralize", "damage", ["damage", "control"]),
+            "bloodguzzle": essence("Bloodguzzle", "Main Hand", "Cleave", "damage", ["damage"]),
+        },
+        "indexes": {"by_slot": {}},
+    })
+
+
+def test_query_intersects_filters():
+    """Test that filters combine and match regardless of case and punctuation."""
+    engine = EssenceQueryEngine(make_essences())
+
+    assert list(engine.query()) == ["bloodguzzle", "pot_metal", "spartusk"]
+    assert list(engine.query(slot="helm")) == ["pot_metal", "spartusk"]
+    assert list(engine.query(slot="Helm", effect_type="damage")) == ["spartusk"]
+    assert list(engine.query(slot="main_hand", effect_tag="DAMAGE")) == ["bloodguzzle"]
+    assert engine.query(skill="Cleave", effect_tag="armor") == {}
+    assert engine.query(slot="Chest") == {}
+
+
+def test_prebuilt_indexes_used_only_when_consistent():
+    """Test that prebuilt posting lists are used unless they list unknown essences."""
+    prebuilt = {
+        "slot": {"Helm": ["pot_metal", "spartusk"], "Main Hand": ["bloodguzzle"]},
+        "skill": {"Demoralize": ["pot_metal"], "Cleave": ["bloodguzzle"]},
+        "effect_tag": {"damage": ["spartusk", "unknown_essence"]},
+    }
+
+    engine = EssenceQueryEngine(make_essences(), prebuilt)
+
+    assert engine.rebuilt == ["skill", "effect_type", "effect_tag"]
+    assert list(engine.query(skill="Demoralize")) == ["pot_metal", "spartusk"]
+
+
+@pytest.mark.asyncio
+async def test_manager_serves_class_essences(game_data_settings: Settings):
+    """Test that class essences are queried through a per-generation engine."""
+    manager = GameDataManager(settings=game_data_settings.model_copy(
+        update={"GAME_DATA_LAZY": True}
+    ))
+    try:
+        helm = await manager.get_class_essences("barbarian", slot="Helm")
+        assert helm
+        assert all(essence.gear_slot == "Helm" for essence in helm.values())
+
+        engine = await manager.get_essence_engine("Barbarian")
+        assert await manager.get_essence_engine("barbarian") is engine
+
+        with pytest.raises(ValueError, match="No essences found"):
+            await manager.get_class_essences("invalid_class")
+    finally:
+        await manager.close()
@@ -0,0 +1,78 @@
+"""Tests for the in-memory gem catalog."""
+
+import pytest
+
+from api.core.config import Settings
+from api.models.game_data.gem_catalog import GemCatalog
+from api.models.game_data.manager import GameDataManager
+from api.models.game_data.names import NameIndex
+from api.models.game_data.schemas import GemRegistry, GemSkillMap
+
+
+def make_catalog() -> GemCatalog:
+    """Build a catalog of four gems across three star ratings."""
+    def gem(stars):
+        return {"Stars": stars, "ranks": {"1": {"effects": [{"type": "damage", "description": "effect"}]}}}
+
+    gems = GemRegistry.model_validate({
+        "Zephyr": gem(1),
+        "Berserker's Eye": gem(5),
+        "Anchor": gem(2),
+        "Chained Death": gem(5),
+    })
+    skillmap = GemSkillMap.model_validate({
+        "gems_by_skill": {
+            "attack": ["Zephyr", "berserkers eye"],
+            "primary attack": ["Chained Death"],
+            "movement": ["Anchor", "Zephyr"],
+        }
+    })
+    names = NameIndex((name, name) for name in gems.root)
+    return GemCatalog(gems, skillmap, names)
+
+
+def test_query_filters_and_sorts():
+    """Test that filters combine and results are sorted by stars and name."""
+    catalog = make_catalog()
+
+    assert [gem.name for gem in catalog.query()] == [
+        "Zephyr", "Anchor", "Berserker's Eye", "Chained Death"
+    ]
+    assert [gem.name for gem in catalog.query(stars=5)] == ["Berserker's Eye", "Chained Death"]
+    assert [gem.name for gem in catalog.query(skill_type="attack")] == [
+        "Zephyr", "Berserker's Eye", "Chained Death"
+    ]
+    assert [gem.name for gem in catalog.query(skill_type="Primary Attack")] == ["Chained Death"]
+    assert [gem.name for gem in catalog.query(skill_type="movement", stars=2)] == ["Anchor"]
+    assert catalog.query(skill_type="summon") == []
+    assert catalog.query(stars=3) == []
+
+
+def test_query_paginates_cached_results():
+    """Test that pages are slices of the same precomputed result."""
+    catalog = make_catalog()
+
+    assert [gem.name for gem in catalog.query(offset=1, limit=2)] == ["Anchor", "Berserker's Eye"]
+    assert catalog.query(offset=10) == []
+
+    first = catalog.query(skill_type="attack", limit=1)
+    second = catalog.query(skill_type="ATTACK", offset=1, limit=1)
+    assert first[0] is not second[0]
+    assert len(catalog._results) == 2
+
+
+@pytest.mark.asyncio
+async def test_manager_serves_gem_catalog(game_data_settings: Settings):
+    """Test that the catalog covers the registry and is built once per generation."""
+    manager = GameDataManager(settings=game_data_settings.model_copy(
+        update={"GAME_DATA_LAZY": True}
+    ))
+    try:
+        catalog = await manager.get_gem_catalog()
+
+        assert len(catalog) == len((await manager.get_data("gems/data")).root)
+        assert all(gem.stars == "5" for gem in catalog.query(stars=5))
+        assert catalog.query(skill_type="movement")
+        assert await manager.get_gem_catalog() is catalog
+    finally:
+        await manager.close()
@@ -0,0 +1,61 @@
+"""Tests for the inverted gem index."""
+
+import pytest
+
+from api.core.config import Settings
+from api.models.game_data.gem_index import build_gem_index
+from api.models.game_data.manager import GameDataManager
+from api.models.game_data.names import NameIndex
+
+
+def test_index_inverts_metadata_per_gem():
+    """Test that every metadata source ends up in the gem's profile."""
+    names = NameIndex([("Berserker's Eye", "Berserker's Eye"), ("Power & Command", "Power & Command")])
+    metadata = {
+        "stat_boosts": {
+            "critical_hit_chance": [{"name": "Berserker's Eye", "base_values": [], "rank_10_values": [{"value": 2.0}]}],
+        },
+        "categories": {
+            "damage_boost": {"description": "Increases damage output", "gems": ["berserkers eye"]},
+        },
+        "pairs": {
+            "Berserker's Eye": {"Power & Command": {"score": 0.8}},
+        },
+        "conditions": {
+            "Berserker's Eye": [{"type": "trigger", "description": "when attacking"}],
+        },
+        "effect_details": {
+            "cooldowns": {"Power & Command": 20},
+        },
+    }
+
+    index = build_gem_index(metadata, names)
+
+    eye = index["Berserker's Eye"]
+    assert eye.stats["critical_hit_chance"]["rank_10_values"] == [{"value": 2.0}]
+    assert list(eye.synergies) == ["damage_boost"]
+    assert eye.pairs == {"Power & Command": {"score": 0.8}}
+    assert eye.conditions[0]["type"] == "trigger"
+
+    command = index["Power & Command"]
+    assert command.pairs == {"Berserker's Eye": {"score": 0.8}}
+    assert command.effect_details == {"cooldowns": 20}
+
+
+@pytest.mark.asyncio
+async def test_manager_serves_gem_profiles(game_data_settings: Settings):
+    """Test that profiles resolve name variants and are built once per generation."""
+    manager = GameDataManager(settings=game_data_settings.model_copy(
+        update={"GAME_DATA_LAZY": True}
+    ))
+    try:
+        profile = await manager.get_gem_profile("mothers_lament")
+
+        assert profile.name == "Mother's Lament"
+        assert profile.gem is not None
+        assert "critical_hit_chance" in profile.stats
+        assert "critical_hit" in profile.synergies
+        assert await manager.get_gem_profile("MOTHER'S LAMENT") is profile
+        assert await manager.get_gem_profile("no such gem") is None
+    finally:
+        await manager.close()
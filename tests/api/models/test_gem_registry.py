@@ -0,0 +1,58 @@
+"""Tests for the per-gem registry loader."""
+
+import json
+
+import pytest
+
+from api.core.config import Settings
+from api.models.game_data.gem_registry import GemRegistryLoader
+from api.models.game_data.manager import GameDataManager
+
+
+@pytest.mark.asyncio
+async def test_loader_reads_every_indexed_gem(game_data_settings: Settings):
+    """Test that the registry holds every gem listed in the index."""
+    loader = GemRegistryLoader(game_data_settings.data_path)
+    index = loader.read_index()
+
+    registry = await loader.load()
+
+    assert set(registry) == set(index)
+    assert loader.stats == {"parsed": len(index), "reused": 0}
+    gem = registry["Berserker's Eye"]
+    assert gem.stars == "1"
+    assert gem.max_rank == 10
+    assert gem.ranks["1"].effects[0].conditions[0].type == "on_attack"
+
+
+@pytest.mark.asyncio
+async def test_loader_reparses_only_changed_gems(game_data_settings: Settings):
+    """Test that an edited gem file is the only one parsed again."""
+    loader = GemRegistryLoader(game_data_settings.data_path)
+    first = await loader.load()
+    assert await loader.load() is first
+    assert loader.stats["parsed"] == 0
+
+    gem_file = game_data_settings.data_path / loader.read_index()["Berserker's Eye"]
+    gem_data = json.loads(gem_file.read_text())
+    gem_data["ranks"]["1"]["effects"][0]["description"] = "Increases all damage you deal by 50%"
+    gem_file.write_text(json.dumps(gem_data))
+
+    second = await loader.load()
+
+    assert loader.stats == {"parsed": 1, "reused": len(first.root) - 1}
+    assert second["Berserker's Eye"].base_effect == "Increases all damage you deal by 50%"
+    assert second["Blood-Soaked Jade"] is first["Blood-Soaked Jade"]
+
+
+@pytest.mark.asyncio
+async def test_manager_serves_gem_registry(game_data_settings: Settings):
+    """Test that the gems/data category is built from the per-gem files."""
+    manager = GameDataManager(settings=game_data_settings)
+    try:
+        gems = await manager.get_data("gems/data")
+
+        assert "Blood-Soaked Jade" in gems
+        assert "gems/core/5star/blood_soaked_jade.json" in manager.source_files()
+    finally:
+        await manager.close()
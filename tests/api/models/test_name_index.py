@@ -0,0 +1,56 @@
+"""Tests for canonical game data name lookup."""
+
+import pytest
+
+from api.core.config import Settings
+from api.models.game_data.manager import GameDataManager
+from api.models.game_data.names import NameIndex, normalize_name
+
+
+@pytest.mark.parametrize("name", [
+    "Mother's Lament",
+    "mother’s lament",
+    "MOTHERS_LAMENT",
+    "mothers-lament",
+    "  Mothers  Lament ",
+])
+def test_normalize_name_variants(name: str):
+    """Test that case, punctuation and slug variants normalize alike."""
+    assert normalize_name(name) == "mothers_lament"
+
+
+def test_aliases_do_not_shadow_keys():
+    """Test that an alias never takes over an exact canonical key."""
+    index = NameIndex([("Pot-Metal", "visage"), ("Pot Metal", "pot_metal")])
+
+    assert index.resolve("pot metal") == "pot_metal"
+    assert index.resolve("VISAGE") == "visage"
+    assert index.resolve("unknown") is None
+
+
+@pytest.mark.asyncio
+async def test_manager_resolves_names_per_generation(game_data_settings: Settings):
+    """Test that name indexes resolve every form and are built once per generation."""
+    manager = GameDataManager(settings=game_data_settings.model_copy(
+        update={"GAME_DATA_LAZY": True}
+    ))
+    try:
+        assert await manager.resolve_name("gems", "mothers_lament") == "Mother's Lament"
+        assert await manager.resolve_name("gems", "blood soaked jade") == "Blood-Soaked Jade"
+        assert await manager.resolve_name("gems", "no such gem") is None
+        assert (
+            await manager.resolve_name("essences/barbarian", "Visage of the Living Ancients")
+            == "visage_of_the_living_ancients"
+        )
+
+        index = await manager.get_name_index("gems")
+        assert await manager.get_name_index("gems") is index
+
+        manager.mark_stale()
+        await manager.refresh()
+        assert await manager.get_name_index("gems") is not index
+
+        with pytest.raises(ValueError):
+            await manager.get_name_index("unknown")
+    finally:
+        await manager.close()
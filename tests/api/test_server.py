@@ -0,0 +1,75 @@
+"""Tests for the preload-and-fork server."""
+
+import gc
+import os
+
+import httpx
+import pytest
+
+from api.core.config import Settings
+from api.main import app
+from api.server import launch, process_memory
+
+
+@pytest.fixture
+def preloaded_app():
+    """Undo the preloading of the shared app after a test."""
+    yield app
+    for name in ("data_preloaded", "data_manager"):
+        if hasattr(app.state, name):
+            delattr(app.state, name)
+    app.state.response_cache.clear()
+    gc.unfreeze()
+
+
+def test_process_memory_reads_smaps():
+    """Test that the memory of this process can be measured."""
+    memory = process_memory(os.getpid())
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        pytest.skip("smaps_rollup is not available")
+
+    assert memory.rss > 0 and memory.private <= memory.rss
+    assert process_memory(-1) == (0, 0, 0)
+
+
+# Preloading collects garbage, finalizing sockets leaked by earlier tests
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnraisableExceptionWarning")
+def test_workers_serve_preloaded_data(game_data_settings: Settings, preloaded_app):
+    """Test that forked workers answer from the data and responses loaded before the fork."""
+    pool, report = launch(2, host="127.0.0.1", port=0, settings=game_data_settings)
+    try:
+        assert set(report.worker_memory) == pool.pids
+        assert "gems/catalog" in report.preload.entries
+        assert {"builds/gem_scores", "builds/skill_scorer/barbarian"} <= set(report.preload.entries)
+        assert report.preload.responses > 0
+
+        host, port = pool.socket.getsockname()
+        response = httpx.get(f"http://{host}:{port}/api/v1/game/modes")
+
+        assert response.status_code == 200
+        assert response.headers["x-cache"] == "HIT"
+    finally:
+        pool.stop()
+        pool.supervise()
+
+    assert not pool.pids
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnraisableExceptionWarning")
+@pytest.mark.parametrize("preload", [True, False])
+def test_workers_start_when_data_fails_to_load(game_data_settings: Settings, preloaded_app, preload: bool):
+    """Test that preloaded and self-loading workers both serve when the data cannot load."""
+    (game_data_settings.data_path / "sets.json").unlink()
+
+    pool, report = launch(1, preload=preload, host="127.0.0.1", port=0, settings=game_data_settings)
+    try:
+        assert set(report.worker_memory) == pool.pids
+        if preload:
+            assert report.preload.entries == []
+
+        host, port = pool.socket.getsockname()
+        assert httpx.get(f"http://{host}:{port}/api/v1/game/modes").status_code == 200
+        assert httpx.get(f"http://{host}:{port}/api/v1/game/sets").status_code == 500
+    finally:
+        pool.stop()
+        pool.supervise()
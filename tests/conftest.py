@@ -1,8 +1,11 @@
 """Shared test fixtures and configuration."""
 
+import shutil
 import pytest
+from pathlib import Path
 from typing import Generator
 import responses
+from fastapi import Request
 from fastapi.testclient import TestClient
 
 from api.main import app
@@ -29,9 +32,9 @@ def get_test_data_manager() -> GameDataManager:
     """Get test data manager."""
     return GameDataManager(settings=get_test_settings())
 
-async def get_test_build_service() -> BuildService:
+async def get_test_build_service(request: Request) -> BuildService:
     """Get test build service."""
-    return await BuildService.create()
+    return await BuildService.create(request.app.state.data_manager)
 
 @pytest.fixture
 def client() -> Generator:
@@ -51,6 +54,19 @@ def client() -> Generator:
     with TestClient(app) as test_client:
         yield test_client
 
+@pytest.fixture
+def game_data_settings(tmp_path: Path) -> Settings:
+    """Settings pointing at a writable copy of the indexed game data."""
+    data_dir = tmp_path / "indexed"
+    shutil.copytree(get_settings().data_path, data_dir)
+    return Settings(
+        TESTING=True,
+        ENVIRONMENT="test",
+        DATA_DIR=data_dir,
+        DATA_PACK_DIR=tmp_path / "compiled"
+    )
+
+
 @pytest.fixture(autouse=True)
 def mock_github_api():
     """Mock GitHub API responses."""